@@ -7,7 +7,7 @@ related models.
 
 Models registered:
 - Profile, Contact, Image, Video, Education, Leadership, Experience, Course, Skill,
-  MyContact, Portfolio
+  MyContact, Portfolio, OutgoingEmail
 """
 
 from django.contrib import admin
@@ -16,6 +16,7 @@ from tinymce.widgets import TinyMCE
 from .models import (
     Leadership, Profile, Contact, Feedback, ProjectImage,
     Education, Skill, Portfolio, Course, MyContact, Video, Experience,
+    OutgoingEmail,
 )
 
 # -------------------------------
@@ -30,6 +31,19 @@ class ContactAdmin(admin.ModelAdmin):
     list_display = ('id', 'name', 'email', 'timestamp')
 
 
+# -------------------------------
+# Outgoing Email Admin
+# -------------------------------
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for OutgoingEmail model (the email outbox).
+    """
+    list_display = ('id', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+
+
 # -------------------------------
 # Profile Admin
 # -------------------------------
@@ -2,7 +2,7 @@
 apps.py
 
 Defines the configuration for the 'home' app.
-Includes automatic signal registration when the app is ready.
+Includes automatic signal and search registration when the app is ready.
 """
 
 from django.apps import AppConfig
@@ -20,6 +20,11 @@ class HomeConfig(AppConfig):
         Called when the app is ready.
 
         Used to import and register signal handlers to ensure they are connected
-        when the application starts.
+        when the application starts, to register the searchable models with watson
+        and to install the serialization timing hook.
         """
         import home.signals  # noqa
+        from home.instrumentation import instrument_serializers
+        from home.search import register_search_models
+        register_search_models()
+        instrument_serializers()
@@ -0,0 +1,227 @@
+"""
+file_delivery.py
+
+Serves downloadable files from local disk.
+
+Files kept on remote storage (e.g. the resume on Cloudinary) are copied once into a local
+cache directory and served from there. Cache entries are named after the storage file
+name, and an upload always gets a new name, so replacing or clearing the `FileField`
+makes the old entry unreachable; it is pruned with the least recently used ones.
+
+Responses carry `ETag`, `Last-Modified`, `Content-Length` and `Accept-Ranges`, answer
+`If-None-Match`/`If-Modified-Since` with a 304 and a single `Range` with a 206, honouring
+`If-Range`. When a front proxy is configured to serve the cache directory
+(`RESUME_FILE_SENDFILE`), only headers are returned and the proxy streams the bytes.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+CHUNK_SIZE = 64 * 1024
+SENDFILE_MODES = ('', 'x-accel-redirect', 'x-sendfile')
+
+_range_header = re.compile(r'^bytes=(\d*)-(\d*)$')
+_fetch_locks = {}
+_fetch_locks_lock = threading.Lock()
+
+
+# ------------------ Local Cache ------------------ #
+
+def cached_file_path(file):
+    """
+    Returns the local cache path of a stored file.
+
+    Args:
+        file (FieldFile): The stored file.
+
+    Returns:
+        str: Absolute path of the cache entry.
+    """
+    # __class__ rather than type(): `default_storage` is a lazy proxy.
+    storage = file.storage.__class__
+    key = f'{storage.__module__}.{storage.__qualname__}\0{file.name}'
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+    extension = os.path.splitext(file.name)[1].lower()
+    return os.path.join(settings.RESUME_FILE_CACHE_DIR, digest + extension)
+
+
+def prune_file_cache(keep):
+    """
+    Removes all but the most recently used entries from the cache directory.
+
+    Args:
+        keep (int): Number of entries to keep.
+    """
+    directory = settings.RESUME_FILE_CACHE_DIR
+    entries = [os.path.join(directory, name) for name in os.listdir(directory) if not name.startswith('.')]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[keep:]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def get_cached_file(file):
+    """
+    Returns the local copy of a stored file, fetching it from its storage on a miss.
+
+    The copy is written to a temporary file and renamed into place, so concurrent
+    readers never see a partial file.
+
+    Args:
+        file (FieldFile): The stored file.
+
+    Returns:
+        str: Absolute path of the local copy.
+    """
+    path = cached_file_path(file)
+    with _fetch_locks_lock:
+        lock = _fetch_locks.setdefault(path, threading.Lock())
+    with lock:
+        if os.path.exists(path):
+            # Marks the entry as recently used for pruning.
+            os.utime(path)
+            return path
+
+        directory = settings.RESUME_FILE_CACHE_DIR
+        os.makedirs(directory, exist_ok=True)
+        prune_file_cache(settings.RESUME_FILE_CACHE_MAX_FILES - 1)
+        descriptor, temporary = tempfile.mkstemp(dir=directory, prefix='.fetch-')
+        try:
+            with os.fdopen(descriptor, 'wb') as output, file.open('rb') as source:
+                for chunk in source.chunks(CHUNK_SIZE):
+                    output.write(chunk)
+            os.replace(temporary, path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+    return path
+
+
+# ------------------ Responses ------------------ #
+
+def parse_range(header, size):
+    """
+    Parses a single-range `Range` header.
+
+    Args:
+        header (str): The header value, e.g. 'bytes=0-1023' or 'bytes=-500'.
+        size (int): Size of the file.
+
+    Returns:
+        tuple | None: (first byte, last byte) inclusive, or None if the header is
+        malformed or asks for several ranges, in which case the whole file is sent.
+
+    Raises:
+        ValueError: If the range cannot be satisfied.
+    """
+    match = _range_header.match(header.replace(' ', ''))
+    if match is None or match.group(1) == match.group(2) == '':
+        return None
+    first, last = match.groups()
+    if first == '':
+        # A suffix range: the last N bytes.
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    first = int(first)
+    last = size - 1 if last == '' else min(int(last), size - 1)
+    if first > last:
+        raise ValueError(header)
+    return first, last
+
+
+def _if_range_matches(header, etag, last_modified):
+    if header.startswith('"') or header.startswith('W/'):
+        return header == etag
+    return parse_http_date_safe(header) == last_modified
+
+
+def _read_range(path, first, length):
+    with open(path, 'rb') as source:
+        source.seek(first)
+        while length > 0:
+            chunk = source.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def file_response(request, path, filename, content_type, accel_prefix=None):
+    """
+    Returns a download response for a local file, honouring conditional and range requests.
+
+    Args:
+        request (HttpRequest): The request.
+        path (str): Absolute path of the file.
+        filename (str): Name offered to the browser.
+        content_type (str): MIME type of the file.
+        accel_prefix (str | None): Internal proxy location mapped to the file's directory,
+            for the `x-accel-redirect` mode; None always serves from Python.
+
+    Returns:
+        HttpResponse: A 200, 206, 304 or 416 response.
+    """
+    stat = os.stat(path)
+    last_modified = int(stat.st_mtime)
+    etag = '"%s-%x"' % (os.path.basename(path).split('.')[0][:16], stat.st_size)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = _sendfile_response(path, accel_prefix) or _range_response(request, path, stat.st_size, etag, last_modified)
+        if response.status_code != 416:
+            response['Content-Type'] = content_type
+            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def _range_response(request, path, size, etag, last_modified):
+    byte_range = None
+    header = request.META.get('HTTP_RANGE')
+    if header and _if_range_matches(request.META.get('HTTP_IF_RANGE', etag), etag, last_modified):
+        try:
+            byte_range = parse_range(header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    if byte_range is None or byte_range == (0, size - 1):
+        # FileResponse lets the server use wsgi.file_wrapper (sendfile) for the whole file.
+        return FileResponse(open(path, 'rb'))
+
+    first, last = byte_range
+    response = StreamingHttpResponse(_read_range(path, first, last - first + 1), status=206)
+    response['Content-Range'] = f'bytes {first}-{last}/{size}'
+    response['Content-Length'] = str(last - first + 1)
+    return response
+
+
+def _sendfile_response(path, accel_prefix):
+    mode = settings.RESUME_FILE_SENDFILE
+    if mode not in SENDFILE_MODES:
+        raise ImproperlyConfigured(f"RESUME_FILE_SENDFILE must be one of {', '.join(map(repr, SENDFILE_MODES))}")
+    if mode == 'x-sendfile':
+        response = HttpResponse()
+        response['X-Sendfile'] = path
+        return response
+    if mode == 'x-accel-redirect' and accel_prefix:
+        response = HttpResponse()
+        response['X-Accel-Redirect'] = accel_prefix.rstrip('/') + '/' + os.path.basename(path)
+        return response
+    return None
@@ -2,20 +2,20 @@
 forms.py
 
 Defines the ContactForm used on the website's contact page. It collects user information
-and messages, validates input, integrates reCAPTCHA, and sends email notifications to the admin.
+and messages, validates input, integrates reCAPTCHA, and queues email notifications to the admin.
+AsyncContactForm is its variant for the async contact view.
 
 Includes:
 - Custom form fields with Bootstrap styling.
 - Phone number field with international prefix support.
 - reCAPTCHA for spam protection.
-- Email sending via Django's email system.
+- Email notifications queued in the outbox (see outbox.py).
 """
 
 from django import forms
-from django.core.mail import send_mail, BadHeaderError
-from django.shortcuts import HttpResponse
 from django.conf import settings
 from .models import Contact
+from .outbox import enqueue_email
 from phonenumber_field.formfields import PhoneNumberField
 from phonenumber_field.widgets import PhoneNumberPrefixWidget
 from django_recaptcha.fields import ReCaptchaField
@@ -111,22 +111,43 @@ class ContactForm(forms.ModelForm):
 
         return message, subject
 
-    def send_email(self):
+    def queue_email(self, contact=None):
         """
-        Sends the constructed message to the administrator via email.
+        Queues the constructed message to the administrator in the email outbox.
+
+        Args:
+            contact (Contact | None): The saved submission the email is about.
 
         Returns:
-            HttpResponse or None: Error message if header is invalid, or None if successful.
+            OutgoingEmail: The queued email.
         """
         message, subject = self.get_message()
 
-        try:
-            send_mail(
-                subject,
-                message,
-                from_email=str(settings.ADMIN_EMAIL),
-                recipient_list=[str(settings.ADMIN_EMAIL)],
-                fail_silently=False,
-            )
-        except BadHeaderError:
-            return HttpResponse('Invalid header found')
+        return enqueue_email(
+            subject,
+            message,
+            recipient_list=[str(settings.ADMIN_EMAIL)],
+            from_email=str(settings.ADMIN_EMAIL),
+            contact=contact,
+        )
+
+
+class DeferredReCaptchaField(ReCaptchaField):
+    """
+    reCAPTCHA field that only requires a token: the async contact view verifies it
+    with the non-blocking client, instead of the blocking call of `ReCaptchaField`.
+    """
+
+    def validate(self, value):
+        forms.Field.validate(self, value)
+
+
+class AsyncContactForm(ContactForm):
+    """
+    `ContactForm` for the async contact view; renders the same reCAPTCHA widget.
+    """
+
+    captcha = DeferredReCaptchaField(
+        required=True,
+        widget=ReCaptchaV2Checkbox
+    )
@@ -0,0 +1,357 @@
+"""
+instrumentation.py
+
+Per-request performance instrumentation.
+
+`InstrumentationMiddleware` times every request and, through the hooks below, the phases
+spent inside it:
+
+- db: SQL queries, through a database `execute_wrapper` installed on every connection
+- tpl: template rendering, through the `InstrumentedDjangoTemplates` backend
+- ser: DRF serialization, by wrapping `Serializer.data` (see `instrument_serializers()`)
+- storage: media URL resolution (media.py)
+- http: outbound HTTP calls (recaptcha.py)
+- smtp: email delivery (outbox.py)
+
+Phases are timed with `timed()`, which is a no-op outside a request and counts nested
+use of the same phase once. When the request carries the `SERVER_TIMING_TOKEN` (or
+DEBUG is on), the breakdown is returned in a `Server-Timing` header.
+
+Every process aggregates the numbers in memory into per-route latency histograms and
+phase totals. Every `METRICS_FLUSH_INTERVAL` seconds it copies them to the shared
+cache, so the `/metrics` endpoint can sum all worker processes. A scrape reads one
+cache entry per worker and does no other work.
+"""
+
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.template.backends.django import DjangoTemplates
+from django.utils.crypto import constant_time_compare
+
+PHASES = {
+    'db': 'SQL',
+    'tpl': 'Templates',
+    'ser': 'Serialization',
+    'storage': 'Storage URLs',
+    'http': 'Outbound HTTP',
+    'smtp': 'SMTP',
+}
+TOKEN_HEADER = 'HTTP_X_SERVER_TIMING_TOKEN'
+WORKERS_KEY = 'metrics:workers'
+WORKER_KEY_PREFIX = 'metrics:worker:'
+
+_current = ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """Time spent and number of calls per phase of the current request."""
+
+    def __init__(self):
+        self.durations = dict.fromkeys(PHASES, 0.0)
+        self.counts = dict.fromkeys(PHASES, 0)
+        self.active = set()
+
+
+@contextmanager
+def timed(phase):
+    """
+    Adds the time spent in the block to a phase of the current request.
+
+    Args:
+        phase (str): A key of `PHASES`.
+    """
+    timings = _current.get()
+    if timings is None or phase in timings.active:
+        yield
+        return
+    timings.active.add(phase)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.durations[phase] += time.perf_counter() - start
+        timings.counts[phase] += 1
+        timings.active.discard(phase)
+
+
+@contextmanager
+def collect_timings():
+    """
+    Collects the phase timings of the enclosed block, e.g. a request or a command.
+
+    Yields:
+        RequestTimings: The timings, filled as the block runs.
+    """
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def _time_query(execute, sql, params, many, context):
+    with timed('db'):
+        return execute(sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_timer(connection, **kwargs):
+    """
+    Times the queries of every connection. Connections are per thread, and under ASGI
+    the ORM runs outside the request's thread, so the wrapper is not tied to a request:
+    the timings come from the request context, which follows the query into that thread.
+    """
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_query)
+
+
+# ------------------ Hooks ------------------ #
+
+class TimedTemplate:
+    """Template of the `InstrumentedDjangoTemplates` backend, timing each render."""
+
+    def __init__(self, template):
+        self._template = template
+
+    def __getattr__(self, name):
+        return getattr(self._template, name)
+
+    def render(self, context=None, request=None):
+        with timed('tpl'):
+            return self._template.render(context, request)
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, with render timing."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
+
+
+def instrument_serializers():
+    """
+    Times `.data` of the DRF serializers, where serialization happens.
+    Called from `HomeConfig.ready()`.
+    """
+    from rest_framework import serializers
+
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        if getattr(cls.data.fget, 'instrumented', False):
+            continue
+
+        def data(self, _fget=cls.data.fget):
+            with timed('ser'):
+                return _fget(self)
+
+        data.instrumented = True
+        cls.data = property(data)
+
+
+# ------------------ Metrics ------------------ #
+
+class MetricsRegistry:
+    """
+    Per-process request metrics.
+
+    Attributes:
+        requests (dict): (route, method) -> [count per bucket..., count above the last bucket, sum]
+        phases (dict): (route, phase) -> [seconds, calls]
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.worker = f'{socket.gethostname()}-{os.getpid()}'
+        self.requests = {}
+        self.phases = {}
+        self.flushed_at = 0.0
+
+    def observe(self, route, method, seconds, timings):
+        buckets = settings.METRICS_BUCKETS
+        with self.lock:
+            row = self.requests.get((route, method))
+            if row is None:
+                row = self.requests[(route, method)] = [0] * (len(buckets) + 1) + [0.0]
+            index = next((i for i, bound in enumerate(buckets) if seconds <= bound), len(buckets))
+            row[index] += 1
+            row[-1] += seconds
+            for phase, calls in timings.counts.items():
+                if calls:
+                    totals = self.phases.setdefault((route, phase), [0.0, 0])
+                    totals[0] += timings.durations[phase]
+                    totals[1] += calls
+
+    def flush_due(self):
+        return time.monotonic() - self.flushed_at >= settings.METRICS_FLUSH_INTERVAL
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'buckets': list(settings.METRICS_BUCKETS),
+                'requests': {key: list(row) for key, row in self.requests.items()},
+                'phases': {key: list(totals) for key, totals in self.phases.items()},
+            }
+
+    def flush(self):
+        """Copies this process's metrics to the shared cache."""
+        self.flushed_at = time.monotonic()
+        # Entries of workers that stopped flushing expire.
+        cache.set(WORKER_KEY_PREFIX + self.worker, self.snapshot(), int(settings.METRICS_FLUSH_INTERVAL * 10) + 1)
+        workers = cache.get(WORKERS_KEY) or set()
+        if self.worker not in workers:
+            cache.set(WORKERS_KEY, workers | {self.worker}, None)
+
+
+registry = MetricsRegistry()
+
+
+def collect_metrics():
+    """
+    Sums the flushed metrics of all worker processes.
+
+    Returns:
+        dict: Merged snapshot, see `MetricsRegistry.snapshot()`.
+    """
+    registry.flush()
+    workers = cache.get(WORKERS_KEY) or set()
+    snapshots = cache.get_many([WORKER_KEY_PREFIX + worker for worker in workers])
+    if len(snapshots) < len(workers):
+        cache.set(WORKERS_KEY, {key[len(WORKER_KEY_PREFIX):] for key in snapshots}, None)
+
+    merged = {'buckets': list(settings.METRICS_BUCKETS), 'requests': {}, 'phases': {}}
+    for snapshot in snapshots.values():
+        if snapshot['buckets'] == merged['buckets']:
+            for key, row in snapshot['requests'].items():
+                total = merged['requests'].setdefault(key, [0] * len(row))
+                merged['requests'][key] = [a + b for a, b in zip(total, row)]
+        for key, totals in snapshot['phases'].items():
+            total = merged['phases'].setdefault(key, [0.0, 0])
+            merged['phases'][key] = [total[0] + totals[0], total[1] + totals[1]]
+    return merged
+
+
+def _labels(**labels):
+    return ','.join('%s="%s"' % (name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+                    for name, value in labels.items())
+
+
+def render_metrics():
+    """
+    Renders the merged metrics in the Prometheus text exposition format.
+
+    Returns:
+        str: The exposition.
+    """
+    metrics = collect_metrics()
+    lines = [
+        '# HELP portfolio_request_duration_seconds Request latency per route.',
+        '# TYPE portfolio_request_duration_seconds histogram',
+    ]
+    bounds = [str(bound) for bound in metrics['buckets']] + ['+Inf']
+    for (route, method), row in sorted(metrics['requests'].items()):
+        cumulative = 0
+        for bound, count in zip(bounds, row[:-1]):
+            cumulative += count
+            lines.append('portfolio_request_duration_seconds_bucket{%s} %d'
+                         % (_labels(route=route, method=method, le=bound), cumulative))
+        lines.append('portfolio_request_duration_seconds_sum{%s} %.6f' % (_labels(route=route, method=method), row[-1]))
+        lines.append('portfolio_request_duration_seconds_count{%s} %d' % (_labels(route=route, method=method), cumulative))
+
+    lines += [
+        '# HELP portfolio_request_phase_seconds_total Time spent per request phase and route.',
+        '# TYPE portfolio_request_phase_seconds_total counter',
+    ]
+    phases = sorted(metrics['phases'].items())
+    for (route, phase), (seconds, _) in phases:
+        lines.append('portfolio_request_phase_seconds_total{%s} %.6f' % (_labels(route=route, phase=phase), seconds))
+    lines += [
+        '# HELP portfolio_request_phase_calls_total Calls per request phase and route (e.g. SQL queries).',
+        '# TYPE portfolio_request_phase_calls_total counter',
+    ]
+    for (route, phase), (_, calls) in phases:
+        lines.append('portfolio_request_phase_calls_total{%s} %d' % (_labels(route=route, phase=phase), calls))
+    return '\n'.join(lines) + '\n'
+
+
+# ------------------ Middleware ------------------ #
+
+def wants_server_timing(request):
+    """Returns whether the request may see its timing breakdown."""
+    if settings.DEBUG:
+        return True
+    token = settings.SERVER_TIMING_TOKEN
+    return bool(token) and constant_time_compare(request.META.get(TOKEN_HEADER, ''), token)
+
+
+def server_timing_header(timings, total):
+    entries = [
+        '%s;dur=%.1f;desc="%s (%d)"' % (phase, timings.durations[phase] * 1000, PHASES[phase], timings.counts[phase])
+        for phase in PHASES if timings.counts[phase]
+    ]
+    entries.append('total;dur=%.1f' % (total * 1000))
+    return ', '.join(entries)
+
+
+class InstrumentationMiddleware:
+    """
+    Times each request and its phases, records them in the metrics registry and
+    adds the `Server-Timing` header for authorized requests. Listed first in
+    MIDDLEWARE so the total covers the other middleware too.
+
+    Sync and async capable: under ASGI the request stays on the event loop, and only
+    the periodic flush to the cache runs in a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with collect_timings() as timings:
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+
+        self.record(request, response, timings, total)
+        if registry.flush_due():
+            registry.flush()
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with collect_timings() as timings:
+            response = await self.get_response(request)
+        total = time.perf_counter() - start
+
+        self.record(request, response, timings, total)
+        if registry.flush_due():
+            await sync_to_async(registry.flush)()
+        return response
+
+    @staticmethod
+    def record(request, response, timings, total):
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match is not None else 'unmatched'
+        registry.observe(route, request.method, total, timings)
+        if wants_server_timing(request):
+            response['Server-Timing'] = server_timing_header(timings, total)
@@ -0,0 +1,205 @@
+"""
+loadtest.py
+
+HTTP load generator for `manage.py loadtest`.
+
+A traffic mix maps route names of `ROUTES` to weights. Every request draws a route from
+the mix and is sent by one of `concurrency` client threads, each with its own keep-alive
+session. The run stops after a number of requests or a duration, whichever comes first.
+The report holds the overall throughput and, per route, the status codes and the
+p50/p95/p99 latencies.
+
+Contact submissions go through `/api/contacts/`: the contact page's form requires a
+reCAPTCHA that a load generator cannot solve.
+"""
+
+import math
+import random
+import threading
+import time
+from collections import Counter
+
+import requests
+
+# Route name -> (method, function(rng, context) returning the path, function returning the JSON body)
+ROUTES = {
+    'home': ('GET', lambda rng, context: '/', None),
+    'about': ('GET', lambda rng, context: '/about', None),
+    'skills': ('GET', lambda rng, context: '/skills', None),
+    'resumeprojects': ('GET', lambda rng, context: '/resumeprojects', None),
+    'portfolio': ('GET', lambda rng, context: f"/portfolio/?page={rng.randint(1, context['portfolio_pages'])}", None),
+    'api_profiles': ('GET', lambda rng, context: '/api/profiles/', None),
+    'api_projects': ('GET', lambda rng, context: '/api/projects/', None),
+    'contact': ('POST', lambda rng, context: '/api/contacts/', lambda rng: {
+        'name': 'Load Test',
+        'email': 'loadtest@example.com',
+        'subject': 'Load test',
+        'message': f'Load test message {rng.randrange(10 ** 6)}',
+    }),
+}
+
+DEFAULT_MIX = {
+    'home': 20,
+    'about': 10,
+    'skills': 10,
+    'resumeprojects': 10,
+    'portfolio': 20,
+    'api_profiles': 10,
+    'api_projects': 15,
+    'contact': 5,
+}
+
+
+def parse_mix(value):
+    """
+    Parses a traffic mix of the form 'route=weight,...', e.g. 'home=3,contact=1'.
+
+    Returns:
+        dict: Weight per route name.
+
+    Raises:
+        ValueError: If a route is unknown or a weight is not a positive integer.
+    """
+    mix = {}
+    for entry in filter(None, (part.strip() for part in value.split(','))):
+        name, _, weight = entry.partition('=')
+        if name not in ROUTES:
+            raise ValueError(f"Unknown route {name!r}; expected one of {', '.join(ROUTES)}")
+        mix[name] = int(weight or 1)
+        if mix[name] < 1:
+            raise ValueError(f"The weight of {name!r} must be positive")
+    if not mix:
+        raise ValueError("The traffic mix is empty")
+    return mix
+
+
+def percentile(sorted_values, fraction):
+    """Returns the nearest-rank percentile of sorted values, e.g. `fraction=0.95`."""
+    if not sorted_values:
+        return None
+    return sorted_values[max(math.ceil(fraction * len(sorted_values)), 1) - 1]
+
+
+def _send(session, base_url, route, rng, context, headers):
+    method, path, body = ROUTES[route]
+    start = time.perf_counter()
+    try:
+        response = session.request(
+            method, base_url + path(rng, context), json=body(rng) if body else None,
+            headers=headers, allow_redirects=False, timeout=30,
+        )
+        # Reads the whole body, as a browser would.
+        response.content
+        status = str(response.status_code)
+    except requests.RequestException as error:
+        status = type(error).__name__
+    return status, time.perf_counter() - start
+
+
+def _replay(base_url, schedule, concurrency, deadline, context, headers, seed):
+    """Sends the scheduled requests from `concurrency` threads; returns (route, status, seconds) each."""
+    positions = iter(range(len(schedule)))
+    lock = threading.Lock()
+    results = []
+
+    def worker(index):
+        rng = random.Random(None if seed is None else seed + index)
+        with requests.Session() as session:
+            while deadline is None or time.monotonic() < deadline:
+                with lock:
+                    position = next(positions, None)
+                if position is None:
+                    return
+                status, seconds = _send(session, base_url, schedule[position], rng, context, headers)
+                with lock:
+                    results.append((schedule[position], status, seconds))
+
+    threads = [threading.Thread(target=worker, args=(index,), daemon=True) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def run_load(base_url, mix=None, requests_count=1000, concurrency=10, duration=None,
+             warmup=0, context=None, headers=None, seed=None):
+    """
+    Replays a traffic mix against a running server.
+
+    Args:
+        base_url (str): Root URL of the server, e.g. 'http://127.0.0.1:8000'.
+        mix (dict | None): Weight per route name; defaults to `DEFAULT_MIX`.
+        requests_count (int): Requests to send, warm-up excluded.
+        concurrency (int): Number of client threads.
+        duration (float | None): Stop after this many seconds even if requests remain.
+        warmup (int): Requests sent and discarded before the measurement.
+        context (dict | None): Values the paths depend on, e.g. `portfolio_pages`.
+        headers (dict | None): Headers sent with every request.
+        seed (int | None): Seed of the route draws, for reproducible runs.
+
+    Returns:
+        dict: The report, see `build_report()`.
+    """
+    mix = mix or DEFAULT_MIX
+    context = {'portfolio_pages': 1, **(context or {})}
+    base_url = base_url.rstrip('/')
+    schedule = random.Random(seed).choices(list(mix), list(mix.values()), k=warmup + requests_count)
+
+    if warmup:
+        _replay(base_url, schedule[:warmup], concurrency, None, context, headers, seed)
+    start = time.monotonic()
+    deadline = start + duration if duration is not None else None
+    results = _replay(base_url, schedule[warmup:], concurrency, deadline, context, headers, seed)
+    return build_report(results, time.monotonic() - start, concurrency)
+
+
+def _milliseconds(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def _summary(latencies, statuses, elapsed):
+    latencies = sorted(latencies)
+    errors = sum(count for status, count in statuses.items() if not status.isdigit() or int(status) >= 400)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'statuses': dict(sorted(statuses.items())),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else None,
+        'mean_ms': _milliseconds(sum(latencies) / len(latencies) if latencies else None),
+        'p50_ms': _milliseconds(percentile(latencies, 0.50)),
+        'p95_ms': _milliseconds(percentile(latencies, 0.95)),
+        'p99_ms': _milliseconds(percentile(latencies, 0.99)),
+        'max_ms': _milliseconds(latencies[-1] if latencies else None),
+    }
+
+
+def build_report(results, elapsed, concurrency):
+    """
+    Summarizes the measured requests.
+
+    Args:
+        results (list): (route, status, seconds) per request; the status is the HTTP
+            status code, or the exception name if the request failed.
+        elapsed (float): Wall time of the measurement, in seconds.
+        concurrency (int): Number of client threads.
+
+    Returns:
+        dict: Totals under 'total' and a summary per route under 'routes'.
+    """
+    per_route = {}
+    for route, status, seconds in results:
+        latencies, statuses = per_route.setdefault(route, ([], Counter()))
+        latencies.append(seconds)
+        statuses[status] += 1
+    return {
+        'concurrency': concurrency,
+        'duration_seconds': round(elapsed, 3),
+        'total': _summary(
+            [seconds for _, _, seconds in results], Counter(status for _, status, _ in results), elapsed,
+        ),
+        'routes': {
+            route: _summary(latencies, statuses, elapsed)
+            for route, (latencies, statuses) in sorted(per_route.items())
+        },
+    }
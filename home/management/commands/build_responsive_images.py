@@ -0,0 +1,38 @@
+"""
+build_responsive_images.py
+
+Management command building the resized static image variants (see home/responsive_images.py).
+
+Usage:
+    python manage.py build_responsive_images            # build missing or outdated variants
+    python manage.py build_responsive_images --force    # rebuild everything
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from home.responsive_images import available_formats, build_responsive_images
+
+
+class Command(BaseCommand):
+    help = "Build resized WebP/AVIF variants of static/images for responsive srcsets."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true',
+                            help="Rebuild variants even if they are up to date.")
+
+    def handle(self, *args, **options):
+        formats = available_formats(settings.RESPONSIVE_IMAGE_FORMATS)
+        skipped = set(settings.RESPONSIVE_IMAGE_FORMATS) - set(formats)
+        if skipped:
+            self.stderr.write(f"Skipping formats this Pillow build cannot encode: {', '.join(sorted(skipped))}")
+
+        manifest = build_responsive_images(
+            source_root=settings.STATICFILES_DIRS[0],
+            output_root=settings.RESPONSIVE_IMAGES_DIR,
+            widths=settings.RESPONSIVE_IMAGE_WIDTHS,
+            formats=formats,
+            quality=settings.RESPONSIVE_IMAGE_QUALITY,
+            force=options['force'],
+        )
+        self.stdout.write(f"Responsive images built for {len(manifest)} images in {', '.join(formats)}.")
@@ -0,0 +1,22 @@
+"""
+collectstatic.py
+
+Extends Django's `collectstatic` to build the responsive image variants first,
+so they are collected, fingerprinted and served by WhiteNoise with everything else.
+"""
+
+from django.contrib.staticfiles.management.commands.collectstatic import Command as CollectStaticCommand
+from django.core.management import call_command
+
+
+class Command(CollectStaticCommand):
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--skip-responsive-images', action='store_true',
+                            help="Do not build the responsive image variants first.")
+
+    def handle(self, **options):
+        if not options['skip_responsive_images']:
+            call_command('build_responsive_images', verbosity=options['verbosity'])
+        return super().handle(**options)
@@ -0,0 +1,42 @@
+"""
+export_resume.py
+
+Management command writing a profile's resume content as a JSON document (see home/resume_io.py).
+
+Usage:
+    python manage.py export_resume jdoe                   # write to stdout
+    python manage.py export_resume jdoe -o resume.json    # write to a file
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from home.models import Profile
+from home.resume_io import iter_resume_document
+
+
+class Command(BaseCommand):
+    help = "Stream a profile's skills, courses, projects and other resume content as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help="Username of the exported profile.")
+        parser.add_argument('-o', '--output', default=None,
+                            help="File to write to; defaults to stdout.")
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help="Rows fetched per query.")
+
+    def handle(self, *args, **options):
+        try:
+            profile = Profile.objects.select_related('user').get(user__username=options['username'])
+        except Profile.DoesNotExist:
+            raise CommandError(f"No profile for user {options['username']!r}")
+
+        chunks = iter_resume_document(profile, chunk_size=options['chunk_size'])
+        if options['output'] is None:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stderr.write(f"Resume of {options['username']} written to {options['output']}.")
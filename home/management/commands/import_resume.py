@@ -0,0 +1,56 @@
+"""
+import_resume.py
+
+Management command importing a resume JSON document in one transaction (see home/resume_io.py).
+
+Usage:
+    python manage.py import_resume resume.json              # add the content to the profile
+    python manage.py import_resume resume.json --replace    # replace the profile's content
+    python manage.py import_resume - < resume.json          # read from stdin
+"""
+
+import json
+import sys
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+from watson import search as watson
+
+from home.resume_io import SECTIONS, import_resume_document
+
+
+class Command(BaseCommand):
+    help = "Bulk import a profile's skills, courses, projects and other resume content from JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Document to import, or - for stdin.")
+        parser.add_argument('--replace', action='store_true',
+                            help="Unlink the profile's current content before importing.")
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help="Rows per INSERT statement.")
+        parser.add_argument('--skip-search-index', action='store_true',
+                            help="Do not rebuild the search index of the imported models.")
+
+    def handle(self, *args, **options):
+        try:
+            if options['path'] == '-':
+                document = json.load(sys.stdin)
+            else:
+                with open(options['path'], encoding='utf-8') as source:
+                    document = json.load(source)
+            counts = import_resume_document(
+                document, replace=options['replace'], batch_size=options['batch_size'],
+            )
+        except (OSError, ValueError, IntegrityError) as error:
+            raise CommandError(f"Import failed, nothing was imported: {error}")
+
+        self.stdout.write("Imported " + ", ".join(f"{count} {key}" for key, count in counts.items()) + ".")
+        if not options['skip_search_index']:
+            # Bulk inserts bypass watson's save handlers.
+            imported = [
+                SECTIONS[key]._meta.label for key, count in counts.items()
+                if count and watson.is_registered(SECTIONS[key])
+            ]
+            if imported:
+                call_command('buildwatson', *imported, verbosity=0)
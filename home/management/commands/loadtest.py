@@ -0,0 +1,187 @@
+"""
+loadtest.py
+
+Management command measuring throughput and per-route latency percentiles (see home/loadtest.py).
+
+The run uses a throwaway SQLite database in a temporary directory, created
+and migrated like the test runner's, seeded with home/synthetic.py and deleted at the end.
+The app is served either in-process by a threaded WSGI server or by a local gunicorn.
+
+Usage:
+    python manage.py collectstatic --noinput                      # the pages need the static manifest
+    python manage.py loadtest                                    # in-process, default mix
+    python manage.py loadtest --server gunicorn --workers 4 -o before.json
+    python manage.py loadtest --mix home=5,api_projects=3,contact=1 --requests 5000 --concurrency 20
+    python manage.py loadtest --size projects=500 --size skills=200
+"""
+
+import json
+import math
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestFilesMixin, staticfiles_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.test.utils import override_settings
+
+from home.loadtest import DEFAULT_MIX, parse_mix, run_load
+from home.models import Portfolio
+from home.snapshots import rebuild_profile_snapshots
+from home.synthetic import DEFAULT_SIZES, seed_synthetic_data
+from home.views import PortfolioView
+
+# Lifts the rate limits unless --keep-rate-limits: all load comes from one client IP.
+UNLIMITED_POLICY = '1000000/s'
+SERVER_START_TIMEOUT = 30
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = "Seed a throwaway SQLite database, replay a traffic mix and report per-route latency percentiles as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--server', choices=('inprocess', 'gunicorn'), default='inprocess',
+                            help="Serve the app from this process or from a local gunicorn.")
+        parser.add_argument('--workers', type=int, default=2,
+                            help="Gunicorn worker processes.")
+        parser.add_argument('--requests', type=int, default=1000,
+                            help="Measured requests, warm-up excluded.")
+        parser.add_argument('--concurrency', type=int, default=10,
+                            help="Concurrent client threads.")
+        parser.add_argument('--duration', type=float, default=None,
+                            help="Stop after this many seconds even if requests remain.")
+        parser.add_argument('--warmup', type=int, default=50,
+                            help="Requests sent before the measurement and not reported.")
+        parser.add_argument('--mix', default=None,
+                            help="Traffic mix as route=weight pairs, e.g. 'home=3,contact=1'. "
+                                 f"Default: {','.join(f'{k}={v}' for k, v in DEFAULT_MIX.items())}.")
+        parser.add_argument('--size', action='append', default=[], metavar='MODEL=COUNT',
+                            help=f"Synthetic dataset size override; one of {', '.join(DEFAULT_SIZES)}.")
+        parser.add_argument('--seed', type=int, default=None,
+                            help="Seed of the route draws, for reproducible runs.")
+        parser.add_argument('--keep-rate-limits', action='store_true',
+                            help="Apply RATE_LIMITS as configured instead of lifting them.")
+        parser.add_argument('-o', '--output', default=None,
+                            help="File to write the JSON report to; defaults to stdout.")
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix']) if options['mix'] else DEFAULT_MIX
+            sizes = self.parse_sizes(options['size'])
+        except ValueError as error:
+            raise CommandError(error)
+
+        if isinstance(staticfiles_storage, ManifestFilesMixin) and not staticfiles_storage.hashed_files:
+            raise CommandError("The static files manifest is missing; run `manage.py collectstatic` first.")
+        connection = connections['default']
+        if connection.vendor != 'sqlite':
+            raise CommandError("The load test runs on SQLite; point DATABASE_URL at a SQLite database.")
+
+        directory = tempfile.mkdtemp(prefix='loadtest-')
+        connection.settings_dict['TEST']['NAME'] = os.path.join(directory, 'loadtest.sqlite3')
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.stderr.write("Seeding the synthetic dataset...")
+            dataset = seed_synthetic_data(**sizes)
+            rebuild_profile_snapshots()
+            active_projects = Portfolio.objects.filter(is_active=True).count()
+            context = {'portfolio_pages': max(1, math.ceil(active_projects / PortfolioView.paginate_by))}
+            # Closes the connection so the servers start from the committed data.
+            connection.close()
+
+            rate_limits = settings.RATE_LIMITS if options['keep_rate_limits'] else {
+                name: UNLIMITED_POLICY for name in settings.RATE_LIMITS
+            }
+            run = {
+                'mix': mix, 'requests_count': options['requests'], 'concurrency': options['concurrency'],
+                'duration': options['duration'], 'warmup': options['warmup'], 'context': context,
+                'seed': options['seed'],
+            }
+            self.stderr.write(f"Running {options['requests']} requests against the {options['server']} server...")
+            if options['server'] == 'gunicorn':
+                report = self.run_gunicorn(connection.settings_dict['NAME'], options['workers'], rate_limits, run)
+            else:
+                report = self.run_inprocess(rate_limits, run)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            shutil.rmtree(directory, ignore_errors=True)
+
+        report = {'server': options['server'], 'dataset': dataset, 'mix': mix, **report}
+        output = json.dumps(report, indent=2)
+        if options['output'] is None:
+            self.stdout.write(output)
+            return
+        with open(options['output'], 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+        self.stderr.write(f"Report written to {options['output']}.")
+
+    def parse_sizes(self, values):
+        sizes = {}
+        for value in values:
+            name, _, count = value.partition('=')
+            if name not in DEFAULT_SIZES or not count.isdigit():
+                raise ValueError(f"Invalid --size {value!r}; expected MODEL=COUNT with MODEL one of {', '.join(DEFAULT_SIZES)}")
+            sizes[name] = int(count)
+        return sizes
+
+    def run_inprocess(self, rate_limits, run):
+        # HTTPS is terminated in front of the app in production; here requests are plain HTTP.
+        with override_settings(SECURE_SSL_REDIRECT=False, RATE_LIMITS=rate_limits):
+            server = ThreadedWSGIServer(('127.0.0.1', 0), QuietWSGIRequestHandler, allow_reuse_address=False)
+            server.set_app(get_wsgi_application())
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                return run_load(f'http://127.0.0.1:{server.server_port}', **run)
+            finally:
+                server.shutdown()
+                server.server_close()
+
+    def run_gunicorn(self, database_path, workers, rate_limits, run):
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            port = probe.getsockname()[1]
+        environment = {
+            **os.environ,
+            'DATABASE_URL': f'sqlite:///{database_path}',
+            **{f'RATE_LIMIT_{name.upper()}': policy for name, policy in rate_limits.items()},
+        }
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', 'portfolio.wsgi', '--bind', f'127.0.0.1:{port}',
+             '--workers', str(workers), '--log-level', 'warning'],
+            env=environment,
+        )
+        try:
+            self.wait_for_port(process, port)
+            # gunicorn trusts X-Forwarded-Proto from localhost, which skips the HTTPS redirect.
+            return run_load(f'http://127.0.0.1:{port}', headers={'X-Forwarded-Proto': 'https'}, **run)
+        finally:
+            process.terminate()
+            process.wait(timeout=SERVER_START_TIMEOUT)
+
+    def wait_for_port(self, process, port):
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f"gunicorn exited with status {process.returncode}")
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f"gunicorn did not start within {SERVER_START_TIMEOUT} seconds")
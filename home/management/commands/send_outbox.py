@@ -0,0 +1,46 @@
+"""
+send_outbox.py
+
+Management command delivering the emails queued in the outbox (see home/outbox.py).
+
+Usage:
+    python manage.py send_outbox             # drain once and exit (e.g. from cron)
+    python manage.py send_outbox --loop      # keep polling, for a dedicated worker process
+"""
+
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from home.outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbox emails over a single reused email connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE,
+                            help="Number of emails claimed per batch.")
+        parser.add_argument('--max-batches', type=int, default=None,
+                            help="Stop after this many batches per drain.")
+        parser.add_argument('--loop', action='store_true',
+                            help="Keep polling the outbox instead of exiting once it is empty.")
+        parser.add_argument('--interval', type=float, default=5.0,
+                            help="Seconds between polls when running with --loop.")
+
+    def handle(self, *args, **options):
+        connection = get_connection()
+
+        while True:
+            sent, failed = drain_outbox(
+                batch_size=options['batch_size'],
+                connection=connection,
+                max_batches=options['max_batches'],
+            )
+            if sent or failed or not options['loop']:
+                self.stdout.write(f"Outbox drained: {sent} sent, {failed} failed.")
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
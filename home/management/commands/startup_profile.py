@@ -0,0 +1,76 @@
+"""
+startup_profile.py
+
+Management command reporting where a worker's cold start spends its import time (see home/startup.py).
+
+Usage:
+    python manage.py startup_profile                 # median of 3 boots, top 15 packages and modules
+    python manage.py startup_profile --runs 7 --limit 30
+    python manage.py startup_profile --json          # machine-readable, e.g. to compare releases
+
+Exits with an error if the import time exceeds `STARTUP_IMPORT_BUDGET_MS` (or --budget-ms)
+or if a module of `LAZY_MODULES` was imported at start, so CI can run it as a benchmark.
+"""
+
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from home.startup import eager_lazy_modules, package_times, profile_startups
+
+
+class Command(BaseCommand):
+    help = "Boot a worker in a fresh interpreter and report its import-time breakdown."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3,
+                            help="Boots to run; the median one is reported.")
+        parser.add_argument('--limit', type=int, default=15,
+                            help="Packages and modules listed.")
+        parser.add_argument('--budget-ms', type=float, default=None,
+                            help="Import time budget; defaults to STARTUP_IMPORT_BUDGET_MS, 0 disables it.")
+        parser.add_argument('--json', action='store_true',
+                            help="Write the report as JSON.")
+
+    def handle(self, *args, **options):
+        try:
+            profile = profile_startups(max(1, options['runs']))
+        except RuntimeError as error:
+            raise CommandError(error)
+
+        limit = options['limit']
+        packages = package_times(profile['imports'])[:limit]
+        modules = sorted(profile['imports'], key=lambda item: item[2], reverse=True)[:limit]
+        eager = eager_lazy_modules(profile['modules'])
+        budget = settings.STARTUP_IMPORT_BUDGET_MS if options['budget_ms'] is None else options['budget_ms']
+
+        if options['json']:
+            self.stdout.write(json.dumps({
+                'wall_ms': round(profile['wall_ms'], 1),
+                'import_ms': round(profile['import_ms'], 1),
+                'budget_ms': budget,
+                'modules_loaded': len(profile['modules']),
+                'eager_lazy_modules': eager,
+                'packages': [{'package': name, 'self_ms': round(own / 1000, 1)} for name, own in packages],
+                'modules': [
+                    {'module': name, 'self_ms': round(own / 1000, 1), 'cumulative_ms': round(cumulative / 1000, 1)}
+                    for name, own, cumulative in modules
+                ],
+            }, indent=2))
+        else:
+            self.stdout.write(
+                f"Worker boot: {profile['wall_ms']:.0f} ms wall, {profile['import_ms']:.0f} ms importing "
+                f"{len(profile['modules'])} modules (budget {budget:.0f} ms)."
+            )
+            self.stdout.write("\nSelf import time per package:")
+            for name, own in packages:
+                self.stdout.write(f"  {own / 1000:8.1f} ms  {name}")
+            self.stdout.write("\nCumulative import time per module:")
+            for name, own, cumulative in modules:
+                self.stdout.write(f"  {cumulative / 1000:8.1f} ms  {name} (self {own / 1000:.1f} ms)")
+
+        if eager:
+            raise CommandError(f"Imported at start but meant to load on first use: {', '.join(eager)}")
+        if budget and profile['import_ms'] > budget:
+            raise CommandError(f"Import time {profile['import_ms']:.0f} ms exceeds the {budget:.0f} ms budget")
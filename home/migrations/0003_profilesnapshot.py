@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 01:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0002_projectimage_delete_image_alter_mycontact_icon_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileSnapshot',
+            fields=[
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='snapshot', serialize=False, to='home.profile')),
+                ('data', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Profile Snapshot',
+                'verbose_name_plural': 'Profile Snapshots',
+            },
+        ),
+    ]
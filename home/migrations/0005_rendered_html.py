@@ -0,0 +1,224 @@
+# Generated by Django 5.2 on 2026-10-18 02:18
+
+import html
+import re
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from django.db import migrations, models
+
+# ------------------ Frozen sanitizer ------------------ #
+# Copy of home/sanitize.py as of this migration, so later changes to the allow-list or
+# the minifier do not change what this migration writes.
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'code', 'div', 'em', 'figcaption', 'figure',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'img', 'li', 'ol', 'p', 'pre', 's',
+    'span', 'strong', 'sub', 'sup', 'table', 'tbody', 'td', 'th', 'thead', 'tr', 'u', 'ul',
+}
+VOID_TAGS = {'br', 'hr', 'img'}
+# Dropped together with everything inside them.
+DROP_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'template', 'noscript', 'head', 'title'}
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'title', 'target'},
+    'img': {'src', 'alt', 'title', 'width', 'height'},
+    'ol': {'start'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan'},
+}
+# Opening one of these closes a sibling of the same tag left open, as browsers do.
+AUTO_CLOSE_TAGS = {'li', 'p', 'td', 'th', 'tr'}
+URL_ATTRIBUTES = {'href', 'src'}
+ALLOWED_SCHEMES = {'', 'http', 'https', 'mailto', 'tel'}
+
+BLOCK_TAGS = r'(?:blockquote|br|div|figcaption|figure|h[1-6]|hr|li|ol|p|pre|table|tbody|td|th|thead|tr|ul)'
+_whitespace = re.compile(r'\s+')
+_block_boundary = re.compile(r'\s*(</?%s\b[^>]*>)\s*' % BLOCK_TAGS)
+_empty_paragraph = re.compile(r'<p>(?:\s|\xa0|<br>)*</p>')
+_pre_block = re.compile(r'(<pre>.*?</pre>)', re.S)
+
+
+def is_safe_url(value):
+    """Returns whether a link or image URL is relative or uses an allowed scheme."""
+    value = re.sub(r'[\x00-\x20]', '', value)
+    try:
+        return urlsplit(value).scheme.lower() in ALLOWED_SCHEMES
+    except ValueError:
+        return False
+
+
+class _Sanitizer(HTMLParser):
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.out = []
+        self.stack = []
+        self.dropping = 0
+        self.in_pre = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping or tag not in ALLOWED_TAGS:
+            return
+        if tag in AUTO_CLOSE_TAGS and self.stack and self.stack[-1] == tag:
+            self.handle_endtag(tag)
+
+        allowed = ALLOWED_ATTRIBUTES.get(tag, ())
+        kept = []
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRIBUTES and not is_safe_url(value):
+                continue
+            kept.append((name, value))
+        if tag == 'a' and ('target', '_blank') in kept:
+            kept.append(('rel', 'noopener noreferrer'))
+
+        self.out.append('<%s%s>' % (tag, ''.join(' %s="%s"' % (name, html.escape(value)) for name, value in kept)))
+        if tag not in VOID_TAGS:
+            self.stack.append(tag)
+            if tag == 'pre':
+                self.in_pre += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping -= 1
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping = max(self.dropping - 1, 0)
+            return
+        if self.dropping or tag not in self.stack:
+            return
+        # Close any elements left open inside this one.
+        while self.stack:
+            open_tag = self.stack.pop()
+            self.out.append('</%s>' % open_tag)
+            if open_tag == 'pre':
+                self.in_pre -= 1
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self.dropping:
+            return
+        if not self.in_pre:
+            data = _whitespace.sub(' ', data)
+        self.out.append(html.escape(data, quote=False))
+
+    def close(self):
+        super().close()
+        while self.stack:
+            self.out.append('</%s>' % self.stack.pop())
+        return ''.join(self.out)
+
+
+def _minify(fragment):
+    parts = _pre_block.split(fragment)
+    for i in range(0, len(parts), 2):
+        parts[i] = _empty_paragraph.sub('', _block_boundary.sub(r'\1', parts[i]))
+    return ''.join(parts).strip()
+
+
+def sanitize_html(value):
+    """
+    Sanitizes and minifies an HTML fragment.
+
+    Args:
+        value (str | None): Editor HTML.
+
+    Returns:
+        str: The safe, compact fragment.
+    """
+    if not value:
+        return ''
+    parser = _Sanitizer()
+    parser.feed(value)
+    return _minify(parser.close())
+
+
+# ------------------ Migration ------------------ #
+
+HTML_FIELDS = {
+    'Experience': ['description'],
+    'Leadership': ['description'],
+    'Portfolio': ['body'],
+    'Profile': [
+        'biography', 'welcome_summary', 'intro_summary', 'resume_summary',
+        'academic_projects_summary', 'side_projects_summary', 'contact_summary',
+    ],
+}
+
+
+def render_existing_html(apps, schema_editor):
+    for model_name, fields in HTML_FIELDS.items():
+        model = apps.get_model('home', model_name)
+        objects = list(model.objects.only('pk', *fields))
+        for obj in objects:
+            for name in fields:
+                setattr(obj, f'{name}_html', sanitize_html(getattr(obj, name)))
+        model.objects.bulk_update(objects, [f'{name}_html' for name in fields], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0004_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='experience',
+            name='description_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='leadership',
+            name='description_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='portfolio',
+            name='body_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='academic_projects_summary_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='biography_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='contact_summary_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='intro_summary_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='resume_summary_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='side_projects_summary_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='welcome_summary_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(render_existing_html, migrations.RunPython.noop),
+    ]
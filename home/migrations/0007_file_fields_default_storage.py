@@ -0,0 +1,54 @@
+# Generated by Django 5.2 on 2026-10-18 02:58
+
+import home.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0006_timestamps_model_versions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='mycontact',
+            name='icon',
+            field=models.ImageField(blank=True, null=True, upload_to='images'),
+        ),
+        migrations.AlterField(
+            model_name='portfolio',
+            name='image',
+            field=models.ImageField(blank=True, null=True, upload_to='portfolios'),
+        ),
+        migrations.AlterField(
+            model_name='profile',
+            name='avatar',
+            field=models.ImageField(blank=True, null=True, upload_to='avatars'),
+        ),
+        migrations.AlterField(
+            model_name='profile',
+            name='resume',
+            field=models.FileField(blank=True, null=True, upload_to='resumes'),
+        ),
+        migrations.AlterField(
+            model_name='profile',
+            name='work',
+            field=models.FileField(blank=True, null=True, upload_to='work_samples'),
+        ),
+        migrations.AlterField(
+            model_name='projectimage',
+            name='image',
+            field=models.ImageField(blank=True, null=True, upload_to='projects'),
+        ),
+        migrations.AlterField(
+            model_name='skill',
+            name='image',
+            field=models.FileField(blank=True, null=True, upload_to='logos'),
+        ),
+        migrations.AlterField(
+            model_name='video',
+            name='video_file',
+            field=models.FileField(upload_to='videos/', validators=[home.models.validate_video_file_extension]),
+        ),
+    ]
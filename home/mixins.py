@@ -0,0 +1,333 @@
+"""
+mixins.py
+
+Reusable mixins for the DRF ViewSets in views.py.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+from rest_framework.response import Response
+from watson import search as watson
+
+from .models import Profile
+from .sanitize import render_html_fields
+from .search import index_objects
+from .signals import bulk_affected_profile_ids
+from .snapshots import schedule_snapshot_rebuild
+from .versioning import bump_model_version, get_model_states
+
+
+class QueryPlanMixin:
+    """
+    Applies the select/prefetch plan declared on a ViewSet to its queryset.
+
+    Attributes:
+        select_related_fields (tuple): Forward relations joined in the main query.
+        prefetch_related_fields (tuple): Relations loaded with one extra query each.
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    def get_queryset(self):
+        """
+        Returns the ViewSet queryset with its query plan applied.
+
+        Returns:
+            QuerySet: The planned queryset.
+        """
+        queryset = super().get_queryset()
+        if self.select_related_fields:
+            queryset = queryset.select_related(*self.select_related_fields)
+        if self.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*self.prefetch_related_fields)
+        return queryset
+
+
+class NotModified(Exception):
+    """Raised to answer a conditional request before the handler runs."""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    Answers conditional list/retrieve requests with a 304 before anything is serialized.
+
+    The ETag and Last-Modified validators are derived from the versions and change times of the
+    models the endpoint reads (see versioning.py), which cost one cache lookup instead
+    of a query and a serialization. Responses carry `Cache-Control: no-cache`, so clients
+    revalidate every time instead of guessing a freshness lifetime.
+
+    Attributes:
+        versioned_models (tuple): Models the responses depend on; defaults to the queryset model.
+    """
+    versioned_models = ()
+    conditional_actions = ('list', 'retrieve')
+
+    def get_versioned_models(self):
+        return self.versioned_models or (self.queryset.model,)
+
+    def get_validators(self):
+        """
+        Computes the validators of the current request.
+
+        Returns:
+            tuple: (ETag, Last-Modified timestamp in seconds)
+        """
+        states = get_model_states(self.get_versioned_models())
+        fingerprint = '|'.join(
+            [self.request.get_full_path(), self.request.accepted_renderer.format]
+            + [f'{label}={states[label][0]}' for label in sorted(states)]
+        )
+        etag = '"%s"' % hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:32]
+        return etag, int(max(modified for _, modified in states.values()))
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.validators = None
+        if self.action in self.conditional_actions and request.method in ('GET', 'HEAD'):
+            self.validators = self.get_validators()
+            etag, last_modified = self.validators
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is not None:
+                raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, 'validators', None)
+        if validators and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, no_cache=True)
+        return response
+
+
+class PrefetchedObjects:
+    """
+    Stands in for the queryset of a related field, answering its `get(pk=...)` from
+    objects loaded once for a whole batch.
+    """
+
+    def __init__(self, model, objects):
+        self.model = model
+        self.objects = objects
+
+    def get(self, pk):
+        try:
+            pk = self.model._meta.pk.to_python(pk)
+        except DjangoValidationError:
+            raise ValueError(pk)
+        try:
+            return self.objects[pk]
+        except (KeyError, TypeError):
+            raise self.model.DoesNotExist()
+
+
+class BatchWriteMixin:
+    """
+    Adds a `batch` endpoint to a ModelViewSet creating or partially updating a list of
+    objects in one request:
+
+    - `POST <prefix>/batch/` with a list of objects creates them with `bulk_create`
+    - `PATCH <prefix>/batch/` with a list of objects carrying their `id` updates the
+      given fields with `bulk_update`
+
+    Every item is validated by the ViewSet serializer before anything is written. If any
+    item is invalid, nothing is written and a 400 lists the errors per item index.
+    Otherwise all writes run in one transaction. M2M values are written straight into
+    the through table. The related objects the items refer to are loaded with one query
+    per relation for the whole batch. Bulk writes send no signals, so the snapshot
+    rebuilds are scheduled and the search index is updated here; the model versions
+    are bumped by `TimestampedQuerySet`.
+    """
+
+    @action(detail=False, methods=['post', 'patch'], url_path='batch')
+    def batch(self, request, *args, **kwargs):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response({'detail': 'Expected a non-empty list of objects.'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.API_BATCH_MAX_SIZE:
+            return Response(
+                {'detail': f'A batch holds at most {settings.API_BATCH_MAX_SIZE} objects.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if request.method == 'POST':
+            return self.batch_create(items)
+        return self.batch_partial_update(items)
+
+    def batch_create(self, items):
+        serializers = [self.get_serializer(data=item) for item in items]
+        self.prefetch_batch_relations(serializers)
+        errors = self.get_batch_errors(serializers)
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        model = self.get_queryset().model
+        with transaction.atomic():
+            instances, relations = [], []
+            for serializer in serializers:
+                instance, values, _ = self.build_batch_instance(model(), serializer.validated_data, created=True)
+                instances.append(instance)
+                relations.append(values)
+            model.objects.bulk_create(instances)
+            self.finish_batch(model, instances, relations)
+        return Response(self.serialize_batch(instances), status=status.HTTP_201_CREATED)
+
+    def batch_partial_update(self, items):
+        ids = [item.get('id') if isinstance(item, dict) else None for item in items]
+        found = self.get_queryset().in_bulk([pk for pk in ids if isinstance(pk, int)])
+
+        serializers, errors, seen = [], [], set()
+        for index, (pk, item) in enumerate(zip(ids, items)):
+            if pk not in found or pk in seen:
+                reason = 'Duplicate id in batch.' if pk in seen else 'Not found.'
+                errors.append({'index': index, 'errors': {'id': [reason]}})
+                continue
+            seen.add(pk)
+            serializers.append(self.get_serializer(found[pk], data=item, partial=True))
+        self.prefetch_batch_relations(serializers)
+        errors = sorted(errors + self.get_batch_errors(serializers, ids), key=lambda error: error['index'])
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        model = self.get_queryset().model
+        with transaction.atomic():
+            instances, relations, fields = [], [], set()
+            for serializer in serializers:
+                instance, values, written = self.build_batch_instance(serializer.instance, serializer.validated_data)
+                instances.append(instance)
+                relations.append(values)
+                fields |= written
+            # Read before the update, which may move objects away from these profiles.
+            profile_ids = bulk_affected_profile_ids(model, [instance.pk for instance in instances])
+            if fields:
+                model.objects.bulk_update(instances, fields)
+            self.finish_batch(model, instances, relations, profile_ids)
+        return Response(self.serialize_batch(instances))
+
+    def prefetch_batch_relations(self, serializers):
+        """
+        Loads the objects the items refer to by primary key, one query per relation,
+        and has the serializers look them up there instead of one query per item.
+
+        Args:
+            serializers (list): One serializer per item, not validated yet.
+        """
+        if not serializers:
+            return
+        for name, field in serializers[0].fields.items():
+            many = isinstance(field, ManyRelatedField)
+            relation = field.child_relation if many else field
+            if field.read_only or not isinstance(relation, PrimaryKeyRelatedField) or relation.pk_field:
+                continue
+            queryset = relation.get_queryset()
+            pks = set()
+            for serializer in serializers:
+                value = serializer.initial_data.get(name) if isinstance(serializer.initial_data, dict) else None
+                for pk in (value if many and isinstance(value, list) else [value]):
+                    try:
+                        pks.add(queryset.model._meta.pk.to_python(pk))
+                    except (DjangoValidationError, TypeError):
+                        pass
+            pks.discard(None)
+            objects = PrefetchedObjects(queryset.model, queryset.in_bulk(pks) if pks else {})
+            for serializer in serializers:
+                field = serializer.fields[name]
+                (field.child_relation if many else field).queryset = objects
+
+    def get_batch_errors(self, serializers, ids=None):
+        """
+        Validates every serializer.
+
+        Args:
+            serializers (list): One serializer per item.
+            ids (list | None): Item ids, to map update serializers back to their item index.
+
+        Returns:
+            list: `{'index': ..., 'errors': ...}` for each invalid item.
+        """
+        errors = []
+        for position, serializer in enumerate(serializers):
+            if not serializer.is_valid():
+                index = ids.index(serializer.instance.pk) if ids is not None else position
+                errors.append({'index': index, 'errors': serializer.errors})
+        return errors
+
+    def build_batch_instance(self, instance, validated_data, created=False):
+        """
+        Applies validated data to an instance the way `save()` would, without saving it.
+
+        Returns:
+            tuple: (instance, {M2M field name: related objects}, names of the fields set)
+        """
+        many_to_many = {field.name for field in instance._meta.many_to_many}
+        relations = {name: value for name, value in validated_data.items() if name in many_to_many}
+        fields = {name for name in validated_data if name not in many_to_many}
+        for name in fields:
+            setattr(instance, name, validated_data[name])
+        fields |= render_html_fields(instance, update_fields=None if created else fields)
+        fields |= self.prepare_batch_instance(instance, created)
+        return instance, relations, fields
+
+    def prepare_batch_instance(self, instance, created):
+        """
+        Hook for the model-specific work of `save()` that bulk writes skip.
+
+        Returns:
+            set: Names of further fields that were set.
+        """
+        return set()
+
+    def finish_batch(self, model, instances, relations, profile_ids=()):
+        """
+        Writes the M2M values of the batch, updates the search index and schedules the
+        affected snapshot rebuilds.
+
+        Args:
+            profile_ids (Iterable[int]): Profiles that embedded the objects before the batch.
+        """
+        profile_ids = set(profile_ids)
+        for name in {name for values in relations for name in values}:
+            field = model._meta.get_field(name)
+            through = field.remote_field.through
+            source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+            assigned = [(instance, values[name]) for instance, values in zip(instances, relations) if name in values]
+
+            current = through.objects.filter(**{f'{source}__in': [instance.pk for instance, _ in assigned]})
+            if field.related_model is Profile:
+                profile_ids |= set(current.values_list(f'{target}_id', flat=True))
+            current.delete()
+            through.objects.bulk_create([
+                through(**{f'{source}_id': instance.pk, f'{target}_id': related.pk})
+                for instance, related_objects in assigned for related in related_objects
+            ])
+            bump_model_version(model)
+            bump_model_version(field.related_model)
+
+        if watson.is_registered(model):
+            # Bulk writes bypass watson's save handlers.
+            index_objects(model, instances)
+
+        profile_ids |= bulk_affected_profile_ids(model, [instance.pk for instance in instances])
+        schedule_snapshot_rebuild(profile_ids)
+
+    def serialize_batch(self, instances):
+        """Serializes the written objects in request order, reloaded with the ViewSet query plan."""
+        reloaded = self.get_queryset().in_bulk([instance.pk for instance in instances])
+        return self.get_serializer([reloaded[instance.pk] for instance in instances], many=True).data
@@ -10,20 +10,87 @@ Each model typically relates to the `Profile` model to support a dynamic user re
 
 import os
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.template.defaultfilters import slugify
 from django.core.exceptions import ValidationError
 from phonenumber_field.modelfields import PhoneNumberField
 from tinymce.models import HTMLField
 from django.contrib.auth.hashers import make_password, check_password
-from cloudinary_storage.storage import MediaCloudinaryStorage
+from .media import resolve_media_url, DEFAULT_IMAGE_URL, DEFAULT_AVATAR_URL, DEFAULT_DOCUMENT_URL
+from .sanitize import render_html_fields
+
+
+# ==========================
+# Base Models
+# ==========================
+
+class TimestampedQuerySet(models.QuerySet):
+    """
+    QuerySet keeping `updated_at` and the model version (see versioning.py) correct for
+    bulk writes, which bypass `save()` and the post_save/post_delete signals.
+    """
+
+    def update(self, **kwargs):
+        kwargs.setdefault('updated_at', timezone.now())
+        rows = super().update(**kwargs)
+        if rows:
+            from .versioning import bump_model_version
+            bump_model_version(self.model)
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        if objs:
+            from .versioning import bump_model_version
+            bump_model_version(self.model)
+        return objs
+
+    # bulk_update() runs through update(), which stamps and bumps the model.
+
+
+class TimestampedModel(models.Model):
+    """
+    Abstract base adding indexed creation and modification times.
+    """
+    created_at = models.DateTimeField(default=timezone.now, editable=False, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = TimestampedQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'updated_at'}
+        super().save(*args, **kwargs)
+
+
+class RenderedHTMLModel(models.Model):
+    """
+    Abstract base for models with `HTMLField`s. Each HTMLField `x` is paired with a
+    non-editable `x_html` field holding its sanitized, minified fragment, which is
+    regenerated on save and is what templates and serializers output.
+    """
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        rendered = render_html_fields(self, update_fields)
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | rendered
+        super().save(*args, **kwargs)
 
 
 # ==========================
 # Education Model
 # ==========================
 
-class Education(models.Model):
+class Education(TimestampedModel):
     """Model to store educational background"""
     degree = models.CharField(blank=True, null=True, max_length=250)
     school = models.CharField(blank=True, null=True, max_length=250)
@@ -48,10 +115,10 @@ class Education(models.Model):
 # Skill Model
 # ==========================
 
-class Skill(models.Model):
+class Skill(TimestampedModel):
     """Model to store skills and their attributes"""
     name = models.CharField(max_length=25, blank=True, null=True)
-    image = models.FileField(upload_to="logos", storage=MediaCloudinaryStorage(), null=True, blank=True)
+    image = models.FileField(upload_to="logos", null=True, blank=True)
     rating = models.IntegerField(default=4, null=True, blank=True)
     is_key_skill = models.BooleanField(default=False)
     is_hard_skill = models.BooleanField(default=False)
@@ -70,16 +137,14 @@ class Skill(models.Model):
     @property
     def get_logo_url(self):
         """Returns logo URL or a default image"""
-        if self.image and hasattr(self.image, 'url'):
-            return self.image.url
-        return "https://res.cloudinary.com/dh13i9dce/image/upload/v1642216413/media/logos/default-thumb_dn1xzg.png"
+        return resolve_media_url(self.image, default=DEFAULT_IMAGE_URL)
 
 
 # ==========================
 # Course Model
 # ==========================
 
-class Course(models.Model):
+class Course(TimestampedModel):
     """Model to store completed or current courses"""
     name = models.CharField(blank=True, null=True, max_length=100)
     is_active = models.BooleanField(default=True)
@@ -99,12 +164,13 @@ class Course(models.Model):
 # Leadership Model
 # ==========================
 
-class Leadership(models.Model):
+class Leadership(TimestampedModel, RenderedHTMLModel):
     """Model for campus involvement or leadership experience"""
     name = models.CharField(blank=True, null=True, max_length=500)
     is_active = models.BooleanField(default=True)
     date = models.DateTimeField(blank=True, null=True)
     description = HTMLField()
+    description_html = models.TextField(blank=True, default='', editable=False)
     profiles = models.ManyToManyField('Profile', related_name='all_leaderships')
 
     class Meta:
@@ -119,11 +185,11 @@ class Leadership(models.Model):
 # MyContact Model
 # ==========================
 
-class MyContact(models.Model):
+class MyContact(TimestampedModel):
     """Model to store user’s external links (e.g. LinkedIn, GitHub)"""
     name = models.CharField(blank=True, null=True, max_length=250)
     data = models.CharField(blank=True, null=True, max_length=250)
-    icon = models.ImageField(blank=True, null=True, storage=MediaCloudinaryStorage(), upload_to="images")
+    icon = models.ImageField(blank=True, null=True, upload_to="images")
     category = models.CharField(blank=True, null=True, max_length=250)
     is_active = models.BooleanField(default=True)
     url = models.URLField(blank=True, null=True)
@@ -140,23 +206,22 @@ class MyContact(models.Model):
     @property
     def get_icon_url(self):
         """Returns icon URL or a default icon"""
-        if self.icon and hasattr(self.icon, 'url'):
-            return self.icon.url
-        return "https://res.cloudinary.com/dh13i9dce/image/upload/v1642216413/media/logos/default-thumb_dn1xzg.png"
+        return resolve_media_url(self.icon, default=DEFAULT_IMAGE_URL)
 
 
 # ==========================
 # Portfolio Model
 # ==========================
 
-class Portfolio(models.Model):
+class Portfolio(TimestampedModel, RenderedHTMLModel):
     """Model to store project/portfolio items"""
     name = models.CharField(blank=True, null=True, max_length=250)
-    image = models.ImageField(blank=True, null=True, storage=MediaCloudinaryStorage(), upload_to="portfolios")
+    image = models.ImageField(blank=True, null=True, upload_to="portfolios")
     is_active = models.BooleanField(default=True)
     slug = models.SlugField(null=True, blank=True)
     description = models.CharField(blank=True, null=True, max_length=250)
     body = HTMLField()
+    body_html = models.TextField(blank=True, default='', editable=False)
     date = models.DateTimeField(blank=True, null=True)
     is_side_project = models.BooleanField(null=True, blank=True)
     for_resume = models.BooleanField(default=False)
@@ -184,16 +249,14 @@ class Portfolio(models.Model):
 
     @property
     def get_logo_url(self):
-        if self.image and hasattr(self.image, 'url'):
-            return self.image.url
-        return "https://res.cloudinary.com/dh13i9dce/image/upload/v1642216413/media/logos/default-thumb_dn1xzg.png"
+        return resolve_media_url(self.image, default=DEFAULT_IMAGE_URL)
 
 
 # ==========================
 # Experience Model
 # ==========================
 
-class Experience(models.Model):
+class Experience(TimestampedModel, RenderedHTMLModel):
     """Model to represent job experience"""
     job_title = models.CharField(max_length=250)
     company_name = models.CharField(max_length=250)
@@ -203,6 +266,7 @@ class Experience(models.Model):
     is_current = models.BooleanField(default=False)
     active = models.BooleanField(default=False)
     description = HTMLField()
+    description_html = models.TextField(blank=True, default='', editable=False)
     profiles = models.ManyToManyField('Profile', related_name='all_experiences')
 
     class Meta:
@@ -216,15 +280,15 @@ class Experience(models.Model):
 # Profile Model
 # ==========================
 
-class Profile(models.Model):
+class Profile(TimestampedModel, RenderedHTMLModel):
     """Model for a user's portfolio profile"""
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     title = models.CharField(max_length=250, blank=True, null=True)
     biography = HTMLField(default="Passionate about building clean, scalable software that solves real-world problems.")
-    avatar = models.ImageField(blank=True, null=True, storage=MediaCloudinaryStorage(),upload_to="avatars")
-    resume = models.FileField(blank=True, null=True, storage=MediaCloudinaryStorage(), upload_to="resumes")
+    avatar = models.ImageField(blank=True, null=True, upload_to="avatars")
+    resume = models.FileField(blank=True, null=True, upload_to="resumes")
     resume_password = models.CharField(max_length=255, blank=True, null=True)
-    work = models.FileField(blank=True, null=True, storage=MediaCloudinaryStorage(), upload_to="work_samples")
+    work = models.FileField(blank=True, null=True, upload_to="work_samples")
     welcome_summary = HTMLField(default="My passion...")
     intro_summary = HTMLField(default="Passionate about building clean, scalable solutions.")
     resume_summary = HTMLField(default="A quick overview of my experience, skills, and education.")
@@ -232,6 +296,13 @@ class Profile(models.Model):
         default="Projects built during my studies, focused on applying core concepts.")
     side_projects_summary = HTMLField(default="Independent work exploring new tools and solving real problems.")
     contact_summary = HTMLField(default="Let’s connect — I’m open to opportunities, ideas, or questions.")
+    biography_html = models.TextField(blank=True, default='', editable=False)
+    welcome_summary_html = models.TextField(blank=True, default='', editable=False)
+    intro_summary_html = models.TextField(blank=True, default='', editable=False)
+    resume_summary_html = models.TextField(blank=True, default='', editable=False)
+    academic_projects_summary_html = models.TextField(blank=True, default='', editable=False)
+    side_projects_summary_html = models.TextField(blank=True, default='', editable=False)
+    contact_summary_html = models.TextField(blank=True, default='', editable=False)
     courses = models.ManyToManyField(Course, blank=True)
     leaderships = models.ManyToManyField(Leadership, blank=True)
     skills = models.ManyToManyField(Skill, blank=True)
@@ -262,21 +333,15 @@ class Profile(models.Model):
 
     @property
     def get_resume_url(self):
-        if self.resume and hasattr(self.resume, 'url'):
-            return self.resume.url
-        return "https://res.cloudinary.com/dh13i9dce/image/upload/v1657859552/media/resumes/online_resume_kn1apo.pdf"
+        return resolve_media_url(self.resume, default=DEFAULT_DOCUMENT_URL)
 
     @property
     def get_work_samples_url(self):
-        if self.work and hasattr(self.work, 'url'):
-            return self.work.url
-        return "https://res.cloudinary.com/dh13i9dce/image/upload/v1657859552/media/resumes/online_resume_kn1apo.pdf"
+        return resolve_media_url(self.work, default=DEFAULT_DOCUMENT_URL)
 
     @property
     def get_avatar_url(self):
-        if self.avatar and hasattr(self.avatar, 'url'):
-            return self.avatar.url
-        return "https://res.cloudinary.com/dh13i9dce/image/upload/v1642216377/media/avatars/defaultprofile_vad1ub.png"
+        return resolve_media_url(self.avatar, default=DEFAULT_AVATAR_URL)
 
 
 # ==========================
@@ -300,11 +365,54 @@ class Contact(models.Model):
         return f"{self.name} ({self.email})"
 
 
+# ==========================
+# Outgoing Email Model
+# ==========================
+
+class OutgoingEmail(models.Model):
+    """Email queued in the outbox, delivered by the `send_outbox` management command"""
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    contact = models.ForeignKey(
+        'Contact',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='emails'
+    )
+    subject = models.CharField(max_length=250)
+    body = models.TextField()
+    from_email = models.CharField(max_length=250)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = 'Outgoing Email'
+        verbose_name_plural = 'Outgoing Emails'
+        ordering = ['next_attempt_at']
+        indexes = [models.Index(fields=['status', 'next_attempt_at'])]
+
+    def __str__(self):
+        return f"{self.subject} ({self.status})"
+
+
 # ==========================
 # Feedback Model
 # ==========================
 
-class Feedback(models.Model):
+class Feedback(TimestampedModel):
     """Model for testimonial or feedback quotes"""
     name = models.CharField(blank=True, null=True, max_length=250)
     role = models.CharField(blank=True, null=True, max_length=250)
@@ -322,16 +430,14 @@ class Feedback(models.Model):
 
     @property
     def get_thumbnail_url(self):
-        if self.thumbnail and hasattr(self.thumbnail, 'url'):
-            return self.thumbnail.url
-        return "https://res.cloudinary.com/dh13i9dce/image/upload/v1642216413/media/logos/default-thumb_dn1xzg.png"
+        return resolve_media_url(self.thumbnail, default=DEFAULT_IMAGE_URL)
 
 
 # ==========================
 # Image Model
 # ==========================
 
-class ProjectImage(models.Model):
+class ProjectImage(TimestampedModel):
     """Model for images associated with a project/portfolio item"""
     portfolio = models.ForeignKey(
         'Portfolio',
@@ -343,7 +449,6 @@ class ProjectImage(models.Model):
     image = models.ImageField(
         blank=True,
         null=True,
-        storage=MediaCloudinaryStorage(),
         upload_to="projects"
     )
     is_image = models.BooleanField(default=True)
@@ -365,9 +470,7 @@ class ProjectImage(models.Model):
     @property
     def get_image_url(self):
         # Return image URL if exists, else default placeholder
-        if self.image and hasattr(self.image, 'url'):
-            return self.image.url
-        return "https://res.cloudinary.com/dh13i9dce/image/upload/v1642216413/media/logos/default-thumb_dn1xzg.png"
+        return resolve_media_url(self.image, default=DEFAULT_IMAGE_URL)
 
 # ==========================
 # Video Model
@@ -380,12 +483,11 @@ def validate_video_file_extension(value):
         raise ValidationError('Unsupported video file extension.')
 
 
-class Video(models.Model):
+class Video(TimestampedModel):
     """Model for uploaded videos"""
     name = models.CharField(max_length=100)
     url = models.URLField(blank=True, null=True)
-    video_file = models.FileField(upload_to='videos/', storage=MediaCloudinaryStorage(),
-                                  validators=[validate_video_file_extension])
+    video_file = models.FileField(upload_to='videos/', validators=[validate_video_file_extension])
     uploaded_at = models.DateTimeField(auto_now_add=True)
     is_video = models.BooleanField(default=True)
 
@@ -404,6 +506,45 @@ class Video(models.Model):
 
     @property
     def get_video_url(self):
-        if self.video_file and hasattr(self.video_file, 'url'):
-            return self.video_file.url
-        return ""
+        return resolve_media_url(self.video_file)
+
+
+# ==========================
+# Profile Snapshot Model
+# ==========================
+
+class ProfileSnapshot(models.Model):
+    """Precomputed serialized representation of a Profile, served by the profiles API"""
+    profile = models.OneToOneField(
+        'Profile',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='snapshot'
+    )
+    data = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Profile Snapshot'
+        verbose_name_plural = 'Profile Snapshots'
+
+    def __str__(self):
+        return f"Snapshot for profile {self.profile_id}"
+
+
+# ==========================
+# Model Version Model
+# ==========================
+
+class ModelVersion(models.Model):
+    """Monotonic change counter of a model, bumped in the transaction that changes it (see versioning.py)"""
+    label = models.CharField(max_length=100, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = 'Model Version'
+        verbose_name_plural = 'Model Versions'
+
+    def __str__(self):
+        return f"{self.label} v{self.version}"
@@ -0,0 +1,187 @@
+"""
+outbox.py
+
+Durable outbox for outgoing email.
+
+Contact submissions no longer talk to the SMTP server while the visitor waits. The email
+is written to the `OutgoingEmail` table in the same transaction as the `Contact` row and
+delivered later by `manage.py send_outbox`, which drains the table in batches over a
+single reused connection and retries failures with exponential backoff.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, BadHeaderError, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .instrumentation import timed
+from .models import OutgoingEmail
+
+
+def enqueue_email(subject, body, recipient_list, from_email=None, contact=None):
+    """
+    Queues an email for delivery.
+
+    Call it inside the transaction that saves the related data, so the email
+    exists if and only if that data was committed.
+
+    Args:
+        subject (str): Email subject.
+        body (str): Email body.
+        recipient_list (list[str]): Recipient addresses.
+        from_email (str | None): Sender address, defaults to `DEFAULT_FROM_EMAIL`.
+        contact (Contact | None): The contact submission the email is about.
+
+    Returns:
+        OutgoingEmail: The queued email.
+    """
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email or str(settings.DEFAULT_FROM_EMAIL),
+        recipients=[str(recipient) for recipient in recipient_list],
+        contact=contact,
+    )
+
+
+def retry_delay(attempts):
+    """
+    Returns how long to wait before the next delivery attempt.
+
+    Args:
+        attempts (int): Number of failed attempts so far.
+
+    Returns:
+        timedelta: Exponential backoff capped at `OUTBOX_MAX_BACKOFF` seconds.
+    """
+    seconds = settings.OUTBOX_RETRY_BACKOFF * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(seconds, settings.OUTBOX_MAX_BACKOFF))
+
+
+def record_failure(email, error):
+    """
+    Records a failed delivery attempt, scheduling a retry or giving up.
+
+    Args:
+        email (OutgoingEmail): The email that could not be sent.
+        error (Exception): The delivery error.
+    """
+    email.attempts += 1
+    email.last_error = str(error)
+    if email.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        email.status = OutgoingEmail.STATUS_FAILED
+    else:
+        email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+
+
+def claim_batch(batch_size):
+    """
+    Claims a batch of due emails.
+
+    Claimed rows get their next attempt pushed back by `OUTBOX_CLAIM_TIMEOUT`, so
+    concurrent workers skip them, and a worker that dies mid-batch only delays them.
+
+    Args:
+        batch_size (int): Maximum number of emails to claim.
+
+    Returns:
+        list[OutgoingEmail]: The claimed emails.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutgoingEmail.STATUS_PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        if batch:
+            OutgoingEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+                next_attempt_at=now + timedelta(seconds=settings.OUTBOX_CLAIM_TIMEOUT)
+            )
+    return batch
+
+
+def deliver_batch(batch, connection):
+    """
+    Sends a batch of emails over an open connection and records the outcome.
+
+    Args:
+        batch (list[OutgoingEmail]): Emails to send.
+        connection: An email backend connection.
+
+    Returns:
+        tuple: Number of (sent, failed) emails.
+    """
+    sent = failed = 0
+    for email in batch:
+        try:
+            with timed('smtp'):
+                EmailMessage(
+                    subject=email.subject,
+                    body=email.body,
+                    from_email=email.from_email,
+                    to=email.recipients,
+                    connection=connection,
+                ).send(fail_silently=False)
+        except BadHeaderError as e:
+            # Retrying cannot fix a malformed message.
+            email.attempts += 1
+            email.status = OutgoingEmail.STATUS_FAILED
+            email.last_error = f'Invalid header found: {e}'
+            failed += 1
+        except Exception as e:
+            record_failure(email, e)
+            failed += 1
+        else:
+            email.attempts += 1
+            email.status = OutgoingEmail.STATUS_SENT
+            email.sent_at = timezone.now()
+            email.last_error = ''
+            sent += 1
+
+    OutgoingEmail.objects.bulk_update(
+        batch, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at']
+    )
+    return sent, failed
+
+
+def drain_outbox(batch_size=None, connection=None, max_batches=None):
+    """
+    Delivers due emails until none are left.
+
+    Args:
+        batch_size (int | None): Emails per batch, defaults to `OUTBOX_BATCH_SIZE`.
+        connection: Email backend connection to reuse, defaults to `get_connection()`.
+        max_batches (int | None): Stop after this many batches.
+
+    Returns:
+        tuple: Number of (sent, failed) emails.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    connection = connection or get_connection()
+    total_sent = total_failed = batches = 0
+
+    while max_batches is None or batches < max_batches:
+        batch = claim_batch(batch_size)
+        if not batch:
+            break
+        batches += 1
+        try:
+            connection.open()
+        except Exception as e:
+            # The server is unreachable; back off the whole batch.
+            for email in batch:
+                record_failure(email, e)
+            OutgoingEmail.objects.bulk_update(
+                batch, ['status', 'attempts', 'next_attempt_at', 'last_error']
+            )
+            total_failed += len(batch)
+            break
+        sent, failed = deliver_batch(batch, connection)
+        total_sent += sent
+        total_failed += failed
+
+    connection.close()
+    return total_sent, total_failed
@@ -0,0 +1,134 @@
+"""
+page_cache.py
+
+Full-page cache for the read-only template views.
+
+A cached page is keyed by the host, the full path and the versions of the models
+it renders (see versioning.py), so any save, delete or M2M change to one of those models
+makes every page depending on it miss and re-render. Requests carrying flash messages or
+an authenticated session always bypass the cache, since their HTML differs per visitor.
+"""
+
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from .models import Profile
+from .versioning import get_model_versions
+
+# Every page renders the site owner in its layout.
+BASE_PAGE_MODELS = (User, Profile)
+
+
+def page_cache_key(request, versions):
+    """
+    Builds the cache key of a page.
+
+    Args:
+        request (HttpRequest): The page request.
+        versions (dict): Versions of the models the page renders.
+
+    Returns:
+        str: The cache key.
+    """
+    path = f'{request.get_host()}{request.get_full_path()}'
+    version = ','.join(f'{label}={versions[label]}' for label in sorted(versions))
+    return 'page:' + hashlib.sha256(f'{path}|{version}'.encode('utf-8')).hexdigest()
+
+
+def is_cacheable_request(request):
+    """
+    Returns whether a request may be answered from (and stored in) the page cache.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    if len(get_messages(request)):
+        return False
+    user = getattr(request, 'user', None)
+    return not (user is not None and user.is_authenticated)
+
+
+def get_cached_page(request, dependencies):
+    """
+    Looks a page up in the cache.
+
+    Args:
+        request (HttpRequest): The page request.
+        dependencies (tuple): Models the page renders.
+
+    Returns:
+        tuple: (cache key, cached response). The key is None if the request bypasses
+        the cache; the response is None on a miss.
+    """
+    if not is_cacheable_request(request):
+        return None, None
+    key = page_cache_key(request, get_model_versions(dependencies))
+    cached = cache.get(key)
+    if cached is None:
+        return key, None
+    content, content_type = cached
+    response = HttpResponse(content, content_type=content_type)
+    response['X-Page-Cache'] = 'hit'
+    return key, response
+
+
+def store_page(key, response, timeout):
+    """Renders a view's response and stores it in the page cache if it is shareable."""
+    if hasattr(response, 'render') and callable(response.render):
+        response.render()
+    # Responses setting cookies (e.g. a CSRF token) are specific to this visitor.
+    if response.status_code == 200 and not response.streaming and not response.cookies:
+        cache.set(
+            key, (response.content, response['Content-Type']),
+            settings.PAGE_CACHE_TIMEOUT if timeout is None else timeout,
+        )
+        response['X-Page-Cache'] = 'miss'
+    return response
+
+
+def versioned_page_cache(*models, timeout=None):
+    """
+    Caches the rendered output of a view until one of `models` changes.
+
+    Works for sync and async views. For an async view, the lookup and the rendering
+    of a miss run in a worker thread, as they read the session and the database.
+
+    Args:
+        *models: Models the page renders, in addition to `BASE_PAGE_MODELS`.
+        timeout (int | None): Seconds to keep a page, defaults to `PAGE_CACHE_TIMEOUT`.
+
+    Returns:
+        function: The view decorator.
+    """
+    dependencies = BASE_PAGE_MODELS + models
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                key, cached = await sync_to_async(get_cached_page)(request, dependencies)
+                if cached is not None:
+                    return cached
+                response = await view_func(request, *args, **kwargs)
+                if key is None:
+                    return response
+                return await sync_to_async(store_page)(key, response, timeout)
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            key, cached = get_cached_page(request, dependencies)
+            if cached is not None:
+                return cached
+            response = view_func(request, *args, **kwargs)
+            if key is None:
+                return response
+            return store_page(key, response, timeout)
+        return wrapper
+    return decorator
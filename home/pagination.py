@@ -0,0 +1,23 @@
+"""
+pagination.py
+
+Pagination classes for the REST API.
+
+Cursor pagination is used for every list endpoint: it pages with an indexed
+`WHERE pk > cursor` instead of `OFFSET`, and never runs a `COUNT(*)`, so the cost of a
+page stays flat as the tables grow.
+"""
+
+from rest_framework.pagination import CursorPagination
+
+
+class DefaultCursorPagination(CursorPagination):
+    """
+    Cursor pagination over the primary key.
+
+    Clients may request up to `max_page_size` items with `?page_size=`.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = 'pk'
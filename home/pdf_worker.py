@@ -0,0 +1,90 @@
+"""
+pdf_worker.py
+
+Code executed inside the resume rendering process pool.
+
+Kept free of Django imports so pool processes start without setting up Django;
+WeasyPrint is only imported in those processes, never in web workers.
+
+The rendered documents contain profile data, so WeasyPrint may only fetch the
+media hosts it is given and the site's own static files, which are read from
+disk. Anything else, e.g. `file://` or internal hosts, is refused.
+"""
+
+import os
+import tempfile
+from functools import partial
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+FETCH_TIMEOUT = 10
+
+
+def resolve_asset_url(url, allowed_urls=(), static_url=None, static_root=None):
+    """
+    Checks that the resume may load an asset and returns the URL to fetch it from.
+
+    Args:
+        url (str): The absolute URL of the asset.
+        allowed_urls (tuple): URL prefixes that may be fetched, e.g. the media host.
+        static_url (str | None): Absolute URL of the static files, served from `static_root`.
+        static_root (str | None): Directory of the collected static files.
+
+    Returns:
+        str: The URL itself, or the `file://` URL of a static file.
+
+    Raises:
+        ValueError: If the URL is not allowed; WeasyPrint then skips the asset.
+    """
+    if url.startswith('data:') or (allowed_urls and url.startswith(tuple(allowed_urls))):
+        return url
+    if static_url and static_root and url.startswith(static_url):
+        root = os.path.realpath(static_root)
+        name = unquote(urlsplit(url[len(static_url):]).path)
+        path = os.path.realpath(os.path.join(root, name))
+        if path.startswith(root + os.sep) and os.path.isfile(path):
+            return Path(path).as_uri()
+    raise ValueError(f"Resume asset not allowed: {url}")
+
+
+def fetch_url(url, **options):
+    """URL fetcher of WeasyPrint restricted to the resume's own assets, see `resolve_asset_url()`."""
+    from weasyprint import default_url_fetcher
+
+    return default_url_fetcher(resolve_asset_url(url, **options), timeout=FETCH_TIMEOUT)
+
+
+def render_pdf(html, base_url, path, allowed_urls=(), static_url=None, static_root=None):
+    """
+    Renders an HTML document to a PDF file.
+
+    The PDF is written to a temporary file and moved into place, so readers
+    never observe a partially written cache entry.
+
+    Args:
+        html (str): The HTML document.
+        base_url (str): Base URL used to resolve relative links and assets.
+        path (str): Destination path of the PDF.
+        allowed_urls (tuple): URL prefixes assets may be fetched from, see `resolve_asset_url()`.
+        static_url (str | None): Absolute URL of the static files.
+        static_root (str | None): Directory the static files are read from.
+
+    Returns:
+        str: The destination path.
+    """
+    from weasyprint import HTML
+
+    url_fetcher = partial(fetch_url, allowed_urls=tuple(allowed_urls),
+                          static_url=static_url, static_root=static_root)
+
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            HTML(string=html, base_url=base_url, url_fetcher=url_fetcher).write_pdf(tmp_file)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
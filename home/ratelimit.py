@@ -0,0 +1,166 @@
+"""
+ratelimit.py
+
+Token-bucket rate limiting, per client IP and per named policy.
+
+A policy (see `RATE_LIMITS`) is a refill rate and a burst size: a client starts with a
+full bucket of `burst` tokens, each request takes one, and tokens flow back at the
+policy rate. The bucket state is a (tokens, timestamp) pair kept in the default cache, so
+all worker processes share it. If the cache backend fails, the limiter falls back to a
+per-process store instead of failing the request.
+
+The read-modify-write of a bucket is not atomic, so concurrent requests of one client may
+occasionally both take the same token; the limit is approximate by that margin.
+
+The limiter is applied in two ways:
+- `RateLimitMiddleware` for the template views, by URL name (`RATE_LIMIT_ROUTES`)
+- the `TokenBucketThrottle` subclasses for the DRF views (see throttles.py)
+"""
+
+import math
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from rest_framework.throttling import BaseThrottle
+
+KEY_PREFIX = 'ratelimit:'
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_local_buckets = {}
+_local_lock = threading.Lock()
+_policies = {}
+
+
+def parse_policy(value):
+    """
+    Parses a policy string of the form '<requests>/<period>[:<burst>]', e.g. '5/m:10'.
+
+    Args:
+        value (str): The policy; the period is s, m, h or d, and the burst defaults to <requests>.
+
+    Returns:
+        tuple: (tokens per second, burst size)
+
+    Raises:
+        ImproperlyConfigured: If the string is malformed.
+    """
+    try:
+        rate, _, burst = value.partition(':')
+        requests, period = rate.split('/')
+        requests = int(requests)
+        return requests / PERIODS[period.strip()[0]], int(burst or requests)
+    except (ValueError, KeyError, IndexError):
+        raise ImproperlyConfigured(f"Invalid rate limit policy {value!r}; expected e.g. '5/m' or '5/m:10'")
+
+
+def get_policy(name):
+    """Returns the parsed policy of a `RATE_LIMITS` entry."""
+    value = settings.RATE_LIMITS.get(name)
+    if value is None:
+        raise ImproperlyConfigured(f"No rate limit policy named {name!r} in RATE_LIMITS")
+    if _policies.get(name, (None,))[0] != value:
+        _policies[name] = (value, parse_policy(value))
+    return _policies[name][1]
+
+
+def _take(state, rate, burst, now):
+    tokens, stamp = state if state is not None else (burst, now)
+    tokens = min(burst, tokens + (now - stamp) * rate)
+    if tokens >= 1:
+        return (tokens - 1, now), 0.0
+    return (tokens, now), (1 - tokens) / rate
+
+
+def hit(policy, ident):
+    """
+    Takes a token from a client's bucket.
+
+    Args:
+        policy (str): Name of the policy.
+        ident (str): The client, e.g. its IP address.
+
+    Returns:
+        float: 0 if the request is allowed, otherwise the seconds until a token is available.
+    """
+    rate, burst = get_policy(policy)
+    key = f'{KEY_PREFIX}{policy}:{ident}'
+    now = time.time()
+    # Entries expire once the bucket would be full again, which is the default state.
+    timeout = math.ceil(burst / rate) + 1
+    try:
+        state, wait = _take(cache.get(key), rate, burst, now)
+        cache.set(key, state, timeout)
+    except Exception:
+        # The shared cache is unavailable: limit per process rather than not at all.
+        with _local_lock:
+            state, wait = _take(_local_buckets.get(key), rate, burst, now)
+            _local_buckets[key] = state
+    return wait
+
+
+def client_ident(request):
+    """
+    Returns the client IP that limits are keyed on.
+
+    With `NUM_PROXIES` at 0 (the default) this is REMOTE_ADDR. Otherwise it is the
+    X-Forwarded-For entry added by the outermost trusted proxy, so a client cannot get
+    a fresh bucket by sending its own header.
+    """
+    return BaseThrottle().get_ident(request)
+
+
+def rate_limited_response(wait):
+    """Returns the 429 response of the middleware."""
+    response = HttpResponse('Too many requests, please retry later.', status=429, content_type='text/plain')
+    response['Retry-After'] = str(math.ceil(wait))
+    return response
+
+
+class RateLimitMiddleware:
+    """
+    Applies the `RATE_LIMIT_ROUTES` policies to unsafe requests of the matching URL names.
+
+    Sync and async capable: under ASGI, requests that no policy applies to never leave
+    the event loop; only the bucket update of a limited request runs in a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Django adapts process_view to the handler's mode by inspecting it.
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        # In async mode this returns the coroutine of the next handler, awaited by the caller.
+        return self.get_response(request)
+
+    @staticmethod
+    def policy(request):
+        if request.method in SAFE_METHODS:
+            return None
+        return settings.RATE_LIMIT_ROUTES.get(request.resolver_match.url_name)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        policy = self.policy(request)
+        if policy is None:
+            return None
+        wait = hit(policy, client_ident(request))
+        return rate_limited_response(wait) if wait else None
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        policy = self.policy(request)
+        if policy is None:
+            return None
+        wait = await sync_to_async(hit)(policy, client_ident(request))
+        return rate_limited_response(wait) if wait else None
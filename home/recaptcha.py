@@ -0,0 +1,295 @@
+"""
+recaptcha.py
+
+Client for Google's reCAPTCHA siteverify API, used by the contact API and the async
+contact view.
+
+- A single keep-alive `requests.Session` is shared by all verifications, so repeated
+  submissions reuse pooled TLS connections.
+- Every call has strict connect and read timeouts.
+- A circuit breaker stops calling the API after repeated failures; while it is open,
+  verification fails open or closed depending on `RECAPTCHA_FAIL_OPEN`.
+- Tokens that verified successfully are cached briefly, so a retried submission
+  does not trigger a second round-trip.
+
+`AsyncRecaptchaClient` does the same on a non-blocking httpx client, one per event loop.
+All clients share one circuit breaker and the token cache, so failures seen by the
+sync and the async paths count together.
+
+The endpoint comes from `RECAPTCHA_VERIFY_URL`, so tests can point the client at a
+local stub server. The shared client is rebuilt whenever a RECAPTCHA_* setting changes.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+import weakref
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .instrumentation import timed
+
+
+class RecaptchaUnavailable(Exception):
+    """Raised when the verification API cannot be reached and the policy is fail-closed."""
+
+
+class CircuitBreaker:
+    """
+    Minimal circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls are
+    refused for `reset_timeout` seconds; then a single trial call is let through,
+    which closes the circuit again on success.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Returns whether a call may be attempted now."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Half-open: let one trial call through and re-arm the timer.
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class RecaptchaClient:
+    """
+    Verifies reCAPTCHA response tokens against the siteverify API.
+    """
+
+    def __init__(self, secret_key, verify_url, connect_timeout, read_timeout, fail_open=False,
+                 token_cache_ttl=120, failure_threshold=5, reset_timeout=30, breaker=None):
+        self.secret_key = secret_key
+        self.verify_url = verify_url
+        self.timeout = (connect_timeout, read_timeout)
+        self.fail_open = fail_open
+        self.token_cache_ttl = token_cache_ttl
+        self.breaker = breaker or CircuitBreaker(failure_threshold, reset_timeout)
+        self.session = self.create_session()
+
+    def create_session(self):
+        # Imported here, on the first verification, rather than at worker start.
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=10))
+        session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=10))
+        return session
+
+    @staticmethod
+    def cache_key(token):
+        return 'recaptcha:verified:' + hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def payload(self, token, remote_ip):
+        data = {'secret': self.secret_key, 'response': token}
+        if remote_ip:
+            data['remoteip'] = remote_ip
+        return data
+
+    def verify(self, token, remote_ip=None):
+        """
+        Verifies a response token.
+
+        Args:
+            token (str): The reCAPTCHA response token sent by the client.
+            remote_ip (str | None): The visitor's IP address.
+
+        Returns:
+            bool: Whether the token is valid.
+
+        Raises:
+            RecaptchaUnavailable: If the API cannot be reached and the policy is fail-closed.
+        """
+        import requests
+
+        if not token:
+            return False
+        if cache.get(self.cache_key(token)):
+            return True
+
+        if not self.breaker.allow():
+            return self._unavailable('circuit open')
+
+        try:
+            with timed('http'):
+                response = self.session.post(self.verify_url, data=self.payload(token, remote_ip), timeout=self.timeout)
+            response.raise_for_status()
+            result = response.json()
+        except (requests.RequestException, ValueError) as e:
+            self.breaker.record_failure()
+            return self._unavailable(str(e))
+
+        self.breaker.record_success()
+        success = bool(result.get('success'))
+        if success:
+            cache.set(self.cache_key(token), True, self.token_cache_ttl)
+        return success
+
+    def _unavailable(self, reason):
+        if self.fail_open:
+            return True
+        raise RecaptchaUnavailable(reason)
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncRecaptchaClient(RecaptchaClient):
+    """
+    Variant of `RecaptchaClient` for async views, on a non-blocking httpx client:
+    a pending verification holds no worker thread, only the event loop's socket.
+    """
+
+    def create_session(self):
+        import httpx
+
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout[1], connect=self.timeout[0]),
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+        )
+
+    async def averify(self, token, remote_ip=None):
+        """
+        Verifies a response token, see `RecaptchaClient.verify()`.
+        """
+        import httpx
+
+        if not token:
+            return False
+        if await cache.aget(self.cache_key(token)):
+            return True
+
+        if not self.breaker.allow():
+            return self._unavailable('circuit open')
+
+        try:
+            with timed('http'):
+                response = await self.session.post(self.verify_url, data=self.payload(token, remote_ip))
+            response.raise_for_status()
+            result = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            self.breaker.record_failure()
+            return self._unavailable(str(e))
+
+        self.breaker.record_success()
+        success = bool(result.get('success'))
+        if success:
+            await cache.aset(self.cache_key(token), True, self.token_cache_ttl)
+        return success
+
+    def close(self):
+        # The connections belong to the event loop that opened them; see `aclose()`.
+        pass
+
+    async def aclose(self):
+        await self.session.aclose()
+
+
+_client = None
+_breaker = None
+_client_lock = threading.Lock()
+# Event loop -> async client: an httpx client only works on the loop it was used on.
+# Async views are only served under ASGI (see portfolio/wsgi.py), where the loop lives
+# as long as the worker.
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def client_settings():
+    return {
+        'secret_key': settings.RECAPTCHA_SECRET_KEY,
+        'verify_url': settings.RECAPTCHA_VERIFY_URL,
+        'connect_timeout': settings.RECAPTCHA_CONNECT_TIMEOUT,
+        'read_timeout': settings.RECAPTCHA_READ_TIMEOUT,
+        'fail_open': settings.RECAPTCHA_FAIL_OPEN,
+        'token_cache_ttl': settings.RECAPTCHA_TOKEN_CACHE_TTL,
+        'failure_threshold': settings.RECAPTCHA_BREAKER_THRESHOLD,
+        'reset_timeout': settings.RECAPTCHA_BREAKER_RESET_TIMEOUT,
+    }
+
+
+def get_breaker():
+    """
+    Returns the circuit breaker shared by the sync and async clients.
+
+    Returns:
+        CircuitBreaker: The shared breaker.
+    """
+    global _breaker
+    if _breaker is None:
+        with _client_lock:
+            if _breaker is None:
+                _breaker = CircuitBreaker(settings.RECAPTCHA_BREAKER_THRESHOLD,
+                                          settings.RECAPTCHA_BREAKER_RESET_TIMEOUT)
+    return _breaker
+
+
+def get_recaptcha_client():
+    """
+    Returns the shared client, built from settings on first use.
+
+    Returns:
+        RecaptchaClient: The shared client.
+    """
+    global _client
+    if _client is None:
+        breaker = get_breaker()
+        with _client_lock:
+            if _client is None:
+                _client = RecaptchaClient(**client_settings(), breaker=breaker)
+    return _client
+
+
+def get_async_recaptcha_client():
+    """
+    Returns the async client of the running event loop, built from settings on first use.
+
+    Returns:
+        AsyncRecaptchaClient: The client.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncRecaptchaClient(**client_settings(), breaker=get_breaker())
+    return client
+
+
+@receiver(setting_changed)
+def reset_recaptcha_client(setting=None, **kwargs):
+    """
+    Drops the shared client so the next verification picks up new settings
+    (e.g. a test overriding `RECAPTCHA_VERIFY_URL`).
+    """
+    global _client, _breaker
+    if setting is None or setting.startswith('RECAPTCHA_'):
+        with _client_lock:
+            if _client is not None:
+                _client.close()
+            _client = None
+            _breaker = None
+            _async_clients.clear()
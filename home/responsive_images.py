@@ -0,0 +1,138 @@
+"""
+responsive_images.py
+
+Build step producing resized variants of the site's static images.
+
+Every image under `static/images` is resized with Pillow to each width in
+`RESPONSIVE_IMAGE_WIDTHS` (never upscaled) and encoded in each format of
+`RESPONSIVE_IMAGE_FORMATS` that this Pillow build can write. The variants are written
+to `RESPONSIVE_IMAGES_DIR` (inside `static/`, so collectstatic and WhiteNoise fingerprint
+and serve them like any other static file), together with a manifest describing them.
+The `responsive_image` template tag reads that manifest to emit `srcset`, `sizes` and
+intrinsic dimensions.
+
+Run it with `manage.py build_responsive_images`; `manage.py collectstatic` runs it first.
+"""
+
+import json
+import os
+
+from django.conf import settings
+from PIL import Image, ImageOps
+
+try:
+    # Registers an AVIF encoder on Pillow builds without native AVIF support.
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+# Output format name -> (Pillow format, MIME type, save options)
+FORMATS = {
+    'avif': ('AVIF', 'image/avif', {}),
+    'webp': ('WEBP', 'image/webp', {'method': 6}),
+}
+
+MANIFEST_NAME = 'manifest.json'
+
+_manifest_cache = {}
+
+
+def available_formats(formats):
+    """
+    Filters out the formats this Pillow build cannot encode.
+
+    Args:
+        formats (list[str]): Requested formats, e.g. ['avif', 'webp'].
+
+    Returns:
+        list[str]: The supported formats, in the requested order.
+    """
+    Image.init()
+    return [name for name in formats if name in FORMATS and FORMATS[name][0] in Image.SAVE]
+
+
+def variant_name(source_path, width, name):
+    """Returns the static path of a variant, e.g. `images/code-960w.webp`."""
+    stem = os.path.splitext(source_path)[0]
+    return f'{stem}-{width}w.{name}'
+
+
+def build_responsive_images(source_root, output_root, widths, formats, quality=75, force=False):
+    """
+    Builds the variants of every image under `source_root/images` and writes the manifest.
+
+    Variants newer than their source are kept unless `force` is set.
+
+    Args:
+        source_root (str): Static directory holding the `images` folder.
+        output_root (str): Directory receiving the variants and the manifest.
+        widths (list[int]): Target widths in pixels.
+        formats (list[str]): Target formats (see `FORMATS`).
+        quality (int): Encoder quality.
+        force (bool): Rebuild variants that are up to date.
+
+    Returns:
+        dict: The manifest, keyed by the source image's static path.
+    """
+    formats = available_formats(formats)
+    prefix = os.path.relpath(output_root, source_root).replace(os.sep, '/')
+    manifest = {}
+
+    for dirpath, _, filenames in os.walk(os.path.join(source_root, 'images')):
+        for filename in sorted(filenames):
+            if not filename.lower().endswith(SOURCE_EXTENSIONS):
+                continue
+            source = os.path.join(dirpath, filename)
+            source_path = os.path.relpath(source, source_root).replace(os.sep, '/')
+            source_mtime = os.path.getmtime(source)
+
+            with Image.open(source) as original:
+                image = ImageOps.exif_transpose(original)
+                if image.mode not in ('RGB', 'RGBA'):
+                    image = image.convert('RGBA' if image.has_transparency_data else 'RGB')
+                image_width, image_height = image.size
+                target_widths = sorted({w for w in widths if w < image_width} | {image_width})
+
+                sources = {}
+                for name in formats:
+                    pillow_format, mime_type, options = FORMATS[name]
+                    entries = []
+                    for width in target_widths:
+                        path = variant_name(source_path, width, name)
+                        target = os.path.join(output_root, path)
+                        if force or not os.path.exists(target) or os.path.getmtime(target) < source_mtime:
+                            height = max(1, round(image_height * width / image_width))
+                            resized = image if width == image_width else image.resize((width, height), Image.LANCZOS)
+                            os.makedirs(os.path.dirname(target), exist_ok=True)
+                            resized.save(target, pillow_format, quality=quality, **options)
+                        entries.append([f'{prefix}/{path}', width])
+                    sources[mime_type] = entries
+
+            manifest[source_path] = {'width': image_width, 'height': image_height, 'sources': sources}
+
+    os.makedirs(output_root, exist_ok=True)
+    with open(os.path.join(output_root, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def load_manifest():
+    """
+    Returns the manifest written by the last build, re-reading it when the file changes.
+
+    Returns:
+        dict: The manifest, or an empty dict if the build has not run.
+    """
+    path = os.path.join(settings.RESPONSIVE_IMAGES_DIR, MANIFEST_NAME)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    cached = _manifest_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path) as f:
+            cached = (mtime, json.load(f))
+        _manifest_cache[path] = cached
+    return cached[1]
@@ -0,0 +1,289 @@
+"""
+resume_io.py
+
+Bulk import and export of a profile's resume content as a JSON document.
+
+Document format (version 1):
+
+    {
+        "version": 1,
+        "profile": {"username": "jdoe", "first_name": "Jane", "title": "...", "biography": "<p>...</p>", ...},
+        "skills": [{"name": "Python", "rating": 5, ...}, ...],
+        "projects": [{"name": "Site", "body": "<p>...</p>", "images": [{"name": "...", "url": "..."}]}, ...],
+        "courses": [...], "links": [...], "educations": [...], "experiences": [...], "leaderships": [...]
+    }
+
+Items hold the editable, non-relational fields of their model. Files are referenced by
+their storage name, so the files themselves are not copied. The rendered `_html` fields,
+timestamps and the resume password are not part of the document.
+
+An import runs in one transaction. Every section is inserted with `bulk_create`, and the
+profile links are inserted directly into both M2M through tables. `save()` and the
+m2m_changed handlers therefore do not run, so the snapshot and site owner refreshes are
+scheduled here. An export is generated item by item from chunked queries, so its memory
+use does not grow with the size of the dataset.
+"""
+
+import json
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models import Prefetch
+from django.utils.text import slugify
+
+from portfolio.context_processors import invalidate_site_owner
+from .models import (
+    Leadership, Portfolio, Skill, Education, Course, MyContact,
+    ProjectImage, Profile, Experience
+)
+from .sanitize import render_html_fields
+from .snapshots import schedule_snapshot_rebuild
+
+DOCUMENT_VERSION = 1
+
+# Document section -> model. Each key is also the name of the `Profile` M2M field
+# and, prefixed with `all_`, of the model's reverse `profiles` relation.
+SECTIONS = {
+    'skills': Skill,
+    'courses': Course,
+    'projects': Portfolio,
+    'links': MyContact,
+    'educations': Education,
+    'experiences': Experience,
+    'leaderships': Leadership,
+}
+USER_FIELDS = ('first_name', 'last_name', 'email')
+# Never exported: a password hash has no business in a portable document.
+EXCLUDED_FIELDS = {Profile: {'resume_password'}}
+
+
+def document_fields(model):
+    """Returns the fields of a model that are part of the document."""
+    excluded = EXCLUDED_FIELDS.get(model, set())
+    return [
+        field for field in model._meta.concrete_fields
+        if field.editable and not field.primary_key and not field.is_relation and field.name not in excluded
+    ]
+
+
+def link_profiles(profiles, objects, profile_field, batch_size):
+    """
+    Links every profile to every object through both M2M relations,
+    `Model.profiles` and `Profile.<profile_field>`, with bulk inserts.
+    """
+    model = type(objects[0])
+    object_fk = f'{model._meta.model_name}_id'
+    for through in (model.profiles.through, getattr(Profile, profile_field).through):
+        through.objects.bulk_create(
+            [through(profile_id=profile.pk, **{object_fk: obj.pk}) for profile in profiles for obj in objects],
+            batch_size=batch_size,
+        )
+
+
+# ------------------ Export ------------------ #
+
+def dump_object(obj, fields):
+    """Returns the document item of an object."""
+    item = {}
+    for field in fields:
+        value = field.value_from_object(obj)
+        if isinstance(field, models.FileField):
+            value = value.name or None
+        item[field.name] = value
+    return item
+
+
+def _dumps(value):
+    return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def iter_resume_document(profile, chunk_size=500):
+    """
+    Generates the JSON document of a profile piece by piece.
+
+    Args:
+        profile (Profile): The exported profile, loaded with `select_related('user')`.
+        chunk_size (int): Rows fetched per query.
+
+    Yields:
+        str: Consecutive pieces of the document.
+    """
+    profile_item = {'username': profile.user.username, **{name: getattr(profile.user, name) for name in USER_FIELDS}}
+    profile_item.update(dump_object(profile, document_fields(Profile)))
+    yield '{"version": %d, "profile": %s' % (DOCUMENT_VERSION, _dumps(profile_item))
+
+    image_fields = document_fields(ProjectImage)
+    for key, model in SECTIONS.items():
+        fields = document_fields(model)
+        queryset = model.objects.filter(profiles=profile).only(*(field.name for field in fields)).order_by('pk')
+        if model is Portfolio:
+            queryset = queryset.prefetch_related(Prefetch('images', queryset=ProjectImage.objects.order_by('pk')))
+
+        yield ', %s: [' % _dumps(key)
+        for index, obj in enumerate(queryset.iterator(chunk_size=chunk_size)):
+            item = dump_object(obj, fields)
+            if model is Portfolio:
+                item['images'] = [dump_object(image, image_fields) for image in obj.images.all()]
+            yield (', ' if index else '') + _dumps(item)
+        yield ']'
+    yield '}\n'
+
+
+# ------------------ Import ------------------ #
+
+def load_object(model, item, label):
+    """
+    Builds an unsaved instance from a document item.
+
+    Args:
+        model (type): The model of the item.
+        item (dict): The document item.
+        label (str): Position of the item in the document for error messages, e.g. 'skills[3]'.
+
+    Raises:
+        ValueError: If the item has fields the model does not accept or a value of the wrong type.
+    """
+    fields = {field.name: field for field in document_fields(model)}
+    unknown = set(item) - set(fields)
+    if unknown:
+        raise ValueError(f"{label}: Unknown {model.__name__} fields: {', '.join(sorted(unknown))}")
+    values = {}
+    for name, value in item.items():
+        field = fields[name]
+        try:
+            values[name] = value if value is None or isinstance(field, models.FileField) else field.to_python(value)
+        except ValidationError as error:
+            raise ValueError(f"{label}.{name}: {' '.join(error.messages)}")
+    return model(**values)
+
+
+def validate_object(obj, label, exclude=()):
+    """
+    Checks the field values of an instance about to be bulk inserted, so an invalid or
+    missing (NULL) value fails the import before it reaches the database. Relations are not
+    checked: they are set by the import itself.
+
+    Args:
+        obj (Model): The unsaved instance.
+        label (str): Position of the item in the document for error messages.
+        exclude (Iterable[str]): Further fields not to check.
+
+    Raises:
+        ValueError: If a value is invalid.
+    """
+    exclude = set(exclude) | {field.name for field in obj._meta.concrete_fields if field.is_relation}
+    try:
+        obj.clean_fields(exclude=exclude)
+    except ValidationError as error:
+        # `blank=False` is a form rule; documents may leave such text empty, as the API can.
+        errors = {
+            name: [message for invalid in field_errors if invalid.code != 'blank' for message in invalid.messages]
+            for name, field_errors in error.error_dict.items()
+        }
+        errors = {name: messages for name, messages in errors.items() if messages}
+        if errors:
+            raise ValueError(f"{label}: " + '; '.join(
+                f"{name}: {' '.join(messages)}" for name, messages in sorted(errors.items())
+            ))
+
+
+def load_image(item, label):
+    """Builds an unsaved, checked `ProjectImage` of a project item, see `load_object()`."""
+    image = load_object(ProjectImage, item, label)
+    # Done by ProjectImage.save() for single objects.
+    if image.url:
+        image.is_image = False
+    validate_object(image, label)
+    return image
+
+
+def _import_profile(item):
+    item = dict(item)
+    username = item.pop('username', None)
+    if not username:
+        raise ValueError("The profile needs a username")
+    user_values = {name: item.pop(name) for name in USER_FIELDS if name in item}
+    user, created = User.objects.get_or_create(username=username, defaults=user_values)
+    if not created and user_values:
+        for name, value in user_values.items():
+            setattr(user, name, value)
+        # save() so the User signals bump its version and refresh the cached site owner.
+        user.save(update_fields=list(user_values))
+
+    profile = Profile.objects.get(user=user)
+    loaded = load_object(Profile, item, 'profile')
+    validate_object(loaded, 'profile', exclude={field.name for field in Profile._meta.fields} - set(item))
+    for name in item:
+        setattr(profile, name, getattr(loaded, name))
+    rendered = render_html_fields(profile, update_fields=item.keys())
+    # update() rather than save(): save() would hash the stored password hash again.
+    updates = {name: getattr(profile, name) for name in set(item) | rendered}
+    if updates:
+        Profile.objects.filter(pk=profile.pk).update(**updates)
+    return profile
+
+
+@transaction.atomic
+def import_resume_document(document, replace=False, batch_size=500):
+    """
+    Imports a resume document in a single transaction.
+
+    Args:
+        document (dict): The parsed document.
+        replace (bool): Unlink the profile's current content first; otherwise the
+            imported content is added to it.
+        batch_size (int): Rows per INSERT statement.
+
+    Returns:
+        dict: Number of objects created per section.
+
+    Raises:
+        ValueError: If the document is invalid. Nothing is imported then.
+    """
+    if document.get('version') != DOCUMENT_VERSION:
+        raise ValueError(f"Unsupported document version {document.get('version')!r}; expected {DOCUMENT_VERSION}")
+    unknown = set(document) - {'version', 'profile'} - set(SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown document sections: {', '.join(sorted(unknown))}")
+
+    profile = _import_profile(document.get('profile') or {})
+    if replace:
+        for key in SECTIONS:
+            getattr(profile, key).clear()
+            getattr(profile, f'all_{key}').clear()
+
+    counts = {}
+    for key, model in SECTIONS.items():
+        items = [dict(item) for item in document.get(key) or ()]
+        images = [item.pop('images', None) or [] for item in items] if model is Portfolio else []
+        objects = [load_object(model, item, f'{key}[{index}]') for index, item in enumerate(items)]
+        for index, obj in enumerate(objects):
+            # Done by save() for single objects.
+            render_html_fields(obj)
+            if model is Portfolio and not obj.slug:
+                obj.slug = slugify(obj.name or '')
+            validate_object(obj, f'{key}[{index}]')
+
+        images = [
+            [load_image(image_item, f'{key}[{index}].images[{image_index}]')
+             for image_index, image_item in enumerate(project_items)]
+            for index, project_items in enumerate(images)
+        ]
+
+        objects = model.objects.bulk_create(objects, batch_size=batch_size)
+        project_images = []
+        for project, project_items in zip(objects, images):
+            for image in project_items:
+                image.portfolio = project
+                project_images.append(image)
+        ProjectImage.objects.bulk_create(project_images, batch_size=batch_size)
+
+        if objects:
+            link_profiles([profile], objects, key, batch_size)
+        counts[key] = len(objects)
+
+    schedule_snapshot_rebuild([profile.pk])
+    transaction.on_commit(invalidate_site_owner)
+    return counts
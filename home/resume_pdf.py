@@ -0,0 +1,226 @@
+"""
+resume_pdf.py
+
+Generates the resume PDF from live Profile data.
+
+The resume template is rendered from the profile's precomputed snapshot and the resulting
+HTML is hashed; the hash names the cached PDF on local disk. A cache hit therefore costs a
+template render and a file send, while a miss is rendered by WeasyPrint in a bounded
+process pool so the CPU-heavy work never runs inside a web worker. The web worker waits
+for it at most `RESUME_PDF_RENDER_WAIT` (a fraction of a second), then answers 202.
+
+WeasyPrint only loads assets from `RESUME_PDF_ALLOWED_URLS` and the static files
+(see pdf_worker.py).
+"""
+
+import hashlib
+import multiprocessing
+import os
+import threading
+from urllib.parse import urljoin
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from .pdf_worker import render_pdf
+
+
+class ResumeRenderBusy(Exception):
+    """Raised when every rendering slot is taken."""
+
+
+class ResumeRenderPending(Exception):
+    """Raised when a render is still running once the wait period is over."""
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_in_flight = {}
+_render_slots = threading.BoundedSemaphore(settings.RESUME_PDF_MAX_PENDING)
+
+
+def get_executor():
+    """
+    Returns the process pool used for rendering, creating it on first use.
+
+    Pool processes are spawned rather than forked so they never inherit the
+    web worker's threads or database connections.
+
+    Returns:
+        ProcessPoolExecutor: The rendering pool.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.RESUME_PDF_MAX_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _executor
+
+
+def _reset_executor():
+    """Discards a broken pool so the next render starts a fresh one."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def resume_pdf_context(snapshot):
+    """
+    Builds the template context of the resume from a profile snapshot.
+
+    Args:
+        snapshot (dict): The serialized profile (see `snapshots.py`).
+
+    Returns:
+        dict: Context for `resume_pdf_template.html`.
+    """
+    return {
+        'profile': snapshot,
+        'links': [link for link in snapshot.get('all_links', []) if link.get('is_active')],
+        'educations': [edu for edu in snapshot.get('all_educations', []) if edu.get('is_active')],
+        'experiences': snapshot.get('all_experiences', []),
+        'projects': [project for project in snapshot.get('all_projects', []) if project.get('for_resume')],
+        'skills': [skill for skill in snapshot.get('all_skills', []) if skill.get('is_active')],
+    }
+
+
+def render_resume_html(snapshot):
+    """
+    Renders the resume template for a profile snapshot.
+
+    Args:
+        snapshot (dict): The serialized profile.
+
+    Returns:
+        str: The resume HTML.
+    """
+    return render_to_string('resume_pdf_template.html', resume_pdf_context(snapshot))
+
+
+def resume_pdf_path(html, base_url):
+    """
+    Returns the cache path of the PDF rendered from the given document.
+
+    Args:
+        html (str): The resume HTML.
+        base_url (str): Base URL the document is rendered against.
+
+    Returns:
+        str: Absolute path of the cached PDF.
+    """
+    digest = hashlib.sha256(f'{base_url}\0{html}'.encode('utf-8')).hexdigest()
+    return os.path.join(settings.RESUME_PDF_CACHE_DIR, f'{digest}.pdf')
+
+
+def prune_resume_pdf_cache(keep):
+    """
+    Removes all but the most recently rendered PDFs from the cache directory.
+
+    Args:
+        keep (int): Number of PDFs to keep.
+    """
+    directory = settings.RESUME_PDF_CACHE_DIR
+    entries = [
+        os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.pdf')
+    ]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[keep:]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def render_options(base_url):
+    """
+    Returns the asset restrictions of a render, see `pdf_worker.resolve_asset_url()`.
+
+    Args:
+        base_url (str): Base URL the document is rendered against.
+
+    Returns:
+        dict: Keyword arguments of `render_pdf()`.
+    """
+    return {
+        'allowed_urls': tuple(settings.RESUME_PDF_ALLOWED_URLS),
+        'static_url': urljoin(base_url, settings.STATIC_URL),
+        'static_root': str(settings.STATIC_ROOT),
+    }
+
+
+def _submit_render(html, base_url, path):
+    """
+    Queues a render in the pool, reusing a render of the same document already in flight.
+
+    Returns:
+        Future: Resolves to the path of the rendered PDF.
+    """
+    with _executor_lock:
+        future = _in_flight.get(path)
+    if future is not None:
+        return future
+
+    if not _render_slots.acquire(blocking=False):
+        raise ResumeRenderBusy()
+
+    options = render_options(base_url)
+    try:
+        os.makedirs(settings.RESUME_PDF_CACHE_DIR, exist_ok=True)
+        prune_resume_pdf_cache(settings.RESUME_PDF_CACHE_MAX_FILES - 1)
+        try:
+            future = get_executor().submit(render_pdf, html, base_url, path, **options)
+        except BrokenProcessPool:
+            _reset_executor()
+            future = get_executor().submit(render_pdf, html, base_url, path, **options)
+    except BaseException:
+        _render_slots.release()
+        raise
+
+    with _executor_lock:
+        _in_flight[path] = future
+
+    def _done(done_future):
+        with _executor_lock:
+            _in_flight.pop(path, None)
+        _render_slots.release()
+        if isinstance(done_future.exception(), BrokenProcessPool):
+            _reset_executor()
+
+    future.add_done_callback(_done)
+    return future
+
+
+def get_resume_pdf(snapshot, base_url, wait=None):
+    """
+    Returns the path of the resume PDF for a profile snapshot, rendering it if needed.
+
+    Args:
+        snapshot (dict): The serialized profile.
+        base_url (str): Base URL used to resolve relative links and assets.
+        wait (float | None): Seconds to wait for a cold render; defaults to
+            `settings.RESUME_PDF_RENDER_WAIT`.
+
+    Returns:
+        str: Path of the cached PDF.
+
+    Raises:
+        ResumeRenderBusy: If the pool has no free rendering slot.
+        ResumeRenderPending: If the render did not finish within `wait` seconds.
+            It keeps running and later requests are served from the cache.
+    """
+    html = render_resume_html(snapshot)
+    path = resume_pdf_path(html, base_url)
+    if os.path.exists(path):
+        return path
+
+    future = _submit_render(html, base_url, path)
+    try:
+        return future.result(timeout=settings.RESUME_PDF_RENDER_WAIT if wait is None else wait)
+    except FutureTimeoutError:
+        raise ResumeRenderPending()
@@ -0,0 +1,151 @@
+"""
+search.py
+
+Full-text search over the portfolio content, backed by django-watson.
+
+Registered models are indexed in watson's `SearchEntry` table. The index is updated
+incrementally by watson's own post_save/pre_delete handlers, and can be rebuilt in bulk
+with `manage.py buildwatson`. Bulk writes, which send no signals, re-index their objects
+with `index_objects()`. Searches hit the index (PostgreSQL full-text search in
+production) and are ranked, instead of scanning HTML bodies with `icontains`.
+"""
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections
+from django.urls import reverse
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+from watson import search as watson
+from watson.models import SearchEntry, get_str_pk, has_int_pk
+
+from .models import Portfolio, Experience, Leadership, Course, Skill
+
+
+class PortfolioSearchAdapter(watson.SearchAdapter):
+    """Indexes projects; links to the project page."""
+
+    def get_description(self, obj):
+        return obj.description or ""
+
+
+class ResumePageSearchAdapter(watson.SearchAdapter):
+    """
+    Base adapter for records that have no page of their own and are
+    listed on one of the resume pages instead.
+    """
+    url_name = 'resume'
+
+    def get_url(self, obj):
+        return reverse(self.url_name)
+
+
+class ExperienceSearchAdapter(ResumePageSearchAdapter):
+    url_name = 'resume'
+
+    def get_description(self, obj):
+        return obj.company_name
+
+
+class LeadershipSearchAdapter(ResumePageSearchAdapter):
+    url_name = 'leadership'
+
+    def get_description(self, obj):
+        return Truncator(strip_tags(obj.description)).words(30)
+
+
+class CourseSearchAdapter(ResumePageSearchAdapter):
+    url_name = 'courses'
+
+    def get_description(self, obj):
+        return obj.description or ""
+
+
+class SkillSearchAdapter(ResumePageSearchAdapter):
+    url_name = 'skills'
+
+    def get_description(self, obj):
+        return obj.category or ""
+
+
+def register_search_models():
+    """
+    Registers the searchable models with watson. Called from `HomeConfig.ready()`.
+    """
+    watson.register(
+        Portfolio.objects.filter(is_active=True), PortfolioSearchAdapter,
+        fields=('name', 'description', 'body', 'technology'),
+    )
+    watson.register(
+        Experience, ExperienceSearchAdapter,
+        fields=('job_title', 'company_name', 'location', 'description'),
+    )
+    watson.register(
+        Leadership.objects.filter(is_active=True), LeadershipSearchAdapter,
+        fields=('name', 'description'),
+    )
+    watson.register(
+        Course.objects.filter(is_active=True), CourseSearchAdapter,
+        fields=('name', 'description'),
+    )
+    watson.register(
+        Skill.objects.filter(is_active=True), SkillSearchAdapter,
+        fields=('name', 'category'),
+    )
+
+
+def search_content(query, limit=20):
+    """
+    Runs a ranked search over the registered models.
+
+    Args:
+        query (str): The search text.
+        limit (int): Maximum number of results.
+
+    Returns:
+        list[dict]: Results with their type, title, description, URL and rank.
+    """
+    entries = watson.search(query).select_related('content_type')[:limit]
+    return [
+        {
+            'type': entry.content_type.model,
+            'title': entry.title,
+            'description': entry.description,
+            'url': entry.url,
+            'rank': entry.watson_rank,
+        }
+        for entry in entries
+    ]
+
+
+def index_objects(model, instances):
+    """
+    Replaces the search entries of objects written in bulk, in two queries instead of
+    watson's two per object.
+
+    Args:
+        model (type): A registered model.
+        instances (list): Saved instances of `model`.
+    """
+    engine = watson.default_search_engine
+    adapter = engine.get_adapter(model)
+    content_type = ContentType.objects.get_for_model(model)
+    connection = connections[SearchEntry.objects.db]
+    object_ids = {instance.pk: get_str_pk(instance, connection) for instance in instances}
+
+    SearchEntry.objects.filter(
+        engine_slug=engine._engine_slug, content_type=content_type, object_id__in=object_ids.values(),
+    ).delete()
+    SearchEntry.objects.bulk_create([
+        SearchEntry(
+            engine_slug=engine._engine_slug,
+            content_type=content_type,
+            object_id=object_ids[instance.pk],
+            object_id_int=int(instance.pk) if has_int_pk(model) else None,
+            title=adapter.get_title(instance),
+            description=adapter.get_description(instance),
+            content=adapter.get_content(instance),
+            url=adapter.get_url(instance),
+            meta_encoded=adapter.serialize_meta(instance),
+        )
+        for instance in instances
+    ])
@@ -6,16 +6,38 @@ Defines all Django REST Framework (DRF) serializers for the portfolio and resume
 Serializers convert Django models to JSON (and vice versa) for API communication.
 This includes models for user profiles, education, skills, experience, projects, media, and contact data.
 """
-import requests
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from django.core.mail import send_mail, BadHeaderError
-from django.shortcuts import HttpResponse
+from django.db import transaction
 from portfolio import settings
 from .models import (
     Leadership, Profile, Contact, Feedback, ProjectImage, Video,
     Education, Skill, Portfolio, Course, MyContact, Experience
 )
+from .media import resolve_media_url, DEFAULT_IMAGE_URL, DEFAULT_AVATAR_URL
+from .outbox import enqueue_email
+from .recaptcha import get_recaptcha_client, RecaptchaUnavailable
+
+
+class MediaURLField(serializers.Field):
+    """
+    Read-only URL of a media file at a size preset, resolved through the
+    cached media URL resolver (see media.py).
+    """
+
+    def __init__(self, preset=None, default_url=DEFAULT_IMAGE_URL, **kwargs):
+        """
+        Args:
+            preset (str | None): A key of `media.PRESETS`, or None for the original.
+            default_url (str): URL used when there is no file.
+        """
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+        self.preset = preset
+        self.default_url = default_url
+
+    def to_representation(self, value):
+        return resolve_media_url(value, self.preset, self.default_url)
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -49,6 +71,8 @@ class SkillSerializer(serializers.ModelSerializer):
     """
     Serializer for Skill model.
     """
+    image_thumb_url = MediaURLField(source='image', preset='thumb')
+
     class Meta:
         model = Skill
         fields = '__all__'
@@ -67,6 +91,8 @@ class ProjectImageSerializer(serializers.ModelSerializer):
     """
     Serializer for ProjectImage model.
     """
+    image_card_url = MediaURLField(source='image', preset='card')
+
     class Meta:
         model = ProjectImage
         fields = '__all__'
@@ -75,7 +101,7 @@ class ProjectImageSerializer(serializers.ModelSerializer):
 class ContactSerializer(serializers.ModelSerializer):
     """
     Serializer for Contact form submissions.
-    Sends email on successful submission and validates reCAPTCHA.
+    Queues an email on successful submission and validates reCAPTCHA.
     """
     captcha = serializers.CharField(write_only=True, required=False)
 
@@ -85,32 +111,32 @@ class ContactSerializer(serializers.ModelSerializer):
 
     def validate_captcha(self, value):
         """
-        Validate reCAPTCHA token with Google's verification API.
+        Validate reCAPTCHA token with Google's verification API (see recaptcha.py).
         """
-        secret_key = settings.RECAPTCHA_SECRET_KEY  # Store in your Django settings
-        response = requests.post(
-            'https://www.google.com/recaptcha/api/siteverify',
-            data={
-                'secret': secret_key,
-                'response': value
-            }
-        )
-        result = response.json()
+        request = self.context.get('request')
+        remote_ip = request.META.get('REMOTE_ADDR') if request else None
+
+        try:
+            success = get_recaptcha_client().verify(value, remote_ip=remote_ip)
+        except RecaptchaUnavailable:
+            raise serializers.ValidationError('reCAPTCHA verification is unavailable. Please try again later.')
 
-        if not result.get('success'):
+        if not success:
             raise serializers.ValidationError('Invalid reCAPTCHA. Please try again.')
 
         return value
 
     def create(self, validated_data):
         validated_data.pop('captcha', None)  # Remove captcha before saving
-        instance = super().create(validated_data)
-        self.send_email(instance)
+        with transaction.atomic():
+            instance = super().create(validated_data)
+            self.queue_email(instance)
         return instance
 
-    def send_email(self, instance):
+    def queue_email(self, instance):
         """
-        Send an email notification to the site administrator when a new contact is submitted.
+        Queue an email notification to the site administrator when a new contact is submitted.
+        The outbox delivers it outside the request (see outbox.py).
         """
         subject = instance.subject or "New Contact Form Submission"
         formatted_message = instance.message.replace('\n', '<br>')
@@ -156,16 +182,13 @@ class ContactSerializer(serializers.ModelSerializer):
         </html>
         """
 
-        try:
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email=str(settings.DEFAULT_FROM_EMAIL),
-                recipient_list=[str(settings.ADMIN_EMAIL)],
-                fail_silently=False,
-            )
-        except BadHeaderError:
-            return HttpResponse('Invalid header found')
+        return enqueue_email(
+            subject,
+            message,
+            recipient_list=[str(settings.ADMIN_EMAIL)],
+            from_email=str(settings.DEFAULT_FROM_EMAIL),
+            contact=instance,
+        )
 
 
 
@@ -174,6 +197,8 @@ class FeedbackSerializer(serializers.ModelSerializer):
     """
     Serializer for Feedback model.
     """
+    thumbnail_thumb_url = MediaURLField(source='thumbnail', preset='thumb')
+
     class Meta:
         model = Feedback
         fields = '__all__'
@@ -192,6 +217,8 @@ class MyContactSerializer(serializers.ModelSerializer):
     """
     Serializer for custom contact information (e.g., links, social).
     """
+    icon_thumb_url = MediaURLField(source='icon', preset='thumb')
+
     class Meta:
         model = MyContact
         fields = '__all__'
@@ -202,11 +229,12 @@ class PortfolioSerializer(serializers.ModelSerializer):
     Serializer for Portfolio (project) model.
     """
     images  = ProjectImageSerializer(many=True, read_only=True)
+    image_card_url = MediaURLField(source='image', preset='card')
 
     class Meta:
         model = Portfolio
         fields = ["id", "name", "image", "slug", "description", "body", "date", "year", "url", "technology", "is_side_project",
-                   "for_resume", "images",
+                   "for_resume", "images", "image_card_url", "body_html",
         ]
 
 
@@ -222,7 +250,11 @@ class LeadershipSerializer(serializers.ModelSerializer):
 class ProfileSerializer(serializers.ModelSerializer):
     """
     Serializer for Profile model, including nested related fields and media URLs.
-    Adds a debug block in the representation output.
+
+    Supports sparse fieldsets: `fields` limits the output to the named fields and
+    `expand` names the nested collections to include. Nested serializers that are not
+    requested are never built, and `get_query_plan()` only loads the relations that
+    are. A debug block with relation counts is added when `debug` is set.
     """
     user = UserSerializer(read_only=True)
     all_experiences = ExperienceSerializer(many=True, read_only=True)
@@ -235,32 +267,105 @@ class ProfileSerializer(serializers.ModelSerializer):
     get_avatar_url = serializers.ReadOnlyField()
     get_resume_url = serializers.ReadOnlyField()
     get_work_samples_url = serializers.ReadOnlyField()
+    avatar_url = MediaURLField(source='avatar', preset='avatar', default_url=DEFAULT_AVATAR_URL)
+
+    # Nested collections and the relations they read. The nested serializers
+    # output their own `profiles` M2M, so it is prefetched along with them.
+    EXPANDABLE_FIELDS = {
+        'all_experiences': ('all_experiences', 'all_experiences__profiles'),
+        'all_courses': ('all_courses', 'all_courses__profiles'),
+        'all_leaderships': ('all_leaderships', 'all_leaderships__profiles'),
+        'all_skills': ('all_skills', 'all_skills__profiles'),
+        'all_projects': ('all_projects', 'all_projects__images'),
+        'all_links': ('all_links', 'all_links__profiles'),
+        'all_educations': ('all_educations', 'all_educations__profiles'),
+    }
 
     class Meta:
         model = Profile
         fields = [
             'user', 'title', 'biography', 'welcome_summary', 'intro_summary', 'resume_summary', 'contact_summary',
             'academic_projects_summary', 'side_projects_summary', 'avatar', 'resume', 'work',
+            'biography_html', 'welcome_summary_html', 'intro_summary_html', 'resume_summary_html',
+            'contact_summary_html', 'academic_projects_summary_html', 'side_projects_summary_html',
             'all_experiences', 'all_courses', 'all_leaderships', 'all_skills',
             'all_projects', 'all_links', 'all_educations',
-            'get_avatar_url', 'get_resume_url', 'get_work_samples_url'
+            'get_avatar_url', 'get_resume_url', 'get_work_samples_url', 'avatar_url'
+        ]
+
+    def __init__(self, *args, fields=None, expand=None, debug=False, **kwargs):
+        """
+        Args:
+            fields (list[str] | None): Fields to include; all non-nested fields if None.
+            expand (list[str] | None): Nested collections to include.
+                When both `fields` and `expand` are None, every field is included.
+            debug (bool): Whether to add the debug block.
+        """
+        super().__init__(*args, **kwargs)
+        self.debug = debug
+        self.requested_fields = self.requested_field_names(fields, expand)
+        if self.requested_fields is not None:
+            # Drop unrequested declared fields before DRF deep-copies (builds) them.
+            self._declared_fields = {
+                name: field for name, field in type(self)._declared_fields.items()
+                if name in self.requested_fields
+            }
+
+    @classmethod
+    def requested_field_names(cls, fields=None, expand=None):
+        """
+        Resolves the `fields` and `expand` options into the set of fields to serialize.
+
+        Returns:
+            set | None: Field names, or None when every field is requested.
+        """
+        if fields is None and expand is None:
+            return None
+        if fields is None:
+            names = {name for name in cls.Meta.fields if name not in cls.EXPANDABLE_FIELDS}
+        else:
+            names = set(fields)
+        return names | set(expand or ())
+
+    @classmethod
+    def get_query_plan(cls, fields=None, expand=None):
+        """
+        Returns the relations to load for the given `fields` and `expand` options.
+
+        Returns:
+            tuple: (select_related fields, prefetch_related lookups)
+        """
+        names = cls.requested_field_names(fields, expand)
+        select_related = ['user'] if names is None or 'user' in names else []
+        prefetch_related = [
+            lookup for name, lookups in cls.EXPANDABLE_FIELDS.items()
+            if names is None or name in names
+            for lookup in lookups
         ]
+        return select_related, prefetch_related
+
+    def get_field_names(self, declared_fields, info):
+        names = super().get_field_names(declared_fields, info)
+        if self.requested_fields is None:
+            return names
+        return [name for name in names if name in self.requested_fields]
 
     def to_representation(self, instance):
         """
-        Add custom debug information to the serialized output.
+        Add custom debug information to the serialized output when requested.
 
         Args:
             instance (Profile): The Profile instance being serialized.
 
         Returns:
-            dict: The final representation with debug info appended.
+            dict: The final representation, with debug info appended in debug mode.
         """
         rep = super().to_representation(instance)
-        rep['_debug'] = {
-            'skills_count': instance.skills.count(),
-            'courses_count': instance.courses.count(),
-            'educations_count': instance.educations.count(),
-            'id': instance.id
-        }
+        if self.debug:
+            rep['_debug'] = {
+                'skills_count': instance.skills.count(),
+                'courses_count': instance.courses.count(),
+                'educations_count': instance.educations.count(),
+                'id': instance.id
+            }
         return rep
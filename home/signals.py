@@ -3,13 +3,28 @@ signals.py
 
 Defines signal handlers for the 'home' app.
 
-Automatically creates a Profile instance whenever a new User is created.
+- Automatically creates a Profile instance whenever a new User is created.
+- Keeps each profile's precomputed snapshot in sync with the content it embeds.
+- Invalidates the process-cached site owner used by the template context.
+- Bumps the per-model version counters keying the page cache.
 """
 
-from django.db.models.signals import post_save
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
 from django.contrib.auth.models import User
 from django.dispatch import receiver
-from home.models import Profile
+from home.models import (
+    Profile, Education, Skill, Course, Leadership, MyContact, Portfolio,
+    Experience, ProjectImage, Feedback, Contact, Video
+)
+from home.snapshots import schedule_snapshot_rebuild
+from home.versioning import bump_model_version
+from portfolio.context_processors import invalidate_site_owner
+
+
+# Models linked to Profile in both directions: `Model.profiles` feeds the nested
+# `all_*` collections and `Profile.<field>` feeds the debug counts.
+PROFILE_CONTENT_MODELS = (Education, Skill, Course, Leadership, MyContact, Portfolio, Experience)
 
 
 @receiver(post_save, sender=User)
@@ -25,3 +40,147 @@ def create_profile(sender, instance, created, **kwargs):
     """
     if created:
         Profile.objects.create(user=instance)
+
+
+# ------------------ Profile Snapshots ------------------ #
+
+def affected_profile_ids(instance):
+    """
+    Collects the ids of the profiles whose snapshot embeds the given instance.
+
+    Args:
+        instance (Model): A Profile, User, ProjectImage or profile content instance.
+
+    Returns:
+        set: Primary keys of the affected profiles.
+    """
+    if isinstance(instance, Profile):
+        return {instance.pk}
+    if isinstance(instance, User):
+        return set(Profile.objects.filter(user=instance).values_list('pk', flat=True))
+    if isinstance(instance, ProjectImage):
+        return affected_profile_ids(instance.portfolio)
+    if instance.pk is None:
+        return set()
+    return (
+        set(instance.profiles.values_list('pk', flat=True))
+        | set(instance.profile_set.values_list('pk', flat=True))
+    )
+
+
+def bulk_affected_profile_ids(model, pks):
+    """
+    Collects, in one query, the ids of the profiles whose snapshot embeds any of
+    the given ProjectImage or profile content objects. Used after bulk writes,
+    which send no signals.
+
+    Args:
+        model (type): ProjectImage or one of PROFILE_CONTENT_MODELS.
+        pks (Iterable[int]): Primary keys of the written objects.
+
+    Returns:
+        set: Primary keys of the affected profiles.
+    """
+    suffix = '__in'
+    if model is ProjectImage:
+        model, suffix = Portfolio, '__images__in'
+    lookups = [model.profiles.field.related_query_name()] + [
+        field.name for field in Profile._meta.many_to_many if field.related_model is model
+    ]
+    pks = list(pks)
+    # One subquery per relation: OR-ing the joins instead multiplies their rows.
+    condition = Q()
+    for lookup in lookups:
+        condition |= Q(pk__in=Profile.objects.filter(**{lookup + suffix: pks}).values('pk'))
+    return set(Profile.objects.filter(condition).values_list('pk', flat=True))
+
+
+def refresh_snapshot_on_save(sender, instance, raw=False, **kwargs):
+    """
+    Rebuilds the snapshots that embed a saved instance.
+    """
+    if not raw:
+        schedule_snapshot_rebuild(affected_profile_ids(instance))
+
+
+def refresh_snapshot_on_delete(sender, instance, **kwargs):
+    """
+    Rebuilds the snapshots that embed a deleted instance.
+
+    Runs on `pre_delete` because the M2M rows pointing at the instance are gone
+    once it is deleted; the rebuild itself only happens after the commit.
+    """
+    if not isinstance(instance, Profile):
+        schedule_snapshot_rebuild(affected_profile_ids(instance))
+
+
+def refresh_snapshot_on_m2m_change(sender, instance, action, model, pk_set, **kwargs):
+    """
+    Rebuilds the snapshots affected by adding or removing profile relations.
+    """
+    if action == 'pre_clear':
+        # The cleared ids are not passed to 'post_clear', so remember them now.
+        instance._snapshot_profile_ids = affected_profile_ids(instance)
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if isinstance(instance, Profile):
+        profile_ids = {instance.pk}
+    else:
+        profile_ids = set(pk_set or ()) | getattr(instance, '_snapshot_profile_ids', set())
+    schedule_snapshot_rebuild(profile_ids)
+
+
+for model in (User, Profile, ProjectImage) + PROFILE_CONTENT_MODELS:
+    post_save.connect(refresh_snapshot_on_save, sender=model, dispatch_uid=f'snapshot_save_{model.__name__}')
+    pre_delete.connect(refresh_snapshot_on_delete, sender=model, dispatch_uid=f'snapshot_delete_{model.__name__}')
+
+PROFILE_THROUGH_MODELS = (
+    Profile.courses.through, Profile.leaderships.through, Profile.skills.through,
+    Profile.projects.through, Profile.links.through, Profile.educations.through,
+    Profile.experiences.through,
+) + tuple(model.profiles.through for model in PROFILE_CONTENT_MODELS)
+
+for through in PROFILE_THROUGH_MODELS:
+    m2m_changed.connect(refresh_snapshot_on_m2m_change, sender=through,
+                        dispatch_uid=f'snapshot_m2m_{through.__name__}')
+
+
+# ------------------ Site Owner Cache ------------------ #
+
+for model in (User, Profile):
+    post_save.connect(invalidate_site_owner, sender=model, dispatch_uid=f'site_owner_save_{model.__name__}')
+    post_delete.connect(invalidate_site_owner, sender=model, dispatch_uid=f'site_owner_delete_{model.__name__}')
+
+
+# ------------------ Model Versions ------------------ #
+
+# Models read by the cached template views (see page_cache.py) and the API
+# endpoints supporting conditional requests (see mixins.py).
+VERSIONED_MODELS = (User, Profile, ProjectImage, Feedback, Contact, Video) + PROFILE_CONTENT_MODELS
+
+
+def bump_version_on_change(sender, **kwargs):
+    """
+    Bumps the version of a saved or deleted model.
+    """
+    bump_model_version(sender)
+
+
+def bump_version_on_m2m_change(sender, instance, action, model, **kwargs):
+    """
+    Bumps the versions of both sides of a changed M2M relation.
+    """
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_model_version(type(instance))
+        bump_model_version(model)
+
+
+for model in VERSIONED_MODELS:
+    post_save.connect(bump_version_on_change, sender=model, dispatch_uid=f'version_save_{model.__name__}')
+    post_delete.connect(bump_version_on_change, sender=model, dispatch_uid=f'version_delete_{model.__name__}')
+
+for through in PROFILE_THROUGH_MODELS:
+    m2m_changed.connect(bump_version_on_m2m_change, sender=through,
+                        dispatch_uid=f'version_m2m_{through.__name__}')
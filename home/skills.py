@@ -0,0 +1,107 @@
+"""
+skills.py
+
+Groups the active skills into the sections of the skills page.
+
+The grouping is built in a single pass over one ordered query, with each skill's star
+row and icon URL computed up front, so the template renders every section once with
+no filtering or branching. The result is cached under the current Skill version
+(see versioning.py), so it is rebuilt only after a skill changes.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from .media import resolve_media_url, DEFAULT_IMAGE_URL
+from .models import Skill
+from .versioning import get_model_versions
+
+MAX_RATING = 5
+
+# Section key -> membership test. A skill may belong to several sections
+# (e.g. a soft skill in the "Others" category).
+SKILL_GROUPS = (
+    ('coding', lambda skill: skill.is_hard_skill and skill.category == 'Coding'),
+    ('web_development', lambda skill: skill.is_hard_skill and skill.category == 'Web development'),
+    ('database', lambda skill: skill.is_hard_skill and skill.category == 'Database'),
+    ('tools', lambda skill: skill.category == 'Tools'),
+    ('soft', lambda skill: skill.is_soft_skill),
+    ('others', lambda skill: skill.category == 'Others'),
+)
+
+
+def star_row(rating):
+    """
+    Returns the star row of a rating, e.g. [True, True, False, False, False] for 2.
+    Missing or out-of-range ratings show a single star.
+    """
+    filled = rating if rating is not None and 2 <= rating <= MAX_RATING else 1
+    return [True] * filled + [False] * (MAX_RATING - filled)
+
+
+def group_skills(skills):
+    """
+    Distributes skills over the page sections in a single pass.
+
+    Args:
+        skills (iterable[Skill]): Active skills, in display order.
+
+    Returns:
+        dict: Section key -> list of dicts with the skill's name, icon URL and star row.
+    """
+    groups = {key: [] for key, _ in SKILL_GROUPS}
+    for skill in skills:
+        entry = None
+        for key, belongs in SKILL_GROUPS:
+            if belongs(skill):
+                if entry is None:
+                    entry = {
+                        'name': skill.name,
+                        'icon_url': resolve_media_url(skill.image, 'thumb', DEFAULT_IMAGE_URL),
+                        'stars': star_row(skill.rating),
+                    }
+                groups[key].append(entry)
+    return groups
+
+
+def active_skills():
+    """Returns the query of the skills shown on the page, in display order."""
+    return Skill.objects.filter(is_active=True).only(
+        'name', 'image', 'rating', 'is_hard_skill', 'is_soft_skill', 'category'
+    ).order_by('pk')
+
+
+def skill_groups_key():
+    version = get_model_versions([Skill])[Skill._meta.label_lower]
+    return f'skill-groups:{version}'
+
+
+def get_skill_groups():
+    """
+    Returns the cached grouping of the active skills, building it when missing.
+
+    Returns:
+        dict: See `group_skills()`.
+    """
+    key = skill_groups_key()
+    groups = cache.get(key)
+    if groups is None:
+        groups = group_skills(active_skills())
+        cache.set(key, groups, settings.PAGE_CACHE_TIMEOUT)
+    return groups
+
+
+async def aget_skill_groups():
+    """
+    Async version of `get_skill_groups()`, loading the skills with async iteration.
+
+    Returns:
+        dict: See `group_skills()`.
+    """
+    key = await sync_to_async(skill_groups_key)()
+    groups = await cache.aget(key)
+    if groups is None:
+        groups = group_skills([skill async for skill in active_skills()])
+        await cache.aset(key, groups, settings.PAGE_CACHE_TIMEOUT)
+    return groups
@@ -0,0 +1,99 @@
+"""
+snapshots.py
+
+Maintains the precomputed JSON representation of each Profile.
+
+`ProfileSerializer` walks seven nested collections (projects with their images included).
+Because profile content changes rarely while the profiles API is polled constantly, the
+serialized output is stored in `ProfileSnapshot` and rebuilt by signal handlers whenever
+related content changes.
+
+Every rebuild bumps the `ProfileSnapshot` version (see versioning.py) in the transaction
+that writes it, so validators and caches keyed on versions follow the stored snapshots
+rather than the content they are built from, which commits earlier.
+"""
+
+from django.db import transaction
+
+from .models import Profile, ProfileSnapshot
+from .serializers import ProfileSerializer
+from .versioning import bump_model_version
+
+
+def snapshot_queryset():
+    """
+    Returns a Profile queryset that loads everything `ProfileSerializer` touches
+    in a fixed number of queries.
+
+    Returns:
+        QuerySet: Profile queryset with related models preloaded.
+    """
+    select_related, prefetch_related = ProfileSerializer.get_query_plan()
+    return Profile.objects.select_related(*select_related).prefetch_related(*prefetch_related)
+
+
+def build_profile_snapshot(profile):
+    """
+    Serializes a profile into the document stored in its snapshot.
+
+    Args:
+        profile (Profile): Profile instance, ideally loaded through `snapshot_queryset()`.
+
+    Returns:
+        dict: The serialized profile.
+    """
+    return ProfileSerializer(profile).data
+
+
+def rebuild_profile_snapshots(profile_ids=None):
+    """
+    Rebuilds and stores the snapshots of the given profiles, and bumps the
+    `ProfileSnapshot` version along with them.
+
+    Args:
+        profile_ids (Iterable[int] | None): Profiles to rebuild, or None for all of them.
+    """
+    profiles = snapshot_queryset()
+    if profile_ids is not None:
+        profiles = profiles.filter(pk__in=list(profile_ids))
+
+    with transaction.atomic():
+        rebuilt = False
+        for profile in profiles:
+            ProfileSnapshot.objects.update_or_create(
+                profile=profile,
+                defaults={'data': build_profile_snapshot(profile)},
+            )
+            rebuilt = True
+        if rebuilt:
+            bump_model_version(ProfileSnapshot)
+
+
+def schedule_snapshot_rebuild(profile_ids):
+    """
+    Rebuilds the given snapshots once the current transaction commits,
+    so the snapshot always reflects committed data.
+
+    Args:
+        profile_ids (Iterable[int]): Profiles whose snapshot is stale.
+    """
+    profile_ids = {pk for pk in profile_ids if pk is not None}
+    if profile_ids:
+        transaction.on_commit(lambda: rebuild_profile_snapshots(profile_ids))
+
+
+def get_profile_snapshot(profile):
+    """
+    Returns the stored snapshot of a profile, building it on first access.
+
+    Args:
+        profile (Profile): Profile loaded with `select_related('snapshot')`.
+
+    Returns:
+        dict: The serialized profile.
+    """
+    try:
+        return profile.snapshot.data
+    except ProfileSnapshot.DoesNotExist:
+        rebuild_profile_snapshots([profile.pk])
+        return ProfileSnapshot.objects.get(profile=profile).data
@@ -0,0 +1,117 @@
+"""
+startup.py
+
+Measures the cold start of a web worker, for `manage.py startup_profile`, which also
+checks it against `STARTUP_IMPORT_BUDGET_MS`. The test suite only checks that the
+`LAZY_MODULES` stay unloaded, as timings vary by machine.
+
+A fresh interpreter does what a gunicorn worker does before serving its first request:
+`django.setup()`, building the WSGI application and loading the URLconf. It runs with
+`-X importtime`, whose report is parsed into the time spent importing each module.
+
+Heavy dependencies are imported on first use instead (see `LAZY_MODULES`): WeasyPrint
+only in the PDF rendering processes, the Cloudinary SDK on the first media URL or
+upload. `requests` is not on the list: Django REST framework imports it at start
+whenever it is installed.
+"""
+
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+
+# Modules a worker must not import before its first request.
+LAZY_MODULES = ('weasyprint', 'cloudinary', 'cloudinary_storage.storage')
+
+BOOT_CODE = """
+import sys
+import django
+django.setup()
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+get_wsgi_application()
+get_resolver().url_patterns
+sys.stdout.write('\\n'.join(sorted(sys.modules)))
+"""
+
+
+def parse_importtime(report):
+    """
+    Parses the stderr of `python -X importtime`.
+
+    Args:
+        report (str): The report.
+
+    Returns:
+        list: (module, self microseconds, cumulative microseconds) per imported module.
+    """
+    imports = []
+    for line in report.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        own, cumulative, module = line[len('import time:'):].split('|', 2)
+        if own.strip().isdigit():
+            imports.append((module.strip(), int(own), int(cumulative)))
+    return imports
+
+
+def profile_startup():
+    """
+    Boots a worker in a new interpreter and times it.
+
+    Returns:
+        dict: 'wall_ms' of the whole boot, 'import_ms' spent importing, 'imports' as
+        returned by `parse_importtime()` and the set of loaded 'modules'.
+
+    Raises:
+        RuntimeError: If the boot fails.
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', BOOT_CODE],
+        cwd=settings.BASE_DIR, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - start
+    if result.returncode:
+        raise RuntimeError(f"Worker boot failed:\n{result.stderr[-2000:]}")
+    imports = parse_importtime(result.stderr)
+    return {
+        'wall_ms': wall * 1000,
+        'import_ms': sum(own for _, own, _ in imports) / 1000,
+        'imports': imports,
+        'modules': set(result.stdout.split()),
+    }
+
+
+def profile_startups(runs):
+    """
+    Boots `runs` workers and keeps the median run, by import time.
+
+    Returns:
+        dict: The median profile, see `profile_startup()`.
+    """
+    profiles = sorted((profile_startup() for _ in range(runs)), key=lambda profile: profile['import_ms'])
+    return profiles[(len(profiles) - 1) // 2]
+
+
+def package_times(imports):
+    """
+    Sums the self import time per top-level package.
+
+    Returns:
+        list: (package, microseconds), slowest first.
+    """
+    totals = {}
+    for module, own, _ in imports:
+        package = module.split('.')[0]
+        totals[package] = totals.get(package, 0) + own
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def eager_lazy_modules(modules):
+    """Returns the `LAZY_MODULES` that were imported at start."""
+    return sorted(
+        name for name in LAZY_MODULES
+        if name in modules or any(module.startswith(name + '.') for module in modules)
+    )
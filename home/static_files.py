@@ -0,0 +1,43 @@
+"""
+static_files.py
+
+WhiteNoise middleware that can run in an async middleware chain.
+
+WhiteNoise's own middleware is sync-only, so under ASGI Django would run it, and every
+middleware and view after it, through a thread. This subclass keeps requests for
+non-static paths on the event loop; only serving a static file, which opens it, runs in
+a thread.
+"""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    `WhiteNoiseMiddleware`, sync and async capable.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, **kwargs):
+        super().__init__(get_response, **kwargs)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            # Only with WHITENOISE_AUTOREFRESH (development): looks the file up on disk.
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,161 @@
+"""
+synthetic.py
+
+Generates large synthetic datasets for query-budget tests and load testing.
+
+All rows, including the M2M through-table rows linking every profile to all of the
+generated content, are inserted with `bulk_create`. `save()` and signal handlers therefore
+do not run: the rendered HTML fields are filled here, but call `rebuild_profile_snapshots()`
+and `manage.py buildwatson` afterwards if needed.
+"""
+
+import datetime
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+from django.utils.text import slugify
+
+from .models import (
+    Leadership, Portfolio, Skill, Education, Course, MyContact,
+    ProjectImage, Contact, Profile, Experience
+)
+from .resume_io import link_profiles
+from .sanitize import render_html_fields
+
+SKILL_CATEGORIES = ["Coding", "Web development", "Database", "Tools", "Others"]
+
+DEFAULT_SIZES = {
+    'profiles': 3,
+    'projects': 2000,
+    'images_per_project': 2,
+    'skills': 2000,
+    'contacts': 2000,
+    'courses': 200,
+    'educations': 20,
+    'experiences': 50,
+    'leaderships': 50,
+    'links': 20,
+}
+
+
+def _rendered(objects):
+    """Fills the rendered HTML fields that `save()` would have filled."""
+    for obj in objects:
+        render_html_fields(obj)
+    return objects
+
+
+def seed_synthetic_data(batch_size=500, **sizes):
+    """
+    Inserts a synthetic dataset.
+
+    Args:
+        batch_size (int): Rows per INSERT statement.
+        **sizes: Overrides of `DEFAULT_SIZES` (e.g. `projects=100`).
+
+    Returns:
+        dict: Number of rows created per model.
+    """
+    sizes = {**DEFAULT_SIZES, **sizes}
+    now = timezone.now()
+    offset = User.objects.count()
+
+    users = User.objects.bulk_create(
+        [User(username=f'synthetic{offset + i}', first_name='Synthetic', last_name=f'User {i}')
+         for i in range(sizes['profiles'])],
+        batch_size=batch_size,
+    )
+    profiles = Profile.objects.bulk_create(
+        _rendered([Profile(user=user, title=f'Software Engineer {i}') for i, user in enumerate(users)]),
+        batch_size=batch_size,
+    )
+
+    projects = Portfolio.objects.bulk_create(
+        _rendered([Portfolio(
+            name=f'Project {i}',
+            slug=slugify(f'project {offset} {i}'),
+            description=f'Synthetic project number {i}',
+            body=f'<p>Project <strong>{i}</strong> body with <em>rich</em> text.</p>',
+            date=now - datetime.timedelta(days=i),
+            year=str(2000 + i % 25),
+            is_side_project=bool(i % 2),
+            for_resume=i % 3 == 0,
+            technology=['Python', 'Django', f'Library {i % 10}'],
+        ) for i in range(sizes['projects'])]),
+        batch_size=batch_size,
+    )
+    ProjectImage.objects.bulk_create(
+        [ProjectImage(portfolio=project, name=f'{project.name} image {j}', url=f'https://example.com/{project.pk}/{j}.png',
+                      is_image=False)
+         for project in projects for j in range(sizes['images_per_project'])],
+        batch_size=batch_size,
+    )
+    skills = Skill.objects.bulk_create(
+        [Skill(
+            name=f'Skill {i}',
+            rating=i % 5 + 1,
+            is_hard_skill=i % 4 != 0,
+            is_soft_skill=i % 4 == 0,
+            is_key_skill=i % 10 == 0,
+            category=SKILL_CATEGORIES[i % len(SKILL_CATEGORIES)],
+         ) for i in range(sizes['skills'])],
+        batch_size=batch_size,
+    )
+    courses = Course.objects.bulk_create(
+        [Course(name=f'Course {i}', date=now, description=f'Course description {i}')
+         for i in range(sizes['courses'])],
+        batch_size=batch_size,
+    )
+    educations = Education.objects.bulk_create(
+        [Education(degree=f'Degree {i}', school=f'School {i}', major='Computer Science', year=str(2000 + i))
+         for i in range(sizes['educations'])],
+        batch_size=batch_size,
+    )
+    experiences = Experience.objects.bulk_create(
+        _rendered([Experience(job_title=f'Engineer {i}', company_name=f'Company {i}',
+                              start_date=(now - datetime.timedelta(days=30 * i)).date(),
+                              description=f'<ul><li>Shipped feature {i}</li></ul>')
+                   for i in range(sizes['experiences'])]),
+        batch_size=batch_size,
+    )
+    leaderships = Leadership.objects.bulk_create(
+        _rendered([Leadership(name=f'Club {i}', date=now, description=f'<p>Led initiative {i}</p>')
+                   for i in range(sizes['leaderships'])]),
+        batch_size=batch_size,
+    )
+    links = MyContact.objects.bulk_create(
+        [MyContact(name=f'link{i}', category='Link', url=f'https://example.com/{i}')
+         for i in range(sizes['links'])],
+        batch_size=batch_size,
+    )
+    Contact.objects.bulk_create(
+        [Contact(name=f'Visitor {i}', email=f'visitor{i}@example.com', subject=f'Hello {i}',
+                 message=f'Synthetic message {i}')
+         for i in range(sizes['contacts'])],
+        batch_size=batch_size,
+    )
+
+    for objects, profile_field in (
+        (projects, 'projects'),
+        (skills, 'skills'),
+        (courses, 'courses'),
+        (educations, 'educations'),
+        (experiences, 'experiences'),
+        (leaderships, 'leaderships'),
+        (links, 'links'),
+    ):
+        if objects and profiles:
+            link_profiles(profiles, objects, profile_field, batch_size)
+
+    return {
+        'profiles': len(profiles),
+        'projects': len(projects),
+        'images': len(projects) * sizes['images_per_project'],
+        'skills': len(skills),
+        'contacts': sizes['contacts'],
+        'courses': len(courses),
+        'educations': len(educations),
+        'experiences': len(experiences),
+        'leaderships': len(leaderships),
+        'links': len(links),
+    }
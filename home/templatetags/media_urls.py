@@ -0,0 +1,32 @@
+"""
+media_urls.py
+
+Template tag resolving media URLs at a size preset (see home/media.py).
+
+Usage:
+    {% load media_urls %}
+    <img src="{% media_url skill.image 'thumb' %}">
+    <img src="{% media_url me.profile.avatar 'avatar' default=me.profile.get_avatar_url %}">
+"""
+
+from django import template
+
+from home.media import resolve_media_url, DEFAULT_IMAGE_URL
+
+register = template.Library()
+
+
+@register.simple_tag
+def media_url(file, preset=None, default=DEFAULT_IMAGE_URL):
+    """
+    Returns the URL of a media file at a size preset.
+
+    Args:
+        file (FieldFile | None): The file, e.g. `skill.image`.
+        preset (str | None): A key of `home.media.PRESETS`, or None for the original.
+        default (str): URL used when there is no file.
+
+    Returns:
+        str: The file URL.
+    """
+    return resolve_media_url(file, preset, default)
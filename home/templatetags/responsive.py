@@ -0,0 +1,76 @@
+"""
+responsive.py
+
+Template tags for the responsive static image variants (see home/responsive_images.py).
+
+Usage:
+    {% load responsive %}
+    {% responsive_image 'images/code.png' alt="Code" class="d-block w-100" %}
+    <div style="background-image: {% responsive_background 'images/bg_image.jpg' %}">
+"""
+
+from django import template
+from django.forms.utils import flatatt
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from home.responsive_images import load_manifest
+
+register = template.Library()
+
+
+def srcset(entries):
+    return ', '.join(f'{static(path)} {width}w' for path, width in entries)
+
+
+@register.simple_tag
+def responsive_image(path, alt='', sizes='100vw', loading='lazy', **attrs):
+    """
+    Renders a `<picture>` offering every built variant of a static image.
+
+    The `<img>` keeps the original as fallback and carries its intrinsic width and height,
+    so the browser reserves the space before the image loads. Falls back to a plain `<img>`
+    when the image has no variants (e.g. the build has not run).
+
+    Args:
+        path (str): Static path of the original image.
+        alt (str): Alternative text.
+        sizes (str): The `sizes` attribute, i.e. the rendered width of the image.
+        loading (str): 'lazy', or 'eager' for images visible on first paint.
+        **attrs: Extra attributes for the `<img>` element (e.g. class, fetchpriority).
+
+    Returns:
+        str: The HTML.
+    """
+    img_attrs = {'src': static(path), 'alt': alt, 'loading': loading, 'decoding': 'async', **attrs}
+    entry = load_manifest().get(path)
+    if entry is None:
+        return format_html('<img{}>', flatatt(img_attrs))
+
+    img_attrs.update(width=entry['width'], height=entry['height'])
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((mime_type, srcset(entries), sizes) for mime_type, entries in entry['sources'].items()),
+    )
+    return format_html('<picture>{}<img{}></picture>', sources, flatatt(img_attrs))
+
+
+@register.simple_tag
+def responsive_background(path):
+    """
+    Renders a CSS `image-set()` value for a background image, listing the
+    full-width variants before the original.
+
+    Args:
+        path (str): Static path of the original image.
+
+    Returns:
+        str: The CSS value.
+    """
+    candidates = []
+    entry = load_manifest().get(path)
+    if entry is not None:
+        for mime_type, entries in entry['sources'].items():
+            candidates.append(f'url("{static(entries[-1][0])}") type("{mime_type}")')
+    candidates.append(f'url("{static(path)}")')
+    return format_html('image-set({})', ', '.join(candidates))
@@ -1,3 +1,1597 @@
-from django.test import TestCase
+"""
+tests.py
 
-# Create your tests here.
+Tests of the 'home' app.
+
+The query-budget tests load a large synthetic dataset (see synthetic.py) once and request
+every page and API endpoint while counting SQL queries. A route exceeding its budget,
+e.g. because a serializer or template started issuing one query per row, fails the suite
+instead of showing up as production latency.
+
+The other suites cover, one class each:
+- caching: the page cache, ETag/Last-Modified validation, the site owner cache and
+  the profile snapshots with their signal-driven rebuilds
+- content: HTML sanitizing, rendered `_html` fields, change tracking, search, skill
+  groups, media URLs and responsive images
+- writes: the resume import/export commands and the batch API endpoints
+- resume delivery: the generated PDF, download tokens and local file responses
+- outbound calls: the email outbox and the reCAPTCHA client, against a local stub server
+- operations: rate limiting, instrumentation, the load generator, worker startup and
+  the async views
+"""
+
+import io
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs
+
+import httpx
+from asgiref.sync import iscoroutinefunction
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.messages import constants as message_constants
+from django.core import mail
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DatabaseError, connection, transaction
+from django.db.models.fields.files import FieldFile
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import LiveServerTestCase, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path
+from django.utils import timezone
+from PIL import Image
+from watson import search as watson
+
+from portfolio.context_processors import invalidate_site_owner, project_context
+from .models import (
+    Leadership, Portfolio, Skill, Education, Course, MyContact, Feedback,
+    ProjectImage, Contact, Video, Profile, Experience, OutgoingEmail, ProfileSnapshot
+)
+from .file_delivery import file_response, get_cached_file
+from .instrumentation import collect_timings, InstrumentationMiddleware, registry as metrics_registry, timed
+from .loadtest import parse_mix, percentile, run_load
+from .outbox import claim_batch, drain_outbox, enqueue_email, retry_delay
+from .pdf_worker import resolve_asset_url
+from .media import clear_media_url_cache, resolve_media_url, DEFAULT_IMAGE_URL
+from .ratelimit import client_ident, hit, parse_policy, RateLimitMiddleware
+from .responsive_images import build_responsive_images
+from .resume_pdf import (
+    ResumeRenderBusy, ResumeRenderPending, get_resume_pdf, render_resume_html, resume_pdf_path
+)
+from .resume_io import SECTIONS, import_resume_document
+from .serializers import SkillSerializer
+from .recaptcha import (
+    AsyncRecaptchaClient, RecaptchaClient, RecaptchaUnavailable, get_async_recaptcha_client, get_recaptcha_client,
+    reset_recaptcha_client,
+)
+from .static_files import AsyncWhiteNoiseMiddleware
+from .views import AsyncContactView, AsyncResumeSkillsView, AsyncResumeView, ResumePDFView
+from .sanitize import sanitize_html
+from .search import index_objects, search_content
+from .signals import VERSIONED_MODELS
+from .skills import get_skill_groups, star_row
+from .snapshots import rebuild_profile_snapshots
+from .startup import eager_lazy_modules, parse_importtime, profile_startup
+from .synthetic import seed_synthetic_data
+from .throttles import FailedPasswordThrottle
+from .versioning import get_model_states, get_model_versions
+
+
+# The fingerprinting storage needs the manifest written by collectstatic.
+TEST_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class QueryBudgetTestCase(TestCase):
+    """
+    Base class loading the synthetic dataset and providing query-budget assertions.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sizes = seed_synthetic_data()
+        rebuild_profile_snapshots()
+        cls.profile = Profile.objects.order_by('pk').first()
+        cls.profile.set_resume_password('secret')
+        Profile.objects.filter(pk=cls.profile.pk).update(resume_password=cls.profile.resume_password)
+
+    def setUp(self):
+        cache.clear()
+        invalidate_site_owner()
+        # Warm the version registry like a running site, so budgets count page queries only.
+        get_model_states(VERSIONED_MODELS + (ProfileSnapshot,))
+
+    def assertMaxQueries(self, budget, method, path, data=None, status=200, **extra):
+        """
+        Requests a path and asserts its status code and that it ran at most `budget` queries.
+
+        Returns:
+            HttpResponse: The response.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(path, data, secure=True, **extra)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, status, f'{method.upper()} {path}')
+        self.assertLessEqual(
+            len(queries), budget,
+            f'{method.upper()} {path} ran {len(queries)} queries (budget {budget}):\n'
+            + '\n'.join(query['sql'] for query in queries.captured_queries)
+        )
+        return response
+
+
+class PageQueryBudgetTests(QueryBudgetTestCase):
+    """Budgets for the template views in home/urls.py."""
+
+    def test_home(self):
+        self.assertMaxQueries(1, 'get', '/')
+        self.assertMaxQueries(1, 'get', '/home/')
+
+    def test_about(self):
+        self.assertMaxQueries(2, 'get', '/about')
+
+    def test_contact_form(self):
+        self.assertMaxQueries(2, 'get', '/contact')
+
+    def test_resume_pages(self):
+        for path in ('/resume', '/education', '/skills', '/courses', '/resumeprojects', '/leadership'):
+            with self.subTest(path=path):
+                invalidate_site_owner()
+                self.assertMaxQueries(2, 'get', path)
+
+    def test_portfolio_pages(self):
+        self.assertMaxQueries(2, 'get', '/portfolio/')
+        self.assertMaxQueries(2, 'get', '/portfolio/?page=50')
+
+    def test_search(self):
+        # The first search warms the content type cache.
+        self.client.get('/api/search/', {'q': 'project'}, secure=True)
+        self.assertMaxQueries(1, 'get', '/search', {'q': 'project'})
+        self.assertMaxQueries(1, 'get', '/api/search/', {'q': 'project'})
+
+    def test_contact_submission(self):
+        data = {'name': 'Visitor', 'email': 'visitor@example.com', 'message': 'Hello', 'phone_0': '', 'phone_1': ''}
+        with mock.patch('django_recaptcha.fields.ReCaptchaField.validate'):
+            # Contact insert, its version bump and the outbox insert, wrapped in a savepoint.
+            self.assertMaxQueries(5, 'post', '/contact', {**data, 'g-recaptcha-response': 'token'}, status=302)
+        self.assertEqual(Contact.objects.count(), self.sizes['contacts'] + 1)
+
+    def test_download_resume(self):
+        self.assertMaxQueries(1, 'post', '/api/download-resume/', {'password': 'wrong'}, status=403)
+        self.assertMaxQueries(1, 'post', '/api/download-resume/', {'password': 'secret'}, status=404)
+
+
+class ApiQueryBudgetTests(QueryBudgetTestCase):
+    """Budgets for the router endpoints in portfolio/urls.py."""
+
+    # Endpoint, model, list budget, detail budget. Models exposing their
+    # `profiles` M2M field need a second query to prefetch it.
+    ENDPOINTS = [
+        ('educations', Education, 2, 2),
+        ('courses', Course, 2, 2),
+        ('profiles', Profile, 1, 1),
+        ('projects', Portfolio, 2, 2),
+        ('mycontact', MyContact, 2, 2),
+        ('skills', Skill, 2, 2),
+        ('leaderships', Leadership, 2, 2),
+        ('images', ProjectImage, 1, 1),
+        ('feedbacks', Feedback, 1, 1),
+        ('contacts', Contact, 1, 1),
+        ('videos', Video, 1, 1),
+        ('experiences', Experience, 2, 2),
+    ]
+
+    def test_api_root(self):
+        self.assertMaxQueries(0, 'get', '/api/')
+
+    def test_list_endpoints(self):
+        for endpoint, model, list_budget, detail_budget in self.ENDPOINTS:
+            with self.subTest(endpoint=endpoint):
+                self.assertMaxQueries(list_budget, 'get', f'/api/{endpoint}/')
+
+    def test_detail_endpoints(self):
+        for endpoint, model, list_budget, detail_budget in self.ENDPOINTS:
+            obj = model.objects.order_by('pk').first()
+            if obj is None:
+                continue
+            with self.subTest(endpoint=endpoint):
+                self.assertMaxQueries(detail_budget, 'get', f'/api/{endpoint}/{obj.pk}/')
+
+    def test_cursor_pagination_walks_every_row(self):
+        seen = set()
+        url = '/api/skills/?page_size=100'
+        while url:
+            data = self.assertMaxQueries(2, 'get', url).json()
+            self.assertLessEqual(len(data['results']), 100)
+            seen.update(skill['id'] for skill in data['results'])
+            url = data['next']
+        self.assertEqual(len(seen), self.sizes['skills'])
+
+    def test_profile_snapshot_matches_serializer(self):
+        response = self.assertMaxQueries(1, 'get', f'/api/profiles/{self.profile.pk}/')
+        data = response.json()
+        self.assertEqual(len(data['all_projects']), self.sizes['projects'])
+        self.assertEqual(len(data['all_projects'][0]['images']), 2)
+        self.assertNotIn('_debug', data)
+
+    def test_profile_sparse_fields(self):
+        path = f'/api/profiles/{self.profile.pk}/'
+        data = self.assertMaxQueries(1, 'get', path, {'fields': 'title,get_avatar_url'}).json()
+        self.assertEqual(set(data), {'title', 'get_avatar_url'})
+
+        data = self.assertMaxQueries(3, 'get', path, {'fields': 'title', 'expand': 'all_skills'}).json()
+        self.assertEqual(set(data), {'title', 'all_skills'})
+        self.assertEqual(len(data['all_skills']), self.sizes['skills'])
+
+        data = self.assertMaxQueries(2, 'get', path, {'expand': ''}).json()
+        self.assertIn('user', data)
+        self.assertNotIn('all_projects', data)
+
+        data = self.assertMaxQueries(4, 'get', path, {'fields': 'title', 'debug': 'true'}).json()
+        self.assertEqual(data['_debug']['skills_count'], self.sizes['skills'])
+
+        data = self.assertMaxQueries(3, 'get', '/api/profiles/', {'fields': 'title', 'expand': 'all_links'}).json()
+        self.assertEqual(len(data['results']), self.sizes['profiles'])
+        self.assertEqual(len(data['results'][0]['all_links']), self.sizes['links'])
+
+
+class PageCacheTests(QueryBudgetTestCase):
+    """Serving and invalidation of the full-page cache."""
+
+    def test_repeat_view_is_served_from_cache(self):
+        self.assertMaxQueries(2, 'get', '/resume')
+        response = self.assertMaxQueries(0, 'get', '/resume')
+        self.assertEqual(response['X-Page-Cache'], 'hit')
+
+    def test_change_invalidates_dependent_pages_only(self):
+        for path in ('/resume', '/skills'):
+            self.client.get(path, secure=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            Education.objects.create(degree='PhD', school='New School', major='Physics', year='2030')
+        response = self.assertMaxQueries(2, 'get', '/resume')
+        self.assertContains(response, 'New School')
+        self.assertMaxQueries(0, 'get', '/skills')
+
+    def test_m2m_change_invalidates_pages(self):
+        self.client.get('/', secure=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.skills.remove(Skill.objects.order_by('pk').first())
+        self.assertMaxQueries(1, 'get', '/')
+
+    def test_flash_messages_bypass_cache(self):
+        self.client.get('/about', secure=True)
+        with mock.patch('home.page_cache.get_messages', return_value=[message_constants.INFO]):
+            response = self.client.get('/about', secure=True)
+        self.assertNotIn('X-Page-Cache', response)
+
+    def test_authenticated_session_bypasses_cache(self):
+        self.client.get('/about', secure=True)
+        self.client.force_login(User.objects.order_by('pk').first())
+        response = self.client.get('/about', secure=True)
+        self.assertNotIn('X-Page-Cache', response)
+
+
+class ConditionalGetTests(QueryBudgetTestCase):
+    """ETag and Last-Modified validation of the API endpoints."""
+
+    def test_if_none_match_returns_304_without_queries(self):
+        response = self.client.get('/api/projects/', secure=True)
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        response = self.assertMaxQueries(
+            0, 'get', '/api/projects/', status=304, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertFalse(response.content)
+
+    def test_if_modified_since_returns_304(self):
+        response = self.client.get(f'/api/profiles/{self.profile.pk}/', secure=True)
+        self.assertMaxQueries(
+            0, 'get', f'/api/profiles/{self.profile.pk}/', status=304,
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+        )
+
+    def test_validators_change_with_data_and_query(self):
+        etag = self.client.get('/api/projects/', secure=True)['ETag']
+        self.assertNotEqual(self.client.get('/api/projects/?page_size=5', secure=True)['ETag'], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ProjectImage.objects.filter(portfolio__isnull=False).first().save()
+        response = self.client.get('/api/projects/', secure=True, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_related_model_change_invalidates_profiles(self):
+        etag = self.client.get('/api/profiles/', secure=True)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.order_by('pk').first().save()
+        response = self.client.get('/api/profiles/', secure=True, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_profiles_validators_follow_the_snapshot(self):
+        path = f'/api/profiles/{self.profile.pk}/'
+        skill = self.profile.all_skills.order_by('pk').first()
+        old_name = skill.name
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                skill.name = 'Renamed skill'
+                skill.save()
+        # Committed, but the snapshot is not rebuilt yet; another worker reads it.
+        cache.clear()
+        stale = self.client.get(path, secure=True)
+        self.assertIn(old_name, [item['name'] for item in stale.json()['all_skills']])
+
+        for callback in callbacks:
+            callback()
+        cache.clear()
+        response = self.client.get(path, secure=True, HTTP_IF_NONE_MATCH=stale['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Renamed skill', [item['name'] for item in response.json()['all_skills']])
+        self.assertNotEqual(response['ETag'], stale['ETag'])
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+@override_settings(OUTBOX_RETRY_BACKOFF=10, OUTBOX_MAX_BACKOFF=25, OUTBOX_MAX_ATTEMPTS=3, OUTBOX_CLAIM_TIMEOUT=300)
+class OutboxTests(TestCase):
+    """Contact emails queued in the outbox and delivered by `send_outbox`."""
+
+    def enqueue(self, subject='Hello'):
+        return enqueue_email(subject, 'Body', ['admin@example.com'], from_email='site@example.com')
+
+    def connection(self):
+        return mail.get_connection('django.core.mail.backends.locmem.EmailBackend')
+
+    def test_email_is_queued_with_the_contact(self):
+        data = {'name': 'Visitor', 'email': 'visitor@example.com', 'message': 'Hello', 'phone_0': '', 'phone_1': '',
+                'g-recaptcha-response': 'token'}
+        with mock.patch('django_recaptcha.fields.ReCaptchaField.validate'):
+            self.assertEqual(self.client.post('/contact', data, secure=True).status_code, 302)
+            email = OutgoingEmail.objects.get()
+            self.assertEqual(email.contact, Contact.objects.get())
+            self.assertEqual(email.status, OutgoingEmail.STATUS_PENDING)
+            self.assertEqual(mail.outbox, [])
+
+            # The contact is rolled back with its email.
+            with mock.patch('home.forms.enqueue_email', side_effect=DatabaseError), self.assertRaises(DatabaseError):
+                self.client.post('/contact', {**data, 'email': 'other@example.com'}, secure=True)
+        self.assertFalse(Contact.objects.filter(email='other@example.com').exists())
+
+        with self.assertRaises(DatabaseError), transaction.atomic():
+            self.enqueue()
+            raise DatabaseError
+        self.assertEqual(OutgoingEmail.objects.count(), 1)
+
+    def test_drain_delivers_over_one_connection(self):
+        for index in range(5):
+            self.enqueue(f'Message {index}')
+        connection = self.connection()
+        with mock.patch.object(connection, 'send_messages', wraps=connection.send_messages) as send, \
+                mock.patch.object(connection, 'close', wraps=connection.close) as close, \
+                mock.patch('django.core.mail.get_connection') as get_connection:
+            self.assertEqual(drain_outbox(batch_size=2, connection=connection), (5, 0))
+        self.assertEqual(send.call_count, 5)
+        close.assert_called_once()
+        get_connection.assert_not_called()
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(OutgoingEmail.objects.filter(status=OutgoingEmail.STATUS_SENT, attempts=1).count(), 5)
+        self.assertEqual(drain_outbox(connection=connection), (0, 0))
+
+    def test_failures_back_off_then_give_up(self):
+        self.assertEqual([retry_delay(attempts).total_seconds() for attempts in (1, 2, 3, 4)], [10, 20, 25, 25])
+
+        email = self.enqueue()
+        connection = self.connection()
+        now = timezone.now()
+        with mock.patch.object(connection, 'send_messages', side_effect=OSError('Connection refused')):
+            for attempt in (1, 2, 3):
+                with mock.patch('home.outbox.timezone.now', return_value=now):
+                    self.assertEqual(drain_outbox(connection=connection), (0, 1))
+                email.refresh_from_db()
+                self.assertEqual(email.attempts, attempt)
+                self.assertEqual(email.last_error, 'Connection refused')
+                if attempt < 3:
+                    self.assertEqual(email.next_attempt_at, now + retry_delay(attempt))
+                    # Not due yet: nothing is claimed.
+                    with mock.patch('home.outbox.timezone.now', return_value=now):
+                        self.assertEqual(drain_outbox(connection=connection), (0, 0))
+                    now = email.next_attempt_at
+        self.assertEqual(email.status, OutgoingEmail.STATUS_FAILED)
+
+    def test_claimed_emails_are_reclaimed_after_the_timeout(self):
+        email = self.enqueue()
+        now = timezone.now()
+        with mock.patch('home.outbox.timezone.now', return_value=now):
+            self.assertEqual(claim_batch(10), [email])
+            # A second worker skips the claimed email.
+            self.assertEqual(claim_batch(10), [])
+        # The first worker died without recording an outcome.
+        later = now + timedelta(seconds=settings.OUTBOX_CLAIM_TIMEOUT)
+        with mock.patch('home.outbox.timezone.now', return_value=later):
+            self.assertEqual(claim_batch(10), [email])
+
+    def test_bad_headers_fail_permanently(self):
+        email = self.enqueue('Hello\nBcc: everyone@example.com')
+        self.assertEqual(drain_outbox(connection=self.connection()), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutgoingEmail.STATUS_FAILED)
+        self.assertEqual(email.attempts, 1)
+        self.assertTrue(email.last_error.startswith('Invalid header found'))
+        self.assertEqual(mail.outbox, [])
+
+    def test_send_outbox_command(self):
+        self.enqueue()
+        stdout = io.StringIO()
+        call_command('send_outbox', stdout=stdout)
+        self.assertIn('1 sent, 0 failed', stdout.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
+
+
+class SiteverifyStub(BaseHTTPRequestHandler):
+    """Local stand-in for the siteverify API: 'valid' tokens pass, 'slow' ones answer late."""
+    tokens = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length'])).decode()
+        token = parse_qs(body)['response'][0]
+        self.tokens.append(token)
+        if token == 'slow':
+            time.sleep(1)
+        payload = json.dumps({'success': token == 'valid'}).encode()
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except ConnectionError:
+            # The client timed out and hung up before the late answer.
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RecaptchaClientTests(SimpleTestCase):
+    """Timeouts, circuit breaker, failure policy and token cache of the siteverify client."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), SiteverifyStub)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f'http://127.0.0.1:{cls.server.server_port}/siteverify'
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            cls.closed_url = f'http://127.0.0.1:{probe.getsockname()[1]}/siteverify'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        SiteverifyStub.tokens = []
+
+    def recaptcha_client(self, url=None, **options):
+        options = {'connect_timeout': 0.5, 'read_timeout': 0.2, 'failure_threshold': 2, 'reset_timeout': 30, **options}
+        client = RecaptchaClient('secret', url or self.url, **options)
+        self.addCleanup(client.close)
+        return client
+
+    def test_verifies_against_the_api_with_timeouts(self):
+        client = self.recaptcha_client()
+        self.assertTrue(client.verify('valid', remote_ip='203.0.113.7'))
+        self.assertFalse(client.verify('forged'))
+        self.assertFalse(client.verify(''))
+        self.assertEqual(SiteverifyStub.tokens, ['valid', 'forged'])
+
+        with mock.patch.object(client.session, 'post', wraps=client.session.post) as post:
+            client.verify('other')
+        self.assertEqual(post.call_args.kwargs['timeout'], (0.5, 0.2))
+        self.assertEqual(post.call_args.kwargs['data'], {'secret': 'secret', 'response': 'other'})
+
+    def test_read_and_connect_failures_are_unavailable(self):
+        start = time.monotonic()
+        with self.assertRaises(RecaptchaUnavailable):
+            self.recaptcha_client().verify('slow')
+        self.assertLess(time.monotonic() - start, 1)
+        with self.assertRaises(RecaptchaUnavailable):
+            self.recaptcha_client(self.closed_url).verify('valid')
+
+    def test_fail_open_policy(self):
+        self.assertTrue(self.recaptcha_client(self.closed_url, fail_open=True).verify('anything'))
+        with self.assertRaises(RecaptchaUnavailable):
+            self.recaptcha_client(self.closed_url, fail_open=False).verify('anything')
+
+    def test_breaker_opens_then_half_opens(self):
+        client = self.recaptcha_client(self.closed_url)
+        now = time.monotonic()
+        with mock.patch('home.recaptcha.time.monotonic', return_value=now):
+            for _ in range(2):
+                with self.assertRaises(RecaptchaUnavailable):
+                    client.verify('valid')
+            # Open: refused without calling the API.
+            client.verify_url = self.url
+            with self.assertRaisesMessage(RecaptchaUnavailable, 'circuit open'):
+                client.verify('valid')
+        self.assertEqual(SiteverifyStub.tokens, [])
+
+        # Half-open after the reset timeout: a successful trial call closes the circuit.
+        with mock.patch('home.recaptcha.time.monotonic', return_value=now + 30):
+            self.assertTrue(client.verify('valid'))
+            self.assertFalse(client.verify('another'))
+        self.assertEqual(SiteverifyStub.tokens, ['valid', 'another'])
+        self.assertIsNone(client.breaker.opened_at)
+
+    def test_verified_tokens_are_cached(self):
+        client = self.recaptcha_client()
+        self.assertTrue(client.verify('valid'))
+        self.assertTrue(client.verify('valid'))
+        self.assertFalse(client.verify('forged'))
+        self.assertFalse(client.verify('forged'))
+        self.assertEqual(SiteverifyStub.tokens, ['valid', 'forged', 'forged'])
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class ResponsiveImageTests(SimpleTestCase):
+    """Variant build and the `responsive_image` template tag."""
+
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        os.makedirs(os.path.join(self.root.name, 'images'))
+        Image.new('RGB', (1200, 300), 'red').save(os.path.join(self.root.name, 'images', 'hero.jpg'))
+        self.output = os.path.join(self.root.name, 'responsive')
+
+    def test_build_never_upscales(self):
+        manifest = build_responsive_images(self.root.name, self.output, [480, 960, 1440], ['webp'])
+        entry = manifest['images/hero.jpg']
+        self.assertEqual((entry['width'], entry['height']), (1200, 300))
+        self.assertEqual([width for _, width in entry['sources']['image/webp']], [480, 960, 1200])
+        with Image.open(os.path.join(self.output, 'images', 'hero-480w.webp')) as image:
+            self.assertEqual(image.size, (480, 120))
+
+    def test_tag_renders_srcset_and_dimensions(self):
+        build_responsive_images(self.root.name, self.output, [480], ['webp'])
+        template = Template("{% load responsive %}{% responsive_image 'images/hero.jpg' alt='Hero' class='w-100' %}")
+        with self.settings(RESPONSIVE_IMAGES_DIR=self.output):
+            html = template.render(Context())
+        self.assertIn('srcset="/static/responsive/images/hero-480w.webp 480w, '
+                      '/static/responsive/images/hero-1200w.webp 1200w"', html)
+        for attribute in ('width="1200"', 'height="300"', 'loading="lazy"', 'alt="Hero"'):
+            self.assertIn(attribute, html)
+
+    def test_tag_falls_back_without_build(self):
+        template = Template("{% load responsive %}{% responsive_image 'images/hero.jpg' %}")
+        with self.settings(RESPONSIVE_IMAGES_DIR=self.output):
+            html = template.render(Context())
+        self.assertTrue(html.startswith('<img '))
+        self.assertIn('src="/static/images/hero.jpg"', html)
+
+
+class MediaURLTests(SimpleTestCase):
+    """Cached, preset-aware media URL resolution."""
+
+    def setUp(self):
+        clear_media_url_cache()
+        self.addCleanup(clear_media_url_cache)
+        self.image_field = Skill._meta.get_field('image')
+
+    def local_storage(self):
+        """Swaps the Cloudinary storage of `Skill.image` for a local stand-in."""
+        storage = FileSystemStorage(location=tempfile.gettempdir(), base_url='/media/')
+        return mock.patch.object(self.image_field, 'storage', storage)
+
+    def test_cloudinary_preset_adds_transformation(self):
+        skill = Skill(name='Python', image='logos/python.png')
+        url = resolve_media_url(skill.image, 'thumb')
+        self.assertIn('c_fill,f_auto,h_80,q_auto,w_80', url)
+        self.assertTrue(url.endswith('/logos/python.png'))
+        self.assertNotIn('c_fill', skill.get_logo_url)
+
+    def test_urls_are_cached(self):
+        with self.local_storage():
+            skill = Skill(name='Python', image='logos/python.png')
+            with mock.patch.object(FileSystemStorage, 'url', return_value='/media/logos/python.png') as url:
+                for _ in range(3):
+                    self.assertEqual(skill.get_logo_url, '/media/logos/python.png')
+                self.assertEqual(url.call_count, 1)
+
+    def test_local_storage_ignores_preset(self):
+        with self.local_storage():
+            skill = Skill(name='Python', image='logos/python.png')
+            html = Template("{% load media_urls %}{% media_url skill.image 'thumb' %}").render(Context({'skill': skill}))
+            self.assertEqual(html, '/media/logos/python.png')
+            self.assertEqual(SkillSerializer(skill).data['image_thumb_url'], '/media/logos/python.png')
+
+    def test_missing_file_uses_default(self):
+        skill = Skill(name='Python')
+        self.assertEqual(resolve_media_url(skill.image, 'thumb', DEFAULT_IMAGE_URL), DEFAULT_IMAGE_URL)
+        self.assertEqual(SkillSerializer(skill).data['image_thumb_url'], DEFAULT_IMAGE_URL)
+
+    def test_unknown_preset(self):
+        with self.assertRaises(ValueError):
+            resolve_media_url(Skill(image='logos/python.png').image, 'huge')
+
+
+class SkillGroupTests(QueryBudgetTestCase):
+    """Grouping of the skills page sections."""
+
+    def test_groups_match_section_filters(self):
+        skills = list(Skill.objects.filter(is_active=True).order_by('pk'))
+        expected = {
+            'coding': [s for s in skills if s.is_hard_skill and s.category == 'Coding'],
+            'tools': [s for s in skills if s.category == 'Tools'],
+            'soft': [s for s in skills if s.is_soft_skill],
+            'others': [s for s in skills if s.category == 'Others'],
+        }
+        groups = get_skill_groups()
+        for key, members in expected.items():
+            with self.subTest(section=key):
+                self.assertEqual([entry['name'] for entry in groups[key]], [s.name for s in members])
+
+    def test_grouping_is_cached_until_skills_change(self):
+        get_skill_groups()
+        with self.assertNumQueries(0):
+            get_skill_groups()
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.create(name='Rust', category='Coding', is_hard_skill=True, rating=3)
+        self.assertEqual(get_skill_groups()['coding'][-1]['name'], 'Rust')
+
+    def test_star_row(self):
+        self.assertEqual(star_row(5), [True] * 5)
+        self.assertEqual(star_row(3), [True, True, True, False, False])
+        self.assertEqual(star_row(None), [True, False, False, False, False])
+        self.assertEqual(star_row(9), [True, False, False, False, False])
+
+    def test_page_renders_each_skill_once_per_section(self):
+        content = self.assertMaxQueries(2, 'get', '/skills').content.decode()
+        # Skill 4 is a soft skill in the "Others" category, Skill 10 a hard "Coding" skill.
+        self.assertEqual(content.count('  Skill 4\n'), 2)
+        self.assertEqual(content.count('  Skill 10\n'), 1)
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class SearchTests(TestCase):
+    """`search_content()` and the search API."""
+
+    def setUp(self):
+        cache.clear()
+
+    def search(self, status=200, **params):
+        response = self.client.get('/api/search/', params, secure=True)
+        self.assertEqual(response.status_code, status)
+        return response.json()
+
+    def test_results_are_ranked(self):
+        Portfolio.objects.create(name='Inventory service', body='<p>Deployed on Kubernetes.</p>')
+        Portfolio.objects.create(name='Kubernetes operator', body='<p>Reconciles clusters.</p>')
+        results = search_content('kubernetes')
+        self.assertCountEqual([result['title'] for result in results], ['Inventory service', 'Kubernetes operator'])
+        ranks = [result['rank'] for result in results]
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+        if watson.get_backend().supports_ranking:
+            self.assertEqual(results[0]['title'], 'Kubernetes operator')
+        self.assertEqual(results[0]['type'], 'portfolio')
+
+    def test_inactive_items_are_excluded(self):
+        Portfolio.objects.create(name='Archived compiler', body='<p>Old.</p>', is_active=False)
+        Skill.objects.create(name='Compiler design', category='Coding', is_active=False)
+        course = Course.objects.create(name='Compiler construction')
+        self.assertEqual([result['title'] for result in search_content('compiler')], ['Compiler construction'])
+        course.is_active = False
+        course.save()
+        self.assertEqual(search_content('compiler'), [])
+
+    def test_limit_is_clamped(self):
+        index_objects(Skill, Skill.objects.bulk_create([Skill(name=f'Haskell {i}') for i in range(101)]))
+        self.assertEqual(len(self.search(q='haskell', limit=0)['results']), 1)
+        self.assertEqual(len(self.search(q='haskell', limit=5)['results']), 5)
+        self.assertEqual(len(self.search(q='haskell', limit=1000)['results']), 100)
+        self.assertEqual(len(self.search(q='haskell')['results']), 20)
+        self.assertEqual(self.search(400, q='haskell', limit='many'), {'error': 'limit must be an integer'})
+
+    def test_empty_query_searches_nothing(self):
+        Skill.objects.create(name='Erlang')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.search(q='   '), {'query': '', 'results': []})
+            self.assertEqual(self.search(), {'query': '', 'results': []})
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class SiteOwnerCacheTests(TestCase):
+    """The per-process cache of the site owner, in the context of every page."""
+
+    template = Template('{{ me.username }}|{{ me.profile.title }}')
+
+    def setUp(self):
+        self.owner = User.objects.create(username='owner')
+        Profile.objects.filter(user=self.owner).update(title='Engineer')
+        User.objects.create(username='successor')
+        invalidate_site_owner()
+
+    def render(self):
+        return self.template.render(Context(project_context(None)))
+
+    def test_second_render_runs_no_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.render(), 'owner|Engineer')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.render(), 'owner|Engineer')
+
+    def test_profile_save_and_user_delete_refresh_it(self):
+        self.render()
+        profile = Profile.objects.get(user=self.owner)
+        profile.title = 'Architect'
+        profile.save()
+        self.assertEqual(self.render(), 'owner|Architect')
+
+        self.owner.delete()
+        self.assertTrue(self.render().startswith('successor|'))
+
+
+class SanitizeHTMLTests(SimpleTestCase):
+    """Save-time sanitizing and minifying of HTMLField content."""
+
+    def test_strips_unsafe_markup(self):
+        html = sanitize_html(
+            '<p onclick="x()" style="color:red">Hi <script>alert(1)</script>'
+            '<a href="javascript:alert(1)">bad</a> <a href="https://example.com" target="_blank">ok</a></p>'
+            '<iframe src="https://evil.example"></iframe><!-- note -->'
+        )
+        self.assertEqual(
+            html,
+            '<p>Hi <a>bad</a> <a href="https://example.com" target="_blank" rel="noopener noreferrer">ok</a></p>'
+        )
+
+    def test_minifies_editor_markup(self):
+        html = sanitize_html('\n<div>\n  <p>&nbsp;</p>\n  <p>Some   <strong>bold</strong>\n text</p>\n</div>\n<p>1 &lt; 2</p>')
+        self.assertEqual(html, '<div><p>Some <strong>bold</strong> text</p></div><p>1 &lt; 2</p>')
+
+    def test_preserves_pre_and_closes_open_tags(self):
+        self.assertEqual(sanitize_html('<pre>a\n  b</pre><ul><li>one<li>two'), '<pre>a\n  b</pre><ul><li>one</li><li>two</li></ul>')
+        self.assertEqual(sanitize_html(None), '')
+
+
+class RenderedHTMLFieldTests(TestCase):
+    """Companion `_html` fields are kept in sync on save."""
+
+    def test_save_renders_companion_fields(self):
+        leadership = Leadership.objects.create(name='Club', description='<p style="x">Led  <b>it</b></p>')
+        self.assertEqual(leadership.description_html, '<p>Led <b>it</b></p>')
+
+        leadership.description = '<p>Updated</p>'
+        leadership.save(update_fields=['description'])
+        leadership.refresh_from_db()
+        self.assertEqual(leadership.description_html, '<p>Updated</p>')
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class ProfileSnapshotSignalTests(TestCase):
+    """Snapshot rebuilds triggered by changes to the content a profile embeds."""
+
+    def setUp(self):
+        cache.clear()
+        self.profile = User.objects.create(username='owner').profile
+
+    def snapshot(self):
+        return ProfileSnapshot.objects.get(profile=self.profile).data
+
+    def names(self, collection, key='name'):
+        return [item[key] for item in self.snapshot()[collection]]
+
+    def image_names(self):
+        return [image['name'] for project in self.snapshot()['all_projects'] for image in project['images']]
+
+    def test_through_table_changes_rebuild(self):
+        education = Education.objects.create(school='Snapshot University')
+        with self.captureOnCommitCallbacks(execute=True):
+            education.profiles.add(self.profile)
+        self.assertEqual(self.names('all_educations', 'school'), ['Snapshot University'])
+        with self.captureOnCommitCallbacks(execute=True):
+            education.profiles.clear()
+        self.assertEqual(self.names('all_educations', 'school'), [])
+        # From the profile's side of the relation.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.all_educations.add(education)
+        self.assertEqual(self.names('all_educations', 'school'), ['Snapshot University'])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.all_educations.remove(education)
+        self.assertEqual(self.names('all_educations', 'school'), [])
+
+    def test_rebuilds_bump_the_snapshot_version(self):
+        label = ProfileSnapshot._meta.label_lower
+        before = get_model_versions([ProfileSnapshot])[label]
+        education = Education.objects.create(school='Versioned University')
+        with self.captureOnCommitCallbacks(execute=True):
+            education.profiles.add(self.profile)
+        self.assertGreater(get_model_versions([ProfileSnapshot])[label], before)
+
+    def test_project_image_changes_rebuild(self):
+        project = Portfolio.objects.create(name='Snapshot project', body='<p>Body</p>')
+        with self.captureOnCommitCallbacks(execute=True):
+            project.profiles.add(self.profile)
+            image = ProjectImage.objects.create(portfolio=project, name='Diagram', url='https://example.com/d.png',
+                                                is_image=False)
+        self.assertEqual(self.image_names(), ['Diagram'])
+        image.name = 'Architecture'
+        with self.captureOnCommitCallbacks(execute=True):
+            image.save()
+        self.assertEqual(self.image_names(), ['Architecture'])
+        with self.captureOnCommitCallbacks(execute=True):
+            image.delete()
+        self.assertEqual(self.image_names(), [])
+
+    def test_related_deletes_rebuild(self):
+        project = Portfolio.objects.create(name='Snapshot project', body='<p>Body</p>')
+        skill = Skill.objects.create(name='Rust', category='Coding')
+        with self.captureOnCommitCallbacks(execute=True):
+            project.profiles.add(self.profile)
+            skill.profiles.add(self.profile)
+            ProjectImage.objects.create(portfolio=project, name='Diagram', url='https://example.com/d.png',
+                                        is_image=False)
+        self.assertEqual(self.names('all_skills'), ['Rust'])
+        self.assertEqual(self.names('all_projects'), ['Snapshot project'])
+        with self.captureOnCommitCallbacks(execute=True):
+            skill.delete()
+            project.delete()
+        self.assertEqual(self.names('all_skills'), [])
+        self.assertEqual(self.names('all_projects'), [])
+
+
+class ChangeTrackingTests(TestCase):
+    """Timestamps and version counters kept by saves and bulk writes."""
+
+    def setUp(self):
+        # Versions cached by earlier tests belong to rolled-back transactions.
+        cache.clear()
+
+    def assertBumps(self, model, write):
+        before = get_model_versions([model])[model._meta.label_lower]
+        with self.captureOnCommitCallbacks(execute=True):
+            write()
+        self.assertGreater(get_model_versions([model])[model._meta.label_lower], before)
+
+    def test_save_stamps_update_fields(self):
+        course = Course.objects.create(name='Algorithms')
+        Course.objects.filter(pk=course.pk).update(updated_at=course.created_at)
+        course.name = 'Data Structures'
+        course.save(update_fields=['name'])
+        course.refresh_from_db()
+        self.assertGreater(course.updated_at, course.created_at)
+
+    def test_bulk_writes_stamp_and_bump(self):
+        courses = Course.objects.bulk_create([Course(name=f'Course {i}') for i in range(3)])
+        stamped = Course.objects.order_by('pk').first().updated_at
+        self.assertBumps(Course, lambda: Course.objects.filter(name='Course 0').update(name='Course A'))
+        self.assertGreater(Course.objects.get(name='Course A').updated_at, stamped)
+        for course in courses:
+            course.name += '!'
+        self.assertBumps(Course, lambda: Course.objects.bulk_update(courses, ['name']))
+        self.assertBumps(Course, lambda: Course.objects.bulk_create([Course(name='Course 4')]))
+
+    def test_m2m_change_bumps_both_sides(self):
+        profile = User.objects.create(username='owner').profile
+        skill = Skill.objects.create(name='Go')
+        self.assertBumps(Profile, lambda: profile.skills.add(skill))
+        self.assertBumps(Skill, lambda: profile.skills.clear())
+
+    def test_version_rolls_back_with_transaction(self):
+        label = Video._meta.label_lower
+        before = get_model_versions([Video])[label]
+        try:
+            with transaction.atomic():
+                Video.objects.create(name='Demo')
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        cache.clear()
+        self.assertEqual(get_model_versions([Video])[label], before)
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class ResumeDocumentTests(TestCase):
+    """The `export_resume` and `import_resume` commands."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_synthetic_data(profiles=1, projects=30, skills=40, contacts=0, courses=10)
+        cls.profile = Profile.objects.select_related('user').get()
+
+    def export(self, username):
+        out = io.StringIO()
+        call_command('export_resume', username, stdout=out)
+        return json.loads(out.getvalue())
+
+    def import_document(self, document, *args):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as source:
+            json.dump(document, source)
+        self.addCleanup(os.remove, source.name)
+        call_command('import_resume', source.name, *args, '--skip-search-index', stdout=io.StringIO())
+
+    def test_round_trip(self):
+        document = self.export(self.profile.user.username)
+        self.assertEqual(len(document['projects']), 30)
+        self.assertEqual(len(document['projects'][0]['images']), 2)
+        self.assertNotIn('resume_password', document['profile'])
+
+        document['profile']['username'] = 'copy'
+        self.import_document(document)
+        copy = Profile.objects.get(user__username='copy')
+        self.assertEqual(copy.all_skills.count(), 40)
+        self.assertEqual(copy.skills.count(), 40)
+        self.assertEqual(ProjectImage.objects.filter(portfolio__profiles=copy).count(), 60)
+        self.assertTrue(copy.all_experiences.first().description_html)
+
+        exported = self.export('copy')
+        exported['profile']['username'] = document['profile']['username']
+        self.assertEqual(exported, document)
+
+    def test_import_queries_do_not_grow_with_items(self):
+        document = self.export(self.profile.user.username)
+        document['profile']['username'] = 'copy'
+        with CaptureQueriesContext(connection) as small:
+            import_resume_document({**document, **{key: document[key][:1] for key in SECTIONS}})
+        with CaptureQueriesContext(connection) as large:
+            import_resume_document({**document, 'profile': {'username': 'copy2'}})
+        self.assertLessEqual(len(large), len(small) + 5)
+
+    def test_invalid_document_imports_nothing(self):
+        document = self.export(self.profile.user.username)
+        document['profile']['username'] = 'copy'
+        document['leaderships'].append({'name': 'Club', 'colour': 'red'})
+        skills = Skill.objects.count()
+        with self.assertRaisesMessage(CommandError, 'Unknown Leadership fields: colour'):
+            self.import_document(document)
+        self.assertEqual(Skill.objects.count(), skills)
+        self.assertFalse(User.objects.filter(username='copy').exists())
+
+    def test_invalid_values_import_nothing(self):
+        cases = [
+            ('courses', {'name': 'Algorithms', 'date': 'last spring'}, 'courses[0].date:'),
+            ('skills', {'name': 'Python', 'rating': 'five'}, 'skills[0].rating:'),
+            ('skills', {'name': 'Python', 'is_active': None}, 'skills[0]: is_active:'),
+            ('projects', {'name': 'Site', 'body': None}, 'projects[0]: body: This field cannot be null.'),
+            ('projects', {'name': 'Site', 'images': [{'url': 'not a url'}]}, 'projects[0].images[0]: url:'),
+        ]
+        courses = Course.objects.count()
+        for key, item, message in cases:
+            with self.subTest(key=key, item=item):
+                document = {'version': 1, 'profile': {'username': 'copy'}, 'courses': [{'name': 'Valid'}], key: [item]}
+                with self.assertRaisesMessage(CommandError, f'Import failed, nothing was imported: {message}'):
+                    self.import_document(document)
+                self.assertEqual(Course.objects.count(), courses)
+                self.assertFalse(User.objects.filter(username='copy').exists())
+
+    def test_user_only_changes_bump_the_user_version(self):
+        label = User._meta.label_lower
+        cache.clear()
+        before = get_model_versions([User])[label]
+        document = {'version': 1, 'profile': {'username': self.profile.user.username, 'first_name': 'Renamed'}}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.import_document(document)
+        self.assertGreater(get_model_versions([User])[label], before)
+        self.assertEqual(User.objects.get(pk=self.profile.user_id).first_name, 'Renamed')
+
+    def test_linked_project_images_are_not_uploads(self):
+        document = {'version': 1, 'profile': {'username': 'copy'}, 'projects': [
+            {'name': 'Site', 'images': [{'name': 'Linked', 'url': 'https://example.com/a.png'}, {'name': 'Uploaded'}]},
+        ]}
+        self.import_document(document)
+        self.assertFalse(ProjectImage.objects.get(name='Linked').is_image)
+        self.assertTrue(ProjectImage.objects.get(name='Uploaded').is_image)
+
+
+class BatchWriteTests(QueryBudgetTestCase):
+    """The `batch` endpoints of the writable ViewSets."""
+
+    def batch(self, method, path, items):
+        return getattr(self.client, method)(path, items, content_type='application/json', secure=True)
+
+    def test_batch_create(self):
+        items = [{'name': f'Batch {i}', 'category': 'Tools', 'rating': 3, 'profiles': [self.profile.pk]}
+                 for i in range(50)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.batch('post', '/api/skills/batch/', items)
+        self.assertEqual(response.status_code, 201, response.content)
+        # The profiles are loaded once for the batch and every write is a single statement.
+        self.assertLessEqual(len(queries), 16, '\n'.join(query['sql'] for query in queries.captured_queries))
+        self.assertEqual([item['name'] for item in response.json()], [f'Batch {i}' for i in range(50)])
+        self.assertEqual(Skill.objects.filter(name__startswith='Batch').count(), 50)
+
+    def test_batch_created_objects_are_searchable(self):
+        items = [{'name': 'Zanzibarscript', 'category': 'Languages', 'rating': 4, 'profiles': [self.profile.pk]},
+                 {'name': 'Quokkabase', 'category': 'Databases', 'rating': 2, 'profiles': [self.profile.pk]}]
+        self.assertEqual(self.batch('post', '/api/skills/batch/', items).status_code, 201)
+        response = self.client.get('/api/search/', {'q': 'Zanzibarscript'}, secure=True)
+        self.assertEqual([result['title'] for result in response.json()['results']], ['Zanzibarscript'])
+
+        skill = Skill.objects.get(name='Quokkabase')
+        self.assertEqual(self.batch('patch', '/api/skills/batch/', [{'id': skill.pk, 'name': 'Wombatbase'}]).status_code, 200)
+        response = self.client.get('/api/search/', {'q': 'Wombatbase'}, secure=True)
+        self.assertEqual([result['title'] for result in response.json()['results']], ['Wombatbase'])
+
+    def test_batch_images_with_a_url_are_not_uploads(self):
+        project = Portfolio.objects.order_by('pk').first()
+        items = [{'portfolio': project.pk, 'name': 'Linked', 'url': 'https://example.com/a.png'},
+                 {'portfolio': project.pk, 'name': 'Uploaded'}]
+        self.assertEqual(self.batch('post', '/api/images/batch/', items).status_code, 201)
+        self.assertFalse(ProjectImage.objects.get(name='Linked').is_image)
+        self.assertTrue(ProjectImage.objects.get(name='Uploaded').is_image)
+
+        image = ProjectImage.objects.get(name='Uploaded')
+        self.batch('patch', '/api/images/batch/', [{'id': image.pk, 'url': 'https://example.com/b.png'}])
+        image.refresh_from_db()
+        self.assertFalse(image.is_image)
+
+    def test_moving_images_refreshes_the_old_profiles(self):
+        old_project = Portfolio.objects.filter(profiles=self.profile).order_by('pk').first()
+        new_project = Portfolio.objects.create(name='Unlisted')
+        image = ProjectImage.objects.create(portfolio=old_project, name='Moving')
+        rebuild_profile_snapshots([self.profile.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.batch('patch', '/api/images/batch/', [{'id': image.pk, 'portfolio': new_project.pk}])
+        self.assertEqual(response.status_code, 200, response.content)
+        snapshot = Profile.objects.select_related('snapshot').get(pk=self.profile.pk).snapshot.data
+        images = [image['name'] for project in snapshot['all_projects'] for image in project.get('images', [])]
+        self.assertNotIn('Moving', images)
+
+    def test_batch_create_links_profiles_and_refreshes_snapshots(self):
+        items = [{'name': 'Batch course', 'profiles': [self.profile.pk]}]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.batch('post', '/api/courses/batch/', items)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()[0]['profiles'], [self.profile.pk])
+        snapshot = self.client.get(f'/api/profiles/{self.profile.pk}/', secure=True).json()
+        self.assertIn('Batch course', [course['name'] for course in snapshot['all_courses']])
+
+    def test_batch_partial_update(self):
+        projects = list(Portfolio.objects.order_by('pk')[:20])
+        items = [{'id': project.pk, 'body': f'<p style="x">New {project.pk}</p>'} for project in projects]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.batch('patch', '/api/projects/batch/', items)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()[0]['body_html'], f'<p>New {projects[0].pk}</p>')
+        updated = Portfolio.objects.get(pk=projects[-1].pk)
+        self.assertEqual(updated.body_html, f'<p>New {updated.pk}</p>')
+        self.assertEqual(updated.name, projects[-1].name)
+        self.assertGreater(updated.updated_at, projects[-1].updated_at)
+
+    def test_errors_are_reported_per_item_and_nothing_is_written(self):
+        image = ProjectImage.objects.order_by('pk').first()
+        items = [
+            {'id': image.pk, 'name': 'Renamed'},
+            {'id': 0, 'name': 'Missing'},
+            {'id': image.pk, 'name': 'Again'},
+            {'id': ProjectImage.objects.order_by('pk')[1].pk, 'url': 'not a url'},
+        ]
+        response = self.batch('patch', '/api/images/batch/', items)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['index'] for error in response.json()['errors']], [1, 2, 3])
+        self.assertIn('url', response.json()['errors'][2]['errors'])
+        image.refresh_from_db()
+        self.assertNotEqual(image.name, 'Renamed')
+
+        self.assertEqual(self.batch('post', '/api/skills/batch/', {'name': 'Not a list'}).status_code, 400)
+
+
+class GeneratedResumeTests(TestCase):
+    """PDF cache, render deduplication and asset restrictions of the generated resume."""
+
+    BASE_URL = 'https://testserver/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.profile = User.objects.create(username='owner').profile
+        cls.profile.set_resume_password('secret')
+        Profile.objects.filter(pk=cls.profile.pk).update(resume_password=cls.profile.resume_password)
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        overrides = override_settings(RESUME_PDF_CACHE_DIR=self.directory)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        # Renders are never started for real: the pool returns futures the tests resolve.
+        self.futures = []
+        self.executor = mock.Mock()
+        self.executor.submit.side_effect = self.submit
+        patcher = mock.patch('home.resume_pdf.get_executor', return_value=self.executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def submit(self, *args, **kwargs):
+        self.futures.append(Future())
+        return self.futures[-1]
+
+    def snapshot(self, description='Built a thing'):
+        return {'all_projects': [{'name': 'Project', 'description': description, 'for_resume': True}]}
+
+    def test_cached_pdf_is_sent_without_rendering(self):
+        snapshot = self.snapshot()
+        path = resume_pdf_path(render_resume_html(snapshot), self.BASE_URL)
+        with open(path, 'wb') as file:
+            file.write(b'%PDF')
+        self.assertEqual(get_resume_pdf(snapshot, self.BASE_URL), path)
+        self.executor.submit.assert_not_called()
+
+    def test_renders_of_the_same_document_are_deduplicated(self):
+        with self.assertRaises(ResumeRenderPending):
+            get_resume_pdf(self.snapshot(), self.BASE_URL, wait=0)
+        with self.assertRaises(ResumeRenderPending):
+            get_resume_pdf(self.snapshot(), self.BASE_URL, wait=0)
+        self.assertEqual(self.executor.submit.call_count, 1)
+
+        args, kwargs = self.executor.submit.call_args
+        self.assertEqual(kwargs['allowed_urls'], tuple(settings.RESUME_PDF_ALLOWED_URLS))
+        self.assertEqual(kwargs['static_url'], self.BASE_URL + 'static/')
+
+        # A finished render leaves the in-flight table: the next miss starts a new one.
+        self.futures[0].set_result(args[2])
+        with self.assertRaises(ResumeRenderPending):
+            get_resume_pdf(self.snapshot(), self.BASE_URL, wait=0)
+        self.assertEqual(self.executor.submit.call_count, 2)
+        self.futures[1].set_result(args[2])
+
+    def test_renders_beyond_the_pending_limit_are_refused(self):
+        with mock.patch('home.resume_pdf._render_slots', threading.BoundedSemaphore(1)):
+            with self.assertRaises(ResumeRenderPending):
+                get_resume_pdf(self.snapshot('First'), self.BASE_URL, wait=0)
+            with self.assertRaises(ResumeRenderBusy):
+                get_resume_pdf(self.snapshot('Second'), self.BASE_URL, wait=0)
+            self.futures[0].set_result(None)
+        self.assertEqual(self.executor.submit.call_count, 1)
+
+    def test_view_answers_202_then_503_then_the_pdf(self):
+        data = {'password': 'secret', 'mode': 'generated'}
+        for error, status in ((ResumeRenderPending, 202), (ResumeRenderBusy, 503)):
+            with self.subTest(status=status), mock.patch('home.views.get_resume_pdf', side_effect=error):
+                response = self.client.post('/api/download-resume/', data, secure=True)
+                self.assertEqual(response.status_code, status)
+                self.assertIn('Retry-After', response)
+
+        path = os.path.join(self.directory, 'resume.pdf')
+        with open(path, 'wb') as file:
+            file.write(b'%PDF-1.7')
+        with mock.patch('home.views.get_resume_pdf', return_value=path):
+            response = self.client.post('/api/download-resume/', data, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF-1.7')
+
+    def test_project_markup_is_escaped(self):
+        html = render_resume_html(self.snapshot('<img src="file:///etc/passwd">'))
+        self.assertNotIn('<img src="file:///etc/passwd">', html)
+        self.assertIn('&lt;img src=&quot;file:///etc/passwd&quot;&gt;', html)
+
+    def test_assets_are_restricted_to_media_hosts_and_static_files(self):
+        with open(os.path.join(self.directory, 'logo.png'), 'wb') as file:
+            file.write(b'png')
+        options = {
+            'allowed_urls': ('https://res.cloudinary.com/',),
+            'static_url': self.BASE_URL + 'static/',
+            'static_root': self.directory,
+        }
+        avatar = 'https://res.cloudinary.com/demo/image/upload/avatar.png'
+        self.assertEqual(resolve_asset_url(avatar, **options), avatar)
+        self.assertEqual(resolve_asset_url(self.BASE_URL + 'static/logo.png?v=1', **options),
+                         'file://' + os.path.realpath(os.path.join(self.directory, 'logo.png')))
+        for url in ('file:///etc/passwd', 'http://169.254.169.254/latest/meta-data/',
+                    self.BASE_URL + 'static/../../etc/passwd', self.BASE_URL + 'admin/',
+                    'https://res.cloudinary.com.evil.example/'):
+            with self.subTest(url=url), self.assertRaises(ValueError):
+                resolve_asset_url(url, **options)
+
+
+class ResumeDownloadTokenTests(TestCase):
+    """Download tokens and failed-attempt throttling of the resume endpoint."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.profile = User.objects.create(username='owner').profile
+        cls.profile.set_resume_password('secret')
+        Profile.objects.filter(pk=cls.profile.pk).update(resume_password=cls.profile.resume_password)
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(ResumePDFView, 'uploaded_resume', return_value=HttpResponse(b'%PDF'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def download(self, method='post', **data):
+        return getattr(self.client, method)('/api/download-resume/', data, secure=True)
+
+    def test_password_issues_token_for_later_downloads(self):
+        response = self.download(password='secret')
+        self.assertEqual(response.status_code, 200)
+        token = response['X-Download-Token']
+
+        with mock.patch('home.views.check_password') as check:
+            self.assertEqual(self.download('get', token=token).status_code, 200)
+            self.assertEqual(self.download(token=token).status_code, 200)
+        check.assert_not_called()
+        self.assertEqual(self.download('get', token=token + 'x').status_code, 403)
+        self.assertEqual(self.download('get', password='secret').status_code, 403)
+
+    def test_tokens_expire_and_are_revoked_by_password_change(self):
+        token = self.download(password='secret')['X-Download-Token']
+        with override_settings(RESUME_TOKEN_MAX_AGE=-1):
+            self.assertEqual(self.download(token=token).status_code, 403)
+
+        self.profile.set_resume_password('changed')
+        Profile.objects.filter(pk=self.profile.pk).update(resume_password=self.profile.resume_password)
+        self.assertEqual(self.download(token=token).status_code, 403)
+
+    def test_failed_attempts_are_throttled_before_hashing(self):
+        token = self.download(password='secret')['X-Download-Token']
+        for _ in range(5):
+            self.assertEqual(self.download(password='wrong').status_code, 403)
+        with mock.patch('home.views.check_password') as check:
+            response = self.download(password='secret')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        check.assert_not_called()
+        self.assertEqual(self.download(token=token).status_code, 200)
+
+    def test_rotating_forwarded_for_does_not_reset_attempts(self):
+        for i in range(5):
+            response = self.client.post('/api/download-resume/', {'password': 'wrong'}, secure=True,
+                                        HTTP_X_FORWARDED_FOR=f'10.1.0.{i}')
+            self.assertEqual(response.status_code, 403)
+        response = self.client.post('/api/download-resume/', {'password': 'wrong'}, secure=True,
+                                    HTTP_X_FORWARDED_FOR='10.1.0.99')
+        self.assertEqual(response.status_code, 429)
+
+    def test_attempts_are_counted_before_hashing(self):
+        # Parallel guesses: every request passes the throttle before any hash check finishes.
+        request = RequestFactory().post('/api/download-resume/')
+        throttle = FailedPasswordThrottle()
+        self.assertEqual([throttle.allow_request(request, None) for _ in range(7)], [True] * 5 + [False] * 2)
+        self.assertGreater(throttle.wait(), 0)
+
+    def test_correct_passwords_and_token_requests_are_not_counted(self):
+        # One more correct password than the limit of five attempts.
+        for _ in range(6):
+            self.assertEqual(self.download(password='secret').status_code, 200)
+        with mock.patch('home.views.check_password') as check:
+            for _ in range(3):
+                response = self.download('get')
+                self.assertEqual(response.status_code, 403)
+                self.assertEqual(response.json(), {'error': 'Download token required'})
+        check.assert_not_called()
+        self.assertEqual(self.download(password='wrong').status_code, 403)
+
+    @override_settings(CORS_ALLOWED_ORIGINS=['https://frontend.example'])
+    def test_token_headers_are_exposed_to_cors_origins(self):
+        response = self.client.post('/api/download-resume/', {'password': 'secret'}, secure=True,
+                                     HTTP_ORIGIN='https://frontend.example')
+        exposed = {name.strip() for name in response['Access-Control-Expose-Headers'].split(',')}
+        self.assertLessEqual({'X-Download-Token', 'X-Download-Token-Max-Age'}, exposed)
+
+
+class FileDeliveryTests(SimpleTestCase):
+    """Local file cache and range-aware download responses."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.storage = FileSystemStorage(location=os.path.join(self.directory.name, 'storage'))
+        self.storage.save('resumes/cv.pdf', io.BytesIO(b'0123456789'))
+        self.file = FieldFile(None, Profile._meta.get_field('resume'), 'resumes/cv.pdf')
+        self.file.storage = self.storage
+        settings_override = override_settings(
+            RESUME_FILE_CACHE_DIR=os.path.join(self.directory.name, 'cache'), RESUME_FILE_SENDFILE='',
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.factory = RequestFactory()
+
+    def respond(self, **headers):
+        path = get_cached_file(self.file)
+        return file_response(self.factory.get('/', **headers), path, 'cv.pdf', 'application/pdf',
+                             accel_prefix='/protected/')
+
+    def test_file_is_fetched_once(self):
+        with mock.patch.object(self.storage, 'open', wraps=self.storage.open) as storage_open:
+            first = get_cached_file(self.file)
+            self.assertEqual(get_cached_file(self.file), first)
+        storage_open.assert_called_once()
+        with open(first, 'rb') as cached:
+            self.assertEqual(cached.read(), b'0123456789')
+
+        self.file.name = 'resumes/new.pdf'
+        self.storage.save('resumes/new.pdf', io.BytesIO(b'new'))
+        self.assertNotEqual(get_cached_file(self.file), first)
+
+    def test_full_and_conditional_responses(self):
+        response = self.respond()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(self.respond(HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_range_requests(self):
+        etag = self.respond()['ETag']
+        response = self.respond(HTTP_RANGE='bytes=2-5')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'2345')
+        self.assertEqual(response['Content-Range'], 'bytes 2-5/10')
+        self.assertEqual(response['Content-Length'], '4')
+
+        self.assertEqual(b''.join(self.respond(HTTP_RANGE='bytes=-3').streaming_content), b'789')
+        self.assertEqual(self.respond(HTTP_RANGE='bytes=2-5', HTTP_IF_RANGE=etag).status_code, 206)
+        self.assertEqual(self.respond(HTTP_RANGE='bytes=2-5', HTTP_IF_RANGE='"stale"').status_code, 200)
+        self.assertEqual(self.respond(HTTP_RANGE='bytes=0-1,4-5').status_code, 200)
+
+        response = self.respond(HTTP_RANGE='bytes=20-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+
+    def test_sendfile_modes(self):
+        with override_settings(RESUME_FILE_SENDFILE='x-accel-redirect'):
+            response = self.respond()
+        self.assertRegex(response['X-Accel-Redirect'], r'^/protected/[0-9a-f]{64}\.pdf$')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        with override_settings(RESUME_FILE_SENDFILE='x-sendfile'):
+            self.assertEqual(self.respond()['X-Sendfile'], get_cached_file(self.file))
+
+
+@override_settings(
+    STORAGES=TEST_STORAGES,
+    RATE_LIMITS={'contact': '1/h:1', 'download': '60/m:2', 'api_write': '1/h:1'},
+)
+class RateLimitTests(TestCase):
+    """Token-bucket limits of the middleware and the DRF throttles."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_parse_policy(self):
+        self.assertEqual(parse_policy('5/m'), (5 / 60, 5))
+        self.assertEqual(parse_policy('10/hour:3'), (10 / 3600, 3))
+        with self.assertRaises(ImproperlyConfigured):
+            parse_policy('often')
+
+    def test_bucket_refills_at_the_policy_rate(self):
+        with mock.patch('home.ratelimit.time.time', return_value=1000.0) as clock:
+            self.assertEqual(hit('download', '10.0.0.1'), 0)
+            self.assertEqual(hit('download', '10.0.0.1'), 0)
+            self.assertAlmostEqual(hit('download', '10.0.0.1'), 1.0)
+            self.assertEqual(hit('download', '10.0.0.2'), 0)
+            clock.return_value = 1001.0
+            self.assertEqual(hit('download', '10.0.0.1'), 0)
+
+    def test_falls_back_to_process_state_without_cache(self):
+        with mock.patch('home.ratelimit.cache.get', side_effect=ConnectionError):
+            self.assertEqual(hit('contact', '10.0.0.3'), 0)
+            self.assertGreater(hit('contact', '10.0.0.3'), 0)
+
+    def test_middleware_limits_contact_form_posts(self):
+        self.assertEqual(self.client.post('/contact', {}, secure=True).status_code, 200)
+        response = self.client.post('/contact', {}, secure=True)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '3600')
+        self.assertEqual(self.client.get('/contact', secure=True).status_code, 200)
+
+    def test_throttles_limit_api_writes_per_client(self):
+        data = {'name': 'Go', 'profiles': [User.objects.create(username='owner').profile.pk]}
+        self.assertEqual(self.client.post('/api/skills/', data, secure=True).status_code, 201)
+        response = self.client.post('/api/skills/', data, secure=True)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(self.client.get('/api/skills/', secure=True).status_code, 200)
+        other = self.client.post('/api/skills/', data, secure=True, REMOTE_ADDR='10.0.0.9')
+        self.assertEqual(other.status_code, 201)
+
+    def test_forwarded_for_header_gets_no_fresh_bucket(self):
+        def post(path, data, forwarded_for):
+            return self.client.post(path, data, secure=True, HTTP_X_FORWARDED_FOR=forwarded_for).status_code
+
+        self.assertEqual(post('/contact', {}, '1.2.3.4'), 200)
+        self.assertEqual(post('/contact', {}, '5.6.7.8'), 429)
+        data = {'name': 'Go', 'profiles': [User.objects.create(username='owner').profile.pk]}
+        self.assertEqual(post('/api/skills/', data, '1.2.3.4'), 201)
+        self.assertEqual(post('/api/skills/', data, '5.6.7.8'), 429)
+
+    def test_trusted_proxy_entry_identifies_the_client(self):
+        request = RequestFactory().get('/', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='6.6.6.6, 1.2.3.4')
+        self.assertEqual(client_ident(request), '10.0.0.1')
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}):
+            self.assertEqual(client_ident(request), '1.2.3.4')
+
+
+@override_settings(STORAGES=TEST_STORAGES, SERVER_TIMING_TOKEN='timing', METRICS_TOKEN='scrape')
+class InstrumentationTests(TestCase):
+    """Server-Timing breakdowns and the metrics endpoint."""
+
+    @classmethod
+    def setUpTestData(cls):
+        profile = User.objects.create(username='owner').profile
+        Skill.objects.create(name='Python').profiles.add(profile)
+
+    def setUp(self):
+        cache.clear()
+        metrics_registry.requests.clear()
+        metrics_registry.phases.clear()
+
+    def test_server_timing_requires_token(self):
+        response = self.client.get('/api/skills/', secure=True, HTTP_X_SERVER_TIMING_TOKEN='timing')
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="SQL \(\d+\)"')
+        self.assertIn('ser;dur=', timing)
+        self.assertRegex(timing, r'total;dur=[\d.]+$')
+        self.assertIn('tpl;dur=', self.client.get('/about', secure=True, HTTP_X_SERVER_TIMING_TOKEN='timing')['Server-Timing'])
+
+        self.assertNotIn('Server-Timing', self.client.get('/api/skills/', secure=True))
+        self.assertNotIn('Server-Timing', self.client.get('/api/skills/', secure=True, HTTP_X_SERVER_TIMING_TOKEN='x'))
+
+    def test_nested_phases_are_counted_once(self):
+        with collect_timings() as timings, timed('tpl'), timed('tpl'):
+            pass
+        self.assertEqual(timings.counts['tpl'], 1)
+
+    def test_metrics_endpoint(self):
+        for _ in range(3):
+            self.client.get('/api/skills/', secure=True)
+        body = self.client.get('/metrics', secure=True, HTTP_AUTHORIZATION='Bearer scrape').content.decode()
+        self.assertIn('portfolio_request_duration_seconds_count{route="skill-list",method="GET"} 3', body)
+        self.assertIn('portfolio_request_duration_seconds_bucket{route="skill-list",method="GET",le="+Inf"} 3', body)
+        self.assertRegex(body, r'portfolio_request_phase_calls_total\{route="skill-list",phase="db"\} \d+')
+        self.assertEqual(self.client.get('/metrics', secure=True).status_code, 403)
+        self.assertEqual(self.client.get('/metrics', secure=True, HTTP_AUTHORIZATION='Bearer x').status_code, 403)
+
+    def test_metrics_without_token_are_closed_unless_debug(self):
+        with override_settings(METRICS_TOKEN=''):
+            self.assertEqual(self.client.get('/metrics', secure=True).status_code, 403)
+            with override_settings(DEBUG=True):
+                self.assertEqual(self.client.get('/metrics', secure=True).status_code, 200)
+
+
+@override_settings(STORAGES=TEST_STORAGES, SECURE_SSL_REDIRECT=False, RATE_LIMITS={
+    'contact': '1000/s', 'download': '1000/s', 'api_write': '1000/s',
+})
+class LoadTestTests(LiveServerTestCase):
+    """The load generator against a live server."""
+
+    def test_percentiles_and_mix(self):
+        values = list(range(1, 101))
+        self.assertEqual([percentile(values, f) for f in (0.5, 0.95, 0.99)], [50, 95, 99])
+        self.assertIsNone(percentile([], 0.5))
+        self.assertEqual(parse_mix('home=3, contact'), {'home': 3, 'contact': 1})
+        with self.assertRaises(ValueError):
+            parse_mix('checkout=1')
+
+    def test_reports_latency_per_route(self):
+        seed_synthetic_data(profiles=1, projects=12, skills=5, contacts=0, courses=1)
+        report = run_load(
+            self.live_server_url, mix={'portfolio': 2, 'api_projects': 1, 'contact': 1},
+            requests_count=40, concurrency=4, warmup=4, context={'portfolio_pages': 2}, seed=7,
+        )
+        self.assertEqual(report['total']['requests'], 40)
+        self.assertEqual(report['total']['errors'], 0, report['routes'])
+        self.assertEqual(set(report['routes']), {'portfolio', 'api_projects', 'contact'})
+        contact = report['routes']['contact']
+        self.assertEqual(contact['statuses'], {'201': contact['requests']})
+        self.assertLessEqual(contact['p50_ms'], contact['p99_ms'])
+        self.assertGreaterEqual(Contact.objects.count(), contact['requests'])
+
+
+class StartupTests(SimpleTestCase):
+    """Import-time parsing and the lazy imports of a cold-started web worker."""
+
+    def test_parse_importtime(self):
+        report = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        120 |   six\n'
+            'import time:      1500 |       1620 | cloudinary.utils\n'
+        )
+        self.assertEqual(parse_importtime(report), [('six', 120, 120), ('cloudinary.utils', 1500, 1620)])
+        self.assertEqual(eager_lazy_modules({'django', 'cloudinary.utils'}), ['cloudinary'])
+
+    def test_worker_start_stays_lazy(self):
+        # The import time budget depends on the machine; `manage.py startup_profile` checks it.
+        profile = profile_startup()
+        self.assertIn('home.views', profile['modules'])
+        self.assertEqual(eager_lazy_modules(profile['modules']), [])
+
+
+# URLconf of the async view tests: the async variants in front of the project's routes.
+urlpatterns = [
+    path('resume', AsyncResumeView.as_view(), name='resume'),
+    path('skills', AsyncResumeSkillsView.as_view(), name='skills'),
+    path('contact', AsyncContactView.as_view(), name='contact'),
+    path('', include('portfolio.urls')),
+]
+
+
+@override_settings(STORAGES=TEST_STORAGES, ROOT_URLCONF=__name__)
+class AsyncViewTests(TestCase):
+    """The async resume pages and contact submissions (ASYNC_VIEWS)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        profile = User.objects.create(username='owner').profile
+        Education.objects.create(school='Async University', degree='BSc').profiles.add(profile)
+        Skill.objects.create(name='Python', category='Coding', is_hard_skill=True).profiles.add(profile)
+
+    def setUp(self):
+        cache.clear()
+        reset_recaptcha_client()
+
+    async def test_resume_pages_use_the_page_cache(self):
+        self.assertTrue(AsyncResumeView.view_is_async)
+        response = await self.async_client.get('/resume', secure=True)
+        self.assertContains(response, 'Async University')
+        self.assertEqual(response['X-Page-Cache'], 'miss')
+        response = await self.async_client.get('/resume', secure=True)
+        self.assertEqual(response['X-Page-Cache'], 'hit')
+        self.assertContains(await self.async_client.get('/skills', secure=True), 'Python')
+
+    async def test_contact_verifies_the_captcha_asynchronously(self):
+        tokens = []
+
+        def siteverify(request):
+            token = parse_qs(request.content.decode())['response'][0]
+            tokens.append(token)
+            return httpx.Response(200, json={'success': token == 'valid'})
+
+        data = {'name': 'Ada', 'email': 'ada@example.com', 'message': 'Hello', 'phone_0': '', 'phone_1': ''}
+        with mock.patch.object(AsyncRecaptchaClient, 'create_session',
+                               lambda client: httpx.AsyncClient(transport=httpx.MockTransport(siteverify))):
+            response = await self.async_client.post('/contact', {**data, 'g-recaptcha-response': 'forged'}, secure=True)
+            self.assertFormError(response.context['form'], 'captcha', 'Invalid reCAPTCHA. Please try again.')
+            response = await self.async_client.post('/contact', {**data, 'g-recaptcha-response': 'valid'}, secure=True)
+            self.assertEqual(response.status_code, 302)
+        self.assertEqual(tokens, ['forged', 'valid'])
+        self.assertEqual(await Contact.objects.filter(email='ada@example.com').acount(), 1)
+
+    async def test_middleware_runs_on_the_event_loop(self):
+        async def view(request):
+            return HttpResponse()
+
+        for middleware in (InstrumentationMiddleware, RateLimitMiddleware, AsyncWhiteNoiseMiddleware):
+            self.assertTrue(iscoroutinefunction(middleware(view)), middleware)
+            self.assertFalse(iscoroutinefunction(middleware(lambda request: HttpResponse())), middleware)
+        self.assertTrue(iscoroutinefunction(RateLimitMiddleware(view).process_view))
+
+    @override_settings(SERVER_TIMING_TOKEN='timing')
+    async def test_async_requests_time_their_queries(self):
+        response = await self.async_client.get('/resume', secure=True, headers={'X-Server-Timing-Token': 'timing'})
+        self.assertIn('db;dur=', response['Server-Timing'])
+
+    @override_settings(RATE_LIMITS={**settings.RATE_LIMITS, 'contact': '1/h:1'})
+    async def test_contact_is_rate_limited(self):
+        data = {'name': 'Ada', 'email': 'ada@example.com', 'message': 'Hello', 'phone_0': '', 'phone_1': ''}
+        with mock.patch.object(AsyncRecaptchaClient, 'averify', mock.AsyncMock(return_value=False)):
+            self.assertEqual((await self.async_client.post('/contact', data, secure=True)).status_code, 200)
+            response = await self.async_client.post('/contact', data, secure=True)
+        self.assertEqual(response.status_code, 429)
+
+    async def test_clients_share_the_circuit_breaker(self):
+        client = get_async_recaptcha_client()
+        self.assertIs(client.breaker, get_recaptcha_client().breaker)
+        self.assertIs(client, get_async_recaptcha_client())
+        await client.aclose()
+        self.assertTrue(client.session.is_closed)
@@ -0,0 +1,89 @@
+"""
+throttles.py
+
+DRF throttles for the API views.
+"""
+
+from rest_framework.throttling import BaseThrottle, SimpleRateThrottle
+
+from .ratelimit import client_ident, hit
+
+
+class FailedPasswordThrottle(SimpleRateThrottle):
+    """
+    Limits resume password attempts per client (`resume_password` rate).
+
+    Every attempt is counted before the password hash is checked, with an atomic cache
+    increment, so parallel guesses cannot all pass the check and each pay for a hash.
+    A correct password gives its attempt back through `refund()`, so a client that knows
+    the password is never slowed down. Attempts are counted per fixed window of the
+    rate's duration. Clients are identified like the rate limits, by `client_ident()`.
+    """
+    scope = 'resume_password'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': client_ident(request)}
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.key = f'{self.get_cache_key(request, view)}:{window}'
+        self.cache.add(self.key, 0, self.duration)
+        try:
+            attempts = self.cache.incr(self.key)
+        except ValueError:
+            # The entry expired between add() and incr().
+            self.cache.add(self.key, 1, self.duration)
+            attempts = 1
+        if attempts > self.num_requests:
+            return self.throttle_failure()
+        return True
+
+    def refund(self):
+        """Gives back the attempt of the request last passed to `allow_request()`."""
+        if self.rate is None:
+            return
+        try:
+            self.cache.decr(self.key)
+        except ValueError:
+            pass
+
+    def wait(self):
+        return self.duration - self.now % self.duration
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Takes a token from the `scope` policy of `RATE_LIMITS` (see ratelimit.py) for
+    every request using one of `methods`.
+    """
+    scope = None
+    methods = ('POST', 'PUT', 'PATCH', 'DELETE')
+
+    def allow_request(self, request, view):
+        self.delay = None
+        if request.method not in self.methods:
+            return True
+        self.delay = hit(self.scope, client_ident(request)) or None
+        return self.delay is None
+
+    def wait(self):
+        return self.delay
+
+
+class ContactThrottle(TokenBucketThrottle):
+    """Contact submissions through the API."""
+    scope = 'contact'
+
+
+class DownloadThrottle(TokenBucketThrottle):
+    """Resume downloads, including token downloads by GET."""
+    scope = 'download'
+    methods = ('GET', 'POST')
+
+
+class WriteThrottle(TokenBucketThrottle):
+    """Creates, updates and deletes on the ViewSets."""
+    scope = 'api_write'
@@ -5,10 +5,15 @@ Defines the URL routes for the personal portfolio and resume web application.
 
 This includes:
 - Public website pages (home, about, resume, contact, portfolio, etc.)
+- Search page and search API endpoint
 - PDF resume generation endpoint
 - Custom admin branding
+
+With ASYNC_VIEWS on, the resume pages and the contact form are served by their
+native async variants.
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from home import views
@@ -19,6 +24,12 @@ admin.site.site_header = "Steve Wasiswa"
 admin.site.site_title = "Welcome to Steve's Dashboard"
 admin.site.index_title = "Welcome to the Portal"
 
+
+def page_view(sync_view, async_view):
+    """Returns the view function of a page, async when ASYNC_VIEWS is on."""
+    return (async_view if settings.ASYNC_VIEWS else sync_view).as_view()
+
+
 # ----------------- URL Patterns ----------------- #
 urlpatterns = [
     # Home Page
@@ -27,20 +38,27 @@ urlpatterns = [
 
     # Static Pages
     path('about', views.AboutView.as_view(), name='about'),
-    path('contact', views.ContactView.as_view(), name='contact'),
+    path('contact', page_view(views.ContactView, views.AsyncContactView), name='contact'),
 
     # Resume Pages
-    path('resume', views.ResumeView.as_view(), name='resume'),
-    path('education', views.ResumeView.as_view(), name='education'),  # Alias for resume
-    path('skills', views.ResumeSkillsView.as_view(), name='skills'),
-    path('courses', views.ResumeCoursesView.as_view(), name='courses'),
-    path('resumeprojects', views.ResumeProjectsView.as_view(), name='resumeprojects'),
-    path('leadership', views.ResumeLeadershipView.as_view(), name='leadership'),
+    path('resume', page_view(views.ResumeView, views.AsyncResumeView), name='resume'),
+    path('education', page_view(views.ResumeView, views.AsyncResumeView), name='education'),  # Alias for resume
+    path('skills', page_view(views.ResumeSkillsView, views.AsyncResumeSkillsView), name='skills'),
+    path('courses', page_view(views.ResumeCoursesView, views.AsyncResumeCoursesView), name='courses'),
+    path('resumeprojects', page_view(views.ResumeProjectsView, views.AsyncResumeProjectsView), name='resumeprojects'),
+    path('leadership', page_view(views.ResumeLeadershipView, views.AsyncResumeLeadershipView), name='leadership'),
 
     # Portfolio Pages
     path('portfolio/', views.PortfolioView.as_view(), name='portfolio'),
     path('portfolio/<slug:slug>', views.PortfolioDetailView.as_view(), name='portfolio_details'),
 
+    # Search
+    path('search', views.SearchView.as_view(), name='search'),
+    path('api/search/', views.SearchAPIView.as_view(), name='search_api'),
+
     # API Endpoint for PDF Resume Download
     path('api/download-resume/', ResumePDFView.as_view(), name='download_resume'),
+
+    # Prometheus metrics
+    path('metrics', views.metrics, name='metrics'),
 ]
@@ -0,0 +1,100 @@
+"""
+versioning.py
+
+Per-model version registry.
+
+Every tracked model has a `ModelVersion` row holding a monotonic counter and the time
+of the last change. The counter is incremented with an atomic UPDATE inside the
+transaction that changes the model's data, so it commits or rolls back together with
+that data. Saves and deletes bump it from signal handlers, M2M changes from
+`m2m_changed`, bulk writes from `TimestampedQuerySet`, and profile snapshot rebuilds
+from snapshots.py.
+
+Reads go through the shared cache, whose entry is dropped once the changing transaction
+commits. Entries also expire after `MODEL_VERSION_CACHE_TIMEOUT` seconds, which bounds
+how long a read racing a commit can keep a stale version cached.
+
+Cached data derived from a set of models is keyed by their versions, so a change
+makes the old entries unreachable instead of having to find and delete them.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ModelVersion
+
+VERSION_KEY_PREFIX = 'model-version:'
+
+
+def model_label(model):
+    return model._meta.label_lower
+
+
+def version_key(label):
+    return VERSION_KEY_PREFIX + label
+
+
+def _load_states(labels):
+    """Reads the (version, last-modified timestamp) of each label, creating missing rows."""
+    rows = {row.label: row for row in ModelVersion.objects.filter(label__in=labels)}
+    missing = [label for label in labels if label not in rows]
+    if missing:
+        ModelVersion.objects.bulk_create([ModelVersion(label=label) for label in missing], ignore_conflicts=True)
+        rows.update((row.label, row) for row in ModelVersion.objects.filter(label__in=missing))
+    return {label: (rows[label].version, rows[label].updated_at.timestamp()) for label in labels}
+
+
+def get_model_states(models):
+    """
+    Returns the version and last-modified time of each model.
+
+    Args:
+        models (iterable): Model classes.
+
+    Returns:
+        dict: (version, last-modified POSIX timestamp) per model label.
+    """
+    labels = [model_label(model) for model in models]
+    cached = cache.get_many([version_key(label) for label in labels])
+    states = {label: cached[version_key(label)] for label in labels if version_key(label) in cached}
+    missing = [label for label in labels if label not in states]
+    if missing:
+        loaded = _load_states(missing)
+        cache.set_many(
+            {version_key(label): state for label, state in loaded.items()},
+            settings.MODEL_VERSION_CACHE_TIMEOUT,
+        )
+        states.update(loaded)
+    return states
+
+
+def get_model_versions(models):
+    """
+    Returns the current version of each model.
+
+    Args:
+        models (iterable): Model classes.
+
+    Returns:
+        dict: Version per model label.
+    """
+    return {label: state[0] for label, state in get_model_states(models).items()}
+
+
+def bump_model_version(model):
+    """
+    Increments a model's version in the current transaction and drops
+    the cached value once it commits.
+
+    Args:
+        model (type): The model class whose data changed.
+    """
+    label = model_label(model)
+    now = timezone.now()
+    if not ModelVersion.objects.filter(label=label).update(version=F('version') + 1, updated_at=now):
+        ModelVersion.objects.bulk_create([ModelVersion(label=label)], ignore_conflicts=True)
+        ModelVersion.objects.filter(label=label).update(version=F('version') + 1, updated_at=now)
+    transaction.on_commit(lambda: cache.delete(version_key(label)))
@@ -4,25 +4,30 @@ views.py
 This file defines the web and API views for a personal portfolio and resume web application.
 It includes:
 
-- Template views for rendering pages like home, about, resume, contact, and projects.
+- Template views for rendering pages like home, about, resume, contact, and projects,
+  with async variants of the resume and contact views for ASGI deployments.
 - API endpoints using Django REST Framework (DRF) for managing and accessing data such as
   education, skills, experience, portfolio, profile, etc.
-- PDF generation view to create and serve resume content securely as a downloadable file.
+- PDF resume view serving either the uploaded resume or one generated from live profile data.
 
 Technologies used:
 - Django for web page rendering.
 - Django REST Framework for API serialization and viewsets.
-- WeasyPrint for generating PDF files.
+- WeasyPrint for generating PDF files (in a separate process pool, see resume_pdf.py).
 """
 
 from django.shortcuts import render
 from django.views import generic
-from home.forms import ContactForm
+from home.forms import AsyncContactForm, ContactForm
 from .models import (
     Leadership, Portfolio, Skill, Education, Course, MyContact,
-    Feedback, ProjectImage, Contact, Video, Profile, Experience
+    Feedback, ProjectImage, Contact, Video, Profile, Experience, ProfileSnapshot
 )
+from django.conf import settings
 from django.contrib import messages
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import QuerySet
 from django.contrib.messages.views import SuccessMessageMixin
 from rest_framework import viewsets
 from .serializers import (
@@ -30,20 +35,36 @@ from .serializers import (
     ProjectImageSerializer, ProfileSerializer, MyContactSerializer, FeedbackSerializer,
     CourseSerializer, LeadershipSerializer, VideoSerializer, ExperienceSerializer
 )
+from .snapshots import get_profile_snapshot, snapshot_queryset
+from .resume_pdf import get_resume_pdf, ResumeRenderBusy, ResumeRenderPending
+from .search import search_content
+from .skills import aget_skill_groups, get_skill_groups
+from .file_delivery import file_response, get_cached_file
+from .instrumentation import render_metrics
+from .resume_tokens import check_download_token, issue_download_token
+from .throttles import ContactThrottle, DownloadThrottle, FailedPasswordThrottle
+from .mixins import BatchWriteMixin, QueryPlanMixin, ConditionalGetMixin
+from .page_cache import versioned_page_cache
+from .recaptcha import get_async_recaptcha_client, RecaptchaUnavailable
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from django.contrib.auth.hashers import check_password
-from django.http import HttpResponse, FileResponse
+from django.http import HttpResponse
 from django.template.loader import render_to_string
-from weasyprint import HTML
 from django.views.decorators.csrf import csrf_exempt
+from django.utils.crypto import constant_time_compare
 from django.utils.decorators import method_decorator
+from django.utils.text import slugify
+from asgiref.sync import sync_to_async
 import tempfile
 
 
 # ------------------ Django Template Views ------------------ #
+# The read-only pages are served from a full-page cache that is invalidated
+# whenever one of the models they render changes (see page_cache.py).
 
+@versioned_page_cache()
 def home(request):
     """
     Renders the homepage of the website.
@@ -57,6 +78,7 @@ def home(request):
     return render(request, 'home.html')
 
 
+@method_decorator(versioned_page_cache(MyContact), name='dispatch')
 class AboutView(generic.TemplateView):
     """
     Displays the 'About' page with active contact information.
@@ -79,6 +101,7 @@ class AboutView(generic.TemplateView):
         return context
 
 
+@method_decorator(versioned_page_cache(Education), name='dispatch')
 class ResumeView(generic.TemplateView):
     """
     Displays the main resume page with educational background.
@@ -101,6 +124,7 @@ class ResumeView(generic.TemplateView):
         return context
 
 
+@method_decorator(versioned_page_cache(Course), name='dispatch')
 class ResumeCoursesView(generic.TemplateView):
     """
     Displays a list of courses completed or in progress.
@@ -123,6 +147,7 @@ class ResumeCoursesView(generic.TemplateView):
         return context
 
 
+@method_decorator(versioned_page_cache(Portfolio), name='dispatch')
 class ResumeProjectsView(generic.TemplateView):
     """
     Displays a list of portfolio projects as part of the resume.
@@ -145,6 +170,7 @@ class ResumeProjectsView(generic.TemplateView):
         return context
 
 
+@method_decorator(versioned_page_cache(Leadership), name='dispatch')
 class ResumeLeadershipView(generic.TemplateView):
     """
     Displays leadership and involvement records.
@@ -167,6 +193,7 @@ class ResumeLeadershipView(generic.TemplateView):
         return context
 
 
+@method_decorator(versioned_page_cache(Skill), name='dispatch')
 class ResumeSkillsView(generic.TemplateView):
     """
     Displays a list of personal and professional skills.
@@ -175,17 +202,16 @@ class ResumeSkillsView(generic.TemplateView):
 
     def get_context_data(self, **kwargs):
         """
-        Adds active skills to the context.
+        Adds the active skills, grouped by page section, to the context.
 
         Args:
             **kwargs: Additional context arguments.
 
         Returns:
-            dict: Context data including skill entries.
+            dict: Context data including the skill groups.
         """
         context = super().get_context_data(**kwargs)
-        skills = Skill.objects.filter(is_active=True)
-        context["skills"] = skills
+        context["skill_groups"] = get_skill_groups()
         return context
 
 
@@ -241,7 +267,8 @@ class ContactView(generic.FormView, SuccessMessageMixin):
 
     def form_valid(self, form):
         """
-        Processes and saves the contact form submission.
+        Saves the contact form submission and queues the admin notification
+        in the same transaction.
 
         Args:
             form (ContactForm): Validated form instance.
@@ -249,55 +276,202 @@ class ContactView(generic.FormView, SuccessMessageMixin):
         Returns:
             HttpResponseRedirect: Redirects to success URL with a message.
         """
-        form.send_email()
-        form.save()
+        with transaction.atomic():
+            contact = form.save()
+            form.queue_email(contact)
         messages.success(self.request, 'Your message has been submitted. Thank you!')
         return super().form_valid(form)
 
 
+class SearchView(generic.TemplateView):
+    """
+    Displays ranked search results across projects, experience, leadership, courses and skills.
+    """
+    template_name = "search.html"
+
+    def get_context_data(self, **kwargs):
+        """
+        Adds the search query and its results to the context.
+
+        Args:
+            **kwargs: Additional context arguments.
+
+        Returns:
+            dict: Context data including search results.
+        """
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '').strip()
+        context["query"] = query
+        context["results"] = search_content(query) if query else []
+        return context
+
+
+# ------------------ Async Template Views ------------------ #
+# Native async variants, routed instead of the sync views when ASYNC_VIEWS is on
+# (deploy with an ASGI server, see portfolio/asgi.py). Under WSGI they would still
+# work, but each request would run in an event loop of its own.
+
+class AsyncPageMixin:
+    """
+    Serves a resume template view as an async view.
+
+    The querysets of the page context are loaded with async iteration, and the
+    page cache of `page_models` wraps the async view.
+    """
+    page_models = ()
+    # The sync view's dispatch carries the sync page cache.
+    dispatch = generic.View.dispatch
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return versioned_page_cache(*cls.page_models)(super().as_view(**initkwargs))
+
+    async def get_context_data_async(self, **kwargs):
+        """
+        Builds the context of `get_context_data()` and loads its querysets.
+
+        Returns:
+            dict: Context data, with lists in place of querysets.
+        """
+        context = self.get_context_data(**kwargs)
+        for name, value in context.items():
+            if isinstance(value, QuerySet):
+                context[name] = [obj async for obj in value]
+        return context
+
+    async def get(self, request, *args, **kwargs):
+        return self.render_to_response(await self.get_context_data_async(**kwargs))
+
+
+class AsyncResumeView(AsyncPageMixin, ResumeView):
+    """Async variant of `ResumeView`."""
+    page_models = (Education,)
+
+
+class AsyncResumeCoursesView(AsyncPageMixin, ResumeCoursesView):
+    """Async variant of `ResumeCoursesView`."""
+    page_models = (Course,)
+
+
+class AsyncResumeProjectsView(AsyncPageMixin, ResumeProjectsView):
+    """Async variant of `ResumeProjectsView`."""
+    page_models = (Portfolio,)
+
+
+class AsyncResumeLeadershipView(AsyncPageMixin, ResumeLeadershipView):
+    """Async variant of `ResumeLeadershipView`."""
+    page_models = (Leadership,)
+
+
+class AsyncResumeSkillsView(AsyncPageMixin, ResumeSkillsView):
+    """Async variant of `ResumeSkillsView`."""
+    page_models = (Skill,)
+
+    async def get_context_data_async(self, **kwargs):
+        context = generic.base.ContextMixin.get_context_data(self, **kwargs)
+        context["skill_groups"] = await aget_skill_groups()
+        return context
+
+
+class AsyncContactView(ContactView):
+    """
+    Contact page whose submissions are verified without blocking a worker thread:
+    the reCAPTCHA token is checked with the async client, then the submission is
+    saved and its email queued as in `ContactView`.
+    """
+    form_class = AsyncContactForm
+
+    async def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    async def post(self, request, *args, **kwargs):
+        """
+        Handles a contact form submission.
+
+        Args:
+            request (HttpRequest): The POST request.
+
+        Returns:
+            HttpResponse: A redirect on success, otherwise the form with its errors.
+        """
+        form = self.get_form()
+        if not form.is_valid():
+            return self.form_invalid(form)
+
+        try:
+            verified = await get_async_recaptcha_client().averify(
+                form.cleaned_data['captcha'], remote_ip=request.META.get('REMOTE_ADDR'),
+            )
+        except RecaptchaUnavailable:
+            form.add_error('captcha', 'reCAPTCHA verification is unavailable. Please try again later.')
+            return self.form_invalid(form)
+        if not verified:
+            form.add_error('captcha', 'Invalid reCAPTCHA. Please try again.')
+            return self.form_invalid(form)
+        return await sync_to_async(self.form_valid)(form)
+
+    async def put(self, *args, **kwargs):
+        return await self.post(*args, **kwargs)
+
+
 # ------------------ DRF API ViewSets ------------------ #
+# List endpoints are cursor-paginated (see pagination.py) and each ViewSet declares
+# the relations its serializer reads, so query count stays flat as tables grow.
+# Reads answer If-None-Match / If-Modified-Since with a 304 from per-model version
+# tokens, declared in `versioned_models` when a serializer reads other models.
 
-class EducationViewSet(viewsets.ModelViewSet):
+class EducationViewSet(ConditionalGetMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint to perform CRUD operations on Education objects.
     """
     queryset = Education.objects.all()
+    prefetch_related_fields = ('profiles',)
     serializer_class = EducationSerializer
 
 
-class ExperienceViewSet(viewsets.ModelViewSet):
+class ExperienceViewSet(ConditionalGetMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing professional experience data.
     """
     queryset = Experience.objects.all()
+    prefetch_related_fields = ('profiles',)
     serializer_class = ExperienceSerializer
 
 
-class LeadershipViewSet(viewsets.ModelViewSet):
+class LeadershipViewSet(ConditionalGetMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing leadership and extracurricular involvement records.
     """
     queryset = Leadership.objects.all()
+    prefetch_related_fields = ('profiles',)
     serializer_class = LeadershipSerializer
 
 
-class CourseViewSet(viewsets.ModelViewSet):
+class CourseViewSet(BatchWriteMixin, ConditionalGetMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing completed or ongoing courses.
     """
     queryset = Course.objects.all()
+    prefetch_related_fields = ('profiles',)
     serializer_class = CourseSerializer
 
 
-class ProjectImageViewSet(viewsets.ModelViewSet):
+class ProjectImageViewSet(BatchWriteMixin, ConditionalGetMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing uploaded images.
     """
     queryset = ProjectImage.objects.all()
     serializer_class = ProjectImageSerializer
 
+    def prepare_batch_instance(self, instance, created):
+        """Marks linked images as not uploaded, as `ProjectImage.save()` does."""
+        if not instance.url:
+            return set()
+        instance.is_image = False
+        return {'is_image'}
+
 
-class VideoViewSet(viewsets.ModelViewSet):
+class VideoViewSet(ConditionalGetMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing videos (e.g., presentations, demo reels).
     """
@@ -305,15 +479,16 @@ class VideoViewSet(viewsets.ModelViewSet):
     serializer_class = VideoSerializer
 
 
-class MyContactViewSet(viewsets.ModelViewSet):
+class MyContactViewSet(ConditionalGetMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint for dynamic contact entries used throughout the site.
     """
     queryset = MyContact.objects.all()
+    prefetch_related_fields = ('profiles',)
     serializer_class = MyContactSerializer
 
 
-class FeedbackViewSet(viewsets.ModelViewSet):
+class FeedbackViewSet(ConditionalGetMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint for capturing and retrieving visitor feedback.
     """
@@ -321,53 +496,157 @@ class FeedbackViewSet(viewsets.ModelViewSet):
     serializer_class = FeedbackSerializer
 
 
-class SkillViewSet(viewsets.ModelViewSet):
+class SkillViewSet(BatchWriteMixin, ConditionalGetMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint for listing and managing skills.
     """
     queryset = Skill.objects.all()
+    prefetch_related_fields = ('profiles',)
     serializer_class = SkillSerializer
 
 
-class ProfileViewSet(viewsets.ModelViewSet):
+class ProfileViewSet(ConditionalGetMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing profile data and associated records.
-    Prefetches related models for performance optimization.
+    Reads are served from each profile's precomputed snapshot, which signal
+    handlers rebuild whenever the profile or its related records change.
+
+    Reads accept sparse fieldsets: `?fields=title,user` limits the output,
+    `?expand=all_skills,all_projects` names the nested collections to include and
+    `?debug=true` adds relation counts. Such reads are serialized live and only load
+    the relations they return.
+
+    The validators of snapshot reads follow the `ProfileSnapshot` version, which moves
+    when a rebuild is stored, not when the content it embeds commits; those of sparse
+    reads follow the content models.
     """
     queryset = Profile.objects.all()
+    select_related_fields = ('snapshot',)
+    versioned_models = (
+        User, Profile, ProjectImage, Education, Skill, Course, Leadership, MyContact, Portfolio, Experience
+    )
+    snapshot_versioned_models = (Profile, ProfileSnapshot)
     serializer_class = ProfileSerializer
 
+    def get_versioned_models(self):
+        if self.get_serializer_options() is None:
+            return self.snapshot_versioned_models
+        return super().get_versioned_models()
+
+    def get_serializer_options(self):
+        """
+        Parses the sparse fieldset query parameters of a read.
+
+        Returns:
+            dict | None: `ProfileSerializer` options, or None if none were given.
+        """
+        if self.action not in ('list', 'retrieve'):
+            return None
+        params = self.request.query_params
+        if not any(name in params for name in ('fields', 'expand', 'debug')):
+            return None
+
+        def names(param):
+            if param not in params:
+                return None
+            return [name.strip() for name in params[param].split(',') if name.strip()]
+
+        return {
+            'fields': names('fields'),
+            'expand': names('expand'),
+            'debug': params.get('debug', '').lower() in ('1', 'true', 'yes'),
+        }
+
     def get_queryset(self):
         """
-        Optimizes data fetching by preloading related models.
+        Loads profiles together with their stored snapshot for plain reads, with
+        only the requested relations for sparse reads, and with everything the
+        serializer reads preloaded for writes.
 
         Returns:
-            QuerySet: Prefetched Profile queryset.
+            QuerySet: Profile queryset.
+        """
+        options = self.get_serializer_options()
+        if options is not None:
+            select_related, prefetch_related = ProfileSerializer.get_query_plan(
+                options['fields'], options['expand']
+            )
+            return Profile.objects.select_related(*select_related).prefetch_related(*prefetch_related)
+        if self.action in ('list', 'retrieve'):
+            return super().get_queryset()
+        return snapshot_queryset()
+
+    def get_serializer(self, *args, **kwargs):
+        options = self.get_serializer_options()
+        if options is not None:
+            kwargs.update(options)
+        return super().get_serializer(*args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        """
+        Returns a page of stored profile snapshots in a single query.
+        """
+        if self.get_serializer_options() is not None:
+            return super().list(request, *args, **kwargs)
+        profiles = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        return self.get_paginated_response([get_profile_snapshot(profile) for profile in profiles])
+
+    def retrieve(self, request, *args, **kwargs):
         """
-        return Profile.objects.prefetch_related(
-            'skills',
-            'courses',
-            'educations',
-            'links',
-            'leaderships',
-            'projects'
-        )
+        Returns the stored snapshot of a single profile.
+        """
+        if self.get_serializer_options() is not None:
+            return super().retrieve(request, *args, **kwargs)
+        return Response(get_profile_snapshot(self.get_object()))
 
 
-class PortfolioViewSet(viewsets.ModelViewSet):
+class PortfolioViewSet(BatchWriteMixin, ConditionalGetMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing portfolio projects.
+    Prefetches project images to avoid one query per project.
     """
     queryset = Portfolio.objects.all()
+    prefetch_related_fields = ('images',)
+    versioned_models = (Portfolio, ProjectImage)
     serializer_class = PortfolioSerializer
 
+    def prepare_batch_instance(self, instance, created):
+        """Slugs new projects from their name, as `Portfolio.save()` does."""
+        if not created:
+            return set()
+        instance.slug = slugify(instance.name)
+        return {'slug'}
+
 
-class ContactViewSet(viewsets.ModelViewSet):
+class ContactViewSet(ConditionalGetMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing contact form entries.
     """
     queryset = Contact.objects.all()
     serializer_class = ContactSerializer
+    throttle_classes = [ContactThrottle]
+
+
+class SearchAPIView(APIView):
+    """
+    API endpoint returning ranked full-text search results for `?q=`.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Handles GET request with the search text in the `q` query parameter.
+
+        Returns:
+            Response: The query and its ranked results.
+        """
+        query = request.query_params.get('q', '').strip()
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=400)
+        results = search_content(query, limit=limit) if query else []
+        return Response({'query': query, 'results': results})
 
 
 # ------------------ PDF Resume View ------------------ #
@@ -375,58 +654,168 @@ class ContactViewSet(viewsets.ModelViewSet):
 @method_decorator(csrf_exempt, name='dispatch')
 class ResumePDFView(APIView):
     """
-    API endpoint that retrieves an uploaded resume PDF file after verifying a password.
+    API endpoint that retrieves the resume PDF after verifying a password.
+
+    By default the uploaded resume file is returned. Posting `mode=generated`
+    returns a resume rendered from the live profile data instead.
+
+    A successful password check returns a signed download token in the
+    `X-Download-Token` header. Until it expires, the token authorizes further
+    downloads (`token` in the POST body or the query string) without another
+    password hash check. Password attempts are throttled per client; correct ones
+    are not counted. The token headers are exposed to the CORS origins.
 
     Methods:
-        post(request): Validates password and returns the uploaded resume PDF.
+        get(request): Returns the resume PDF for a valid download token.
+        post(request): Validates the password or token and returns the resume PDF.
 
     Attributes:
         permission_classes (list): Allows access to all users.
+        throttle_classes (list): Limits the download rate per client.
     """
     permission_classes = [AllowAny]
+    throttle_classes = [DownloadThrottle]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Handles GET request authorized by a download token, e.g. from a link.
+
+        Returns:
+            Response: PDF file as HTTP response or error if the token is invalid.
+        """
+        return self.download(request, request.query_params, allow_password=False)
 
     def post(self, request, *args, **kwargs):
         """
-        Handles POST request to verify password and return uploaded resume PDF.
+        Handles POST request to verify password and return the resume PDF.
 
         Args:
-            request (Request): The HTTP request object with 'password' in body.
+            request (Request): The HTTP request object with 'password' or 'token' (and optionally 'mode') in body.
             *args: Additional positional arguments.
             **kwargs: Additional keyword arguments.
 
         Returns:
             Response: PDF file as HTTP response or error if password invalid or file inaccessible.
         """
-        # Extract password from request data
-        password = request.data.get('password')
+        return self.download(request, request.data)
+
+    def download(self, request, params, allow_password=True):
+        """
+        Authorizes a download with a token or, if allowed, the password, and returns the resume.
+
+        Args:
+            request (Request): The HTTP request object.
+            params (QueryDict): The request parameters.
+            allow_password (bool): Whether the password may be sent.
+
+        Returns:
+            Response: PDF file as HTTP response or error response.
+        """
+        token = params.get('token')
+        if not token and not allow_password:
+            return Response({'error': 'Download token required'}, status=403)
+        password = params.get('password') if allow_password else None
+
+        # Counted before the hash check, refunded if the password is correct.
+        throttle = FailedPasswordThrottle()
+        if not token and not throttle.allow_request(request, self):
+            self.throttled(request, throttle.wait())
 
         # Retrieve the first Profile instance (replace as needed)
-        profile = Profile.objects.first()
+        profile = Profile.objects.select_related('snapshot').first()
 
         # Return 404 if no profile found
         if not profile:
             return Response({'error': 'Profile not found'}, status=404)
 
+        if token:
+            # An HMAC check only; tokens are bound to the current password.
+            if not check_download_token(token, profile):
+                return Response({'error': 'Invalid or expired download token'}, status=403)
+            token = None
         # Validate password against hashed resume_password field
-        if not password or not check_password(password, profile.resume_password):
+        elif not password or not check_password(password, profile.resume_password):
             return Response({'error': 'Incorrect password'}, status=403)
+        else:
+            throttle.refund()
+            token = issue_download_token(profile)
+
+        if params.get('mode') == 'generated':
+            response = self.generated_resume(request, profile)
+        else:
+            response = self.uploaded_resume(request, profile)
+        if token and response.status_code in (200, 202, 206):
+            response['X-Download-Token'] = token
+            response['X-Download-Token-Max-Age'] = str(settings.RESUME_TOKEN_MAX_AGE)
+        return response
+
+    def uploaded_resume(self, request, profile):
+        """
+        Returns the uploaded resume file from its local cached copy.
+
+        Args:
+            request (Request): The HTTP request object, for range and conditional headers.
+            profile (Profile): The profile whose resume is returned.
 
+        Returns:
+            Response: PDF file as HTTP response or error if the file is missing or inaccessible.
+        """
         # Check if resume file is uploaded
         if not profile.resume:
             return Response({'error': 'Resume file not uploaded'}, status=404)
 
         try:
-            # Attempt to open the resume file
-            file_field = profile.resume
-
-            # Open file in binary read mode and return as downloadable response
-            response = FileResponse(
-                file_field.open('rb'),
-                as_attachment=True,
-                filename='resume.pdf',
-                content_type='application/pdf'
-            )
-            return response
-
+            # Fetched from storage once, then served from local disk
+            path = get_cached_file(profile.resume)
         except Exception as e:
             return Response({'error': f'Failed to read resume file: {str(e)}'}, status=500)
+
+        return file_response(request, path, 'resume.pdf', 'application/pdf',
+                             accel_prefix=settings.RESUME_FILE_ACCEL_PREFIX)
+
+    def generated_resume(self, request, profile):
+        """
+        Returns the resume generated from the profile's current data.
+
+        Repeat downloads of unchanged data are served from the PDF cache; a cold
+        render that takes too long answers 202 so the client can retry.
+
+        Args:
+            request (Request): The HTTP request object.
+            profile (Profile): The profile to render.
+
+        Returns:
+            Response: Generated PDF file, or a status response while rendering.
+        """
+        try:
+            path = get_resume_pdf(get_profile_snapshot(profile), request.build_absolute_uri('/'))
+        except ResumeRenderPending:
+            return Response({'status': 'Resume is being generated, please retry shortly'},
+                            status=202, headers={'Retry-After': '2'})
+        except ResumeRenderBusy:
+            return Response({'error': 'Resume generation is busy, please retry shortly'},
+                            status=503, headers={'Retry-After': '5'})
+        except Exception as e:
+            return Response({'error': f'Failed to generate resume: {str(e)}'}, status=500)
+
+        return file_response(request, path, 'resume.pdf', 'application/pdf')
+
+
+def metrics(request):
+    """
+    Exposes the request metrics of all worker processes in the Prometheus text format.
+
+    Args:
+        request (HttpRequest): The scrape request, with `METRICS_TOKEN` as a bearer token.
+
+    Returns:
+        HttpResponse: The exposition, or 403 without the token. Without a configured
+        token the endpoint is only open when DEBUG is on.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponse(status=403)
+    elif not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=403)
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
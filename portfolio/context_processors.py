@@ -1,9 +1,106 @@
+"""
+context_processors.py
+
+Template context shared by every page of the site.
+
+The site owner (the first User and their Profile) is rendered on almost every page
+but changes very rarely, so it is loaded once per process, with the profile media URLs
+already resolved, and reused until a User or Profile change invalidates it.
+
+The invalidation only reaches the process that made the change: other worker processes
+keep serving their copy until it expires, up to `SITE_OWNER_CACHE_TIMEOUT` seconds later.
+"""
+
+import threading
+import time
+
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.utils.functional import SimpleLazyObject
+
+
+# Upper bound on staleness for other worker processes, which do not receive
+# the invalidation signals sent in the process that made the change.
+SITE_OWNER_CACHE_TIMEOUT = getattr(settings, 'SITE_OWNER_CACHE_TIMEOUT', 300)
+
+_site_owner_lock = threading.Lock()
+_site_owner_cache = {}
+
+
+class SiteOwnerProfile:
+    """
+    Read-only view of a Profile whose media URLs are resolved once.
+    Any other attribute is read from the wrapped profile.
+    """
+
+    def __init__(self, profile):
+        self._profile = profile
+        self.get_avatar_url = profile.get_avatar_url
+        self.get_resume_url = profile.get_resume_url
+        self.get_work_samples_url = profile.get_work_samples_url
+
+    def __getattr__(self, name):
+        return getattr(self._profile, name)
+
+
+class SiteOwner:
+    """
+    Read-only view of the site owner's User with its profile attached.
+    """
+
+    def __init__(self, user):
+        self._user = user
+        try:
+            self.profile = SiteOwnerProfile(user.profile)
+        except User.profile.RelatedObjectDoesNotExist:
+            self.profile = None
+
+    def __getattr__(self, name):
+        return getattr(self._user, name)
+
+    def __str__(self):
+        return str(self._user)
+
+
+def load_site_owner():
+    """
+    Loads the site owner from the database.
+
+    Returns:
+        SiteOwner | None: The site owner, or None if no user exists yet.
+    """
+    user = User.objects.select_related('profile').order_by('pk').first()
+    return SiteOwner(user) if user else None
+
+
+def get_site_owner():
+    """
+    Returns the process-cached site owner, loading it when missing or expired.
+
+    Returns:
+        SiteOwner | None: The site owner.
+    """
+    entry = _site_owner_cache.get('owner')
+    if entry is None or entry[1] <= time.monotonic():
+        with _site_owner_lock:
+            entry = _site_owner_cache.get('owner')
+            if entry is None or entry[1] <= time.monotonic():
+                entry = (load_site_owner(), time.monotonic() + SITE_OWNER_CACHE_TIMEOUT)
+                _site_owner_cache['owner'] = entry
+    return entry[0]
+
+
+def invalidate_site_owner(**kwargs):
+    """
+    Drops the cached site owner. Connected to User and Profile save/delete signals.
+    """
+    _site_owner_cache.pop('owner', None)
+
 
 def project_context(request):
 
     context = {
-        'me': User.objects.first(),
+        'me': SimpleLazyObject(get_site_owner),
     }
 
-    return context
\ No newline at end of file
+    return context
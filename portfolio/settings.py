@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.0/ref/settings/
 """
 
 import os
+import tempfile
 import environ
 from pathlib import Path
 from django.contrib import messages
@@ -40,6 +41,7 @@ INSTALLED_APPS = [
     'crispy_forms',
     'crispy_bootstrap5',
     'captcha',
+    'django_recaptcha',
     'django_bootstrap5',
     'phonenumber_field',
 
@@ -51,17 +53,19 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
 
-    # Cloudinary for media storage
-    'cloudinary',
+    # Cloudinary for media storage. The SDK's own 'cloudinary' app (CloudinaryField and
+    # template tags, unused here) is left out so workers do not import the SDK at start.
     'cloudinary_storage',
 ]
 
 MIDDLEWARE = [
+    'home.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'home.static_files.AsyncWhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'home.ratelimit.RateLimitMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -72,7 +76,8 @@ ROOT_URLCONF = 'portfolio.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # The Django backend with render timing (see home/instrumentation.py)
+        'BACKEND': 'home.instrumentation.InstrumentedDjangoTemplates',
         'DIRS': [BASE_DIR_TEMPLATES / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -95,6 +100,41 @@ DATABASES = {
     "default": dj_database_url.parse(os.environ.get("DATABASE_URL"))
 }
 
+# CACHES (use a shared backend such as Redis or Memcached with several workers)
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://")
+}
+
+# Django REST Framework
+REST_FRAMEWORK = {
+    'DEFAULT_PAGINATION_CLASS': 'home.pagination.DefaultCursorPagination',
+    'PAGE_SIZE': 20,
+    'DEFAULT_THROTTLE_CLASSES': ['home.throttles.WriteThrottle'],
+    # Proxies in front of the app whose X-Forwarded-For entries are trusted for the client
+    # IP of throttles and rate limits. 0 uses REMOTE_ADDR; the header is client-supplied.
+    'NUM_PROXIES': env.int("NUM_PROXIES", default=0),
+    'DEFAULT_THROTTLE_RATES': {
+        # Resume password attempts per client, correct ones excepted (see home/throttles.py)
+        'resume_password': env("RESUME_PASSWORD_THROTTLE_RATE", default="5/min"),
+    },
+}
+
+# Token-bucket rate limits per client IP (see home/ratelimit.py):
+# "<requests>/<period>[:<burst>]", with the period in s, m, h or d
+RATE_LIMITS = {
+    "contact": env("RATE_LIMIT_CONTACT", default="10/h:3"),
+    "download": env("RATE_LIMIT_DOWNLOAD", default="30/m:10"),
+    "api_write": env("RATE_LIMIT_API_WRITE", default="120/m:60"),
+}
+# URL name -> policy applied to the unsafe requests of template views
+RATE_LIMIT_ROUTES = {"contact": "contact"}
+
+# Seconds a resume download token stays valid (see home/resume_tokens.py)
+RESUME_TOKEN_MAX_AGE = env.int("RESUME_TOKEN_MAX_AGE", default=900)
+
+# Maximum number of objects per batch create/update request (see home/mixins.py)
+API_BATCH_MAX_SIZE = env.int("API_BATCH_MAX_SIZE", default=500)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -124,7 +164,13 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static'),
 ]
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+
+# Resized static image variants built by `manage.py build_responsive_images`,
+# which `collectstatic` runs first (see home/responsive_images.py)
+RESPONSIVE_IMAGES_DIR = os.path.join(BASE_DIR, 'static', 'responsive')
+RESPONSIVE_IMAGE_WIDTHS = env.list("RESPONSIVE_IMAGE_WIDTHS", cast=int, default=[480, 960, 1440])
+RESPONSIVE_IMAGE_FORMATS = env.list("RESPONSIVE_IMAGE_FORMATS", default=["avif", "webp"])
+RESPONSIVE_IMAGE_QUALITY = env.int("RESPONSIVE_IMAGE_QUALITY", default=75)
 
 # Media files
 # MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
@@ -136,7 +182,27 @@ CLOUDINARY_STORAGE = {
     'API_KEY': env('CLOUDINARY_API_KEY'),
     'API_SECRET': env('CLOUDINARY_API_SECRET'),
 }
-DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
+
+# Storage backends (Django 4.2+ replaced DEFAULT_FILE_STORAGE and STATICFILES_STORAGE
+# with STORAGES, so the fingerprinting WhiteNoise storage only applies when declared here).
+# The model file fields use the default storage, which is instantiated, and the Cloudinary
+# SDK imported, on first use rather than at worker start.
+STORAGES = {
+    "default": {"BACKEND": "cloudinary_storage.storage.MediaCloudinaryStorage"},
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
+
+# Serve the resume pages and the contact form with native async views; enable when
+# running under an ASGI server (e.g. `uvicorn portfolio.asgi:application`). The WSGI
+# application refuses to start with it.
+ASYNC_VIEWS = env.bool("ASYNC_VIEWS", default=False)
+
+# Import time budget of a worker cold start, checked by `manage.py startup_profile`
+# (see home/startup.py)
+STARTUP_IMPORT_BUDGET_MS = env.int("STARTUP_IMPORT_BUDGET_MS", default=1500)
+
+# Media URLs kept by the in-process resolver cache (see home/media.py)
+MEDIA_URL_CACHE_SIZE = env.int("MEDIA_URL_CACHE_SIZE", default=4096)
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -183,11 +249,27 @@ EMAIL_HOST_PASSWORD = env("EMAIL_HOST_PASSWORD")
 EMAIL_USE_TLS = env("EMAIL_USE_TLS")
 DEFAULT_FROM_EMAIL = env("DEFAULT_FROM_EMAIL")
 
+# Email outbox (see home/outbox.py and `manage.py send_outbox`)
+OUTBOX_BATCH_SIZE = env.int("OUTBOX_BATCH_SIZE", default=50)
+OUTBOX_MAX_ATTEMPTS = env.int("OUTBOX_MAX_ATTEMPTS", default=8)
+OUTBOX_RETRY_BACKOFF = env.int("OUTBOX_RETRY_BACKOFF", default=60)
+OUTBOX_MAX_BACKOFF = env.int("OUTBOX_MAX_BACKOFF", default=3600)
+OUTBOX_CLAIM_TIMEOUT = env.int("OUTBOX_CLAIM_TIMEOUT", default=300)
+
 # Captcha configuration
 RECAPTCHA_PUBLIC_KEY = str(env("RECAPTCHA_PUBLIC_KEY"))
 RECAPTCHA_PRIVATE_KEY = str(env("RECAPTCHA_PRIVATE_KEY"))
 RECAPTCHA_SECRET_KEY = str(env("RECAPTCHA_PRIVATE_KEY"))
 
+# reCAPTCHA verification client used by the contact API (see home/recaptcha.py)
+RECAPTCHA_VERIFY_URL = env("RECAPTCHA_VERIFY_URL", default="https://www.google.com/recaptcha/api/siteverify")
+RECAPTCHA_CONNECT_TIMEOUT = env.float("RECAPTCHA_CONNECT_TIMEOUT", default=2.0)
+RECAPTCHA_READ_TIMEOUT = env.float("RECAPTCHA_READ_TIMEOUT", default=3.0)
+RECAPTCHA_FAIL_OPEN = env.bool("RECAPTCHA_FAIL_OPEN", default=False)
+RECAPTCHA_TOKEN_CACHE_TTL = env.int("RECAPTCHA_TOKEN_CACHE_TTL", default=120)
+RECAPTCHA_BREAKER_THRESHOLD = env.int("RECAPTCHA_BREAKER_THRESHOLD", default=5)
+RECAPTCHA_BREAKER_RESET_TIMEOUT = env.int("RECAPTCHA_BREAKER_RESET_TIMEOUT", default=30)
+
 # Administrator configuration
 ADMIN_EMAIL = env("ADMIN_EMAIL")
 ADMIN_NAME = env("ADMIN_NAME")
@@ -198,3 +280,41 @@ CRISPY_TEMPLATE_PACK = 'bootstrap5'
 
 # CORS
 CORS_ALLOWED_ORIGINS = env.list("CORS_ALLOWED_ORIGINS")
+# Lets cross-origin frontends read the resume download token (see home/resume_tokens.py)
+CORS_EXPOSE_HEADERS = ["X-Download-Token", "X-Download-Token-Max-Age"]
+
+# Seconds a worker process may reuse the cached site owner (see context_processors.py)
+SITE_OWNER_CACHE_TIMEOUT = env.int("SITE_OWNER_CACHE_TIMEOUT", default=300)
+
+# Generated resume PDFs (see home/resume_pdf.py)
+RESUME_PDF_CACHE_DIR = env("RESUME_PDF_CACHE_DIR", default=os.path.join(tempfile.gettempdir(), "portfolio-resume-pdf"))
+RESUME_PDF_CACHE_MAX_FILES = env.int("RESUME_PDF_CACHE_MAX_FILES", default=8)
+RESUME_PDF_MAX_WORKERS = env.int("RESUME_PDF_MAX_WORKERS", default=1)
+RESUME_PDF_MAX_PENDING = env.int("RESUME_PDF_MAX_PENDING", default=4)
+# Seconds a request waits for a cold render before answering 202; keep it short, the
+# web worker is blocked meanwhile
+RESUME_PDF_RENDER_WAIT = env.float("RESUME_PDF_RENDER_WAIT", default=0.25)
+# URL prefixes the generated resume may load assets from, besides the static files
+RESUME_PDF_ALLOWED_URLS = env.list("RESUME_PDF_ALLOWED_URLS", default=["https://res.cloudinary.com/"])
+
+# Local copies of the uploaded resume (see home/file_delivery.py). RESUME_FILE_SENDFILE
+# hands the bytes to the front proxy: "x-accel-redirect" (nginx, with an internal location
+# RESUME_FILE_ACCEL_PREFIX aliased to RESUME_FILE_CACHE_DIR) or "x-sendfile" (Apache, lighttpd).
+RESUME_FILE_CACHE_DIR = env("RESUME_FILE_CACHE_DIR", default=os.path.join(tempfile.gettempdir(), "portfolio-resume-files"))
+RESUME_FILE_CACHE_MAX_FILES = env.int("RESUME_FILE_CACHE_MAX_FILES", default=4)
+RESUME_FILE_SENDFILE = env("RESUME_FILE_SENDFILE", default="")
+RESUME_FILE_ACCEL_PREFIX = env("RESUME_FILE_ACCEL_PREFIX", default="/protected/resume-files/")
+
+# Request instrumentation (see home/instrumentation.py). Requests sending SERVER_TIMING_TOKEN
+# in X-Server-Timing-Token get a Server-Timing header. /metrics requires METRICS_TOKEN as a
+# bearer token; while it is unset, /metrics answers 403 unless DEBUG is on.
+SERVER_TIMING_TOKEN = env("SERVER_TIMING_TOKEN", default="")
+METRICS_TOKEN = env("METRICS_TOKEN", default="")
+METRICS_BUCKETS = env.list("METRICS_BUCKETS", cast=float, default=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0])
+METRICS_FLUSH_INTERVAL = env.float("METRICS_FLUSH_INTERVAL", default=10.0)
+
+# Upper bound on how long a cached model version may lag a commit (see home/versioning.py)
+MODEL_VERSION_CACHE_TIMEOUT = env.int("MODEL_VERSION_CACHE_TIMEOUT", default=300)
+
+# Seconds a rendered page may be served from the page cache (see home/page_cache.py)
+PAGE_CACHE_TIMEOUT = env.int("PAGE_CACHE_TIMEOUT", default=600)
@@ -9,8 +9,15 @@ https://docs.djangoproject.com/en/4.0/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio.settings')
 
 application = get_wsgi_application()
+
+# Under WSGI every async view would run in an event loop of its own, opening a new
+# reCAPTCHA client per request (see home/recaptcha.py); the async views need ASGI.
+if settings.ASYNC_VIEWS:
+    raise ImproperlyConfigured("ASYNC_VIEWS requires an ASGI server, e.g. uvicorn portfolio.asgi:application")